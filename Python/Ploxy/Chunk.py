@@ -0,0 +1,145 @@
+from array import array
+from enum import IntEnum
+
+class OpCode(IntEnum):
+  CONSTANT = 0
+  NIL = 1
+  TRUE = 2
+  FALSE = 3
+  POP = 4
+  GET_LOCAL = 5
+  SET_LOCAL = 6
+  GET_GLOBAL = 7
+  DEFINE_GLOBAL = 8
+  SET_GLOBAL = 9
+  GET_UPVALUE = 10
+  SET_UPVALUE = 11
+  GET_PROPERTY = 12
+  SET_PROPERTY = 13
+  CHECK_INSTANCE = 14
+  GET_SUPER = 15
+  EQUAL = 16
+  GREATER = 17
+  GREATER_EQUAL = 18
+  LESS = 19
+  LESS_EQUAL = 20
+  ADD = 21
+  SUBTRACT = 22
+  MULTIPLY = 23
+  DIVIDE = 24
+  NOT = 25
+  NEGATE = 26
+  PRINT = 27
+  JUMP = 28
+  JUMP_IF_FALSE = 29
+  LOOP = 30
+  CALL = 31
+  GET_METHOD = 32
+  GET_SUPER_METHOD = 33
+  CALL_METHOD = 34
+  CLOSURE = 35
+  CLOSE_UPVALUE = 36
+  RETURN = 37
+  CLASS = 38
+  METHOD = 39
+  SUBCLASS = 40
+
+class Chunk:
+  __slots__ = ("code", "constants", "lines", "constantIndex")
+
+  def __init__(self) -> None:
+    self.code: array = array("B")
+    self.constants: list[any] = []
+    # Run-length encoded as [line, count, line, count, ...].
+    self.lines: array = array("i")
+    self.constantIndex: dict[tuple, int] = {}
+
+  def write(self, byte: int, line: int) -> None:
+    self.code.append(byte)
+    if self.lines and self.lines[-2] == line:
+      self.lines[-1] += 1
+    else:
+      self.lines.append(line)
+      self.lines.append(1)
+
+  def addConstant(self, value: any) -> int:
+    # Strings and numbers are deduplicated; keys carry the type so that
+    # 1.0 and True, or 0.0 and -0.0, stay distinct.
+    key: tuple = None
+    if type(value) is str or type(value) is float:
+      key = (type(value), repr(value))
+      index: int = self.constantIndex.get(key)
+      if index is not None:
+        return index
+
+    self.constants.append(value)
+    index = len(self.constants) - 1
+    if key is not None:
+      self.constantIndex[key] = index
+    return index
+
+  def getLine(self, offset: int) -> int:
+    for i in range(0, len(self.lines), 2):
+      offset -= self.lines[i + 1]
+      if offset < 0:
+        return self.lines[i]
+    return self.lines[-2]
+
+  def disassemble(self, name: str) -> str:
+    text: list[str] = [f"== {name} =="]
+    offset: int = 0
+    previousLine: int = None
+    while offset < len(self.code):
+      op: OpCode = OpCode(self.code[offset])
+      line: int = self.getLine(offset)
+      prefix: str = f"{offset:04} " + ("   | " if line == previousLine else f"{line:4} ")
+      previousLine = line
+
+      if op in Chunk.shortOperand:
+        operand: int = self.code[offset + 1] << 8 | self.code[offset + 2]
+        if op in (OpCode.JUMP, OpCode.JUMP_IF_FALSE):
+          text.append(f"{prefix}{op.name:<16} {offset} -> {offset + 3 + operand}")
+        elif op == OpCode.LOOP:
+          text.append(f"{prefix}{op.name:<16} {offset} -> {offset + 3 - operand}")
+        else:
+          text.append(f"{prefix}{op.name:<16} {operand:4} '{self.constants[operand]}'")
+        offset += 3
+
+        if op == OpCode.CLOSURE:
+          for _ in range(self.constants[operand].upvalueCount):
+            kind: str = "local" if self.code[offset] else "upvalue"
+            text.append(f"{offset:04}      |                     {kind} {self.code[offset + 1]}")
+            offset += 2
+      elif op in Chunk.byteOperand:
+        text.append(f"{prefix}{op.name:<16} {self.code[offset + 1]:4}")
+        offset += 2
+      else:
+        text.append(f"{prefix}{op.name}")
+        offset += 1
+
+    return "\n".join(text)
+
+  shortOperand: frozenset = frozenset((
+    OpCode.CONSTANT, OpCode.GET_GLOBAL, OpCode.DEFINE_GLOBAL, OpCode.SET_GLOBAL,
+    OpCode.GET_PROPERTY, OpCode.SET_PROPERTY, OpCode.GET_SUPER, OpCode.JUMP,
+    OpCode.JUMP_IF_FALSE, OpCode.LOOP, OpCode.GET_METHOD, OpCode.GET_SUPER_METHOD,
+    OpCode.CLOSURE, OpCode.CLASS, OpCode.METHOD, OpCode.SUBCLASS,
+  ))
+  byteOperand: frozenset = frozenset((
+    OpCode.GET_LOCAL, OpCode.SET_LOCAL, OpCode.GET_UPVALUE, OpCode.SET_UPVALUE,
+    OpCode.CALL, OpCode.CALL_METHOD,
+  ))
+
+class FunctionProto:
+  __slots__ = ("name", "arity", "upvalueCount", "chunk")
+
+  def __init__(self, name: str, arity: int) -> None:
+    self.name: str = name
+    self.arity: int = arity
+    self.upvalueCount: int = 0
+    self.chunk: Chunk = Chunk()
+
+  def __str__(self) -> str:
+    if self.name is None:
+      return "<script>"
+    return f"<fn {self.name}>"
@@ -0,0 +1,554 @@
+from typing import Callable
+from .Expr import Expr, Literal, Grouping, Unary, Binary, Variable, Assign, Logical, Call, Get, Set, Super, This
+from .TokenType import TokenType
+from .Token import Token
+from .RuntimeError import RuntimeException
+from .Stmt import Stmt, Expression, Print, Var, Block, If, While, Function, Return, Class
+from .Environment import Environment
+from .GlobalEnvironment import GlobalEnvironment, GlobalCell, EMPTY
+from .LoxCallable import LoxCallable
+from .LoxClass import LoxClass
+from .LoxInstance import LoxInstance
+from .Interpreter import ClockFunction
+from .Runtime import isEqual, checkNumberOperands, stringify
+
+ExprCode = Callable[[Environment], any]
+StmtCode = Callable[[Environment], tuple]
+
+class ClosureCompiler(Expr.Visitor[ExprCode], Stmt.Visitor[StmtCode]):
+  def __init__(self) -> None:
+    self.globals: GlobalEnvironment = GlobalEnvironment()
+    self.globals.define("clock", ClockFunction())
+    self.scopeDepth: int = 0
+
+  def interpret(self, statments: list[Stmt]) -> None:
+    from .Lox import Lox
+    code: StmtCode = self.__sequence(statments)
+    try:
+      code(self.globals)
+    except RuntimeException as error:
+      Lox.runtimeError(error)
+
+  def visitLiteralExpr(self, expr: Literal) -> ExprCode:
+    value: any = expr.value
+    def literal(env):
+      return value
+    return literal
+
+  def visitGroupingExpr(self, expr: Grouping) -> ExprCode:
+    return self.__compile(expr.expression)
+
+  def visitUnaryExpr(self, expr: Unary) -> ExprCode:
+    right: ExprCode = self.__compile(expr.right)
+    operator: Token = expr.operator
+
+    if operator.type == TokenType.MINUS:
+      def negate(env):
+        value = right(env)
+        if type(value) is float:
+          return -value
+        if isinstance(value, (int, float)):
+          return -float(value)
+        raise RuntimeException(operator, "Operand must be a number.")
+      return negate
+
+    def bang(env):
+      value = right(env)
+      return value is None or value is False
+    return bang
+
+  def visitBinaryExpr(self, expr: Binary) -> ExprCode:
+    left: ExprCode = self.__compile(expr.left)
+    right: ExprCode = self.__compile(expr.right)
+    operator: Token = expr.operator
+    operatorType: TokenType = operator.type
+    checkNumbers = checkNumberOperands
+
+    if operatorType == TokenType.BANG_EQUAL:
+      def notEqual(env):
+        return not isEqual(left(env), right(env))
+      return notEqual
+
+    if operatorType == TokenType.EQUAL_EQUAL:
+      def equal(env):
+        return isEqual(left(env), right(env))
+      return equal
+
+    if operatorType == TokenType.GREATER:
+      def greater(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a > b
+        checkNumbers(operator, a, b)
+        return float(a) > float(b)
+      return greater
+
+    if operatorType == TokenType.GREATER_EQUAL:
+      def greaterEqual(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a >= b
+        checkNumbers(operator, a, b)
+        return float(a) >= float(b)
+      return greaterEqual
+
+    if operatorType == TokenType.LESS:
+      def less(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a < b
+        checkNumbers(operator, a, b)
+        return float(a) < float(b)
+      return less
+
+    if operatorType == TokenType.LESS_EQUAL:
+      def lessEqual(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a <= b
+        checkNumbers(operator, a, b)
+        return float(a) <= float(b)
+      return lessEqual
+
+    if operatorType == TokenType.MINUS:
+      def subtract(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a - b
+        checkNumbers(operator, a, b)
+        return float(a) - float(b)
+      return subtract
+
+    if operatorType == TokenType.PLUS:
+      def add(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a + b
+        if isinstance(a, str) and isinstance(b, str):
+          return a + b
+        raise RuntimeException(operator, "Operands must be two numbers or two strings.")
+      return add
+
+    if operatorType == TokenType.SLASH:
+      def divide(env):
+        a = left(env)
+        b = right(env)
+        checkNumbers(operator, a, b)
+        if float(b) == 0:
+          raise RuntimeException(operator, "Division by zero.")
+        return float(a) / float(b)
+      return divide
+
+    if operatorType == TokenType.STAR:
+      def multiply(env):
+        a = left(env)
+        b = right(env)
+        if type(a) is float and type(b) is float:
+          return a * b
+        checkNumbers(operator, a, b)
+        return float(a) * float(b)
+      return multiply
+
+    def unknown(env):
+      left(env)
+      right(env)
+      return None
+    return unknown
+
+  def visitLogicalExpr(self, expr: Logical) -> ExprCode:
+    left: ExprCode = self.__compile(expr.left)
+    right: ExprCode = self.__compile(expr.right)
+
+    if expr.operator.type == TokenType.OR:
+      def logicalOr(env):
+        value = left(env)
+        if value is None or value is False:
+          return right(env)
+        return value
+      return logicalOr
+
+    def logicalAnd(env):
+      value = left(env)
+      if value is None or value is False:
+        return value
+      return right(env)
+    return logicalAnd
+
+  def visitVariableExpr(self, expr: Variable) -> ExprCode:
+    return self.__lookUpVariable(expr.name, expr)
+
+  def visitThisExpr(self, expr: This) -> ExprCode:
+    return self.__lookUpVariable(expr.keyword, expr)
+
+  def visitAssignExpr(self, expr: Assign) -> ExprCode:
+    value: ExprCode = self.__compile(expr.value)
+    name: Token = expr.name
+    slot: int = expr.slot
+
+    if expr.depth == None:
+      cell: GlobalCell = self.globals.cell(name.lexeme)
+      def assignGlobal(env):
+        result = value(env)
+        if cell.value is EMPTY:
+          raise GlobalEnvironment.undefined(name)
+        cell.value = result
+        return result
+      return assignGlobal
+
+    if expr.depth == 0:
+      def assignLocal(env):
+        result = value(env)
+        env.values[slot] = result
+        return result
+      return assignLocal
+
+    if expr.depth == 1:
+      def assignEnclosing(env):
+        result = value(env)
+        env.enclosing.values[slot] = result
+        return result
+      return assignEnclosing
+
+    depth: int = expr.depth
+    def assignAt(env):
+      result = value(env)
+      env.assignAt(depth, slot, result)
+      return result
+    return assignAt
+
+  def visitCallExpr(self, expr: Call) -> ExprCode:
+    callee: ExprCode = self.__compile(expr.callee)
+    arguments: list[ExprCode] = [self.__compile(argument) for argument in expr.arguments]
+    paren: Token = expr.paren
+    interpreter: ClosureCompiler = self
+
+    def checkCallable(function: any, count: int) -> None:
+      if not isinstance(function, LoxCallable):
+        raise RuntimeException(paren, "Can only call functions and classes.")
+      if count != function.arity():
+        raise RuntimeException(paren, f"Expected {function.arity()} arguments but got {count}.")
+
+    if len(arguments) == 0:
+      def call0(env):
+        function = callee(env)
+        checkCallable(function, 0)
+        try:
+          return function.call(interpreter, [])
+        except RecursionError:
+          raise RuntimeException(paren, "Stack overflow.") from None
+      return call0
+
+    if len(arguments) == 1:
+      argument: ExprCode = arguments[0]
+      def call1(env):
+        function = callee(env)
+        values = [argument(env)]
+        checkCallable(function, 1)
+        try:
+          return function.call(interpreter, values)
+        except RecursionError:
+          raise RuntimeException(paren, "Stack overflow.") from None
+      return call1
+
+    def call(env):
+      function = callee(env)
+      values = [argument(env) for argument in arguments]
+      checkCallable(function, len(values))
+      try:
+        return function.call(interpreter, values)
+      except RecursionError:
+        raise RuntimeException(paren, "Stack overflow.") from None
+    return call
+
+  def visitGetExpr(self, expr: Get) -> ExprCode:
+    object: ExprCode = self.__compile(expr.object)
+    name: Token = expr.name
+
+    def get(env):
+      instance = object(env)
+      if isinstance(instance, LoxInstance):
+        return instance.get(name)
+      raise RuntimeException(name, "Only instances have properties.")
+    return get
+
+  def visitSetExpr(self, expr: Set) -> ExprCode:
+    object: ExprCode = self.__compile(expr.object)
+    value: ExprCode = self.__compile(expr.value)
+    name: Token = expr.name
+    lexeme: str = name.lexeme
+
+    def setProperty(env):
+      instance = object(env)
+      if not isinstance(instance, LoxInstance):
+        raise RuntimeException(name, "Only instances have fields.")
+      result = value(env)
+      instance.setField(lexeme, result)
+      return result
+    return setProperty
+
+  def visitSuperExpr(self, expr: Super) -> ExprCode:
+    depth: int = expr.depth
+    slot: int = expr.slot
+    method: Token = expr.method
+
+    def superMethod(env):
+      environment: Environment = env.ancestor(depth - 1)
+      superclass: LoxClass = environment.enclosing.values[slot]
+      found: CompiledFunction = superclass.findMethod(method.lexeme)
+      if found == None:
+        raise RuntimeException(method, f"Undefined property '{method.lexeme}'.")
+      return found.bind(environment.values[0])
+    return superMethod
+
+  def visitExpressionStmt(self, stmt: Expression) -> StmtCode:
+    expression: ExprCode = self.__compile(stmt.expression)
+    def expressionStmt(env):
+      expression(env)
+    return expressionStmt
+
+  def visitPrintStmt(self, stmt: Print) -> StmtCode:
+    expression: ExprCode = self.__compile(stmt.expression)
+    def printStmt(env):
+      print(stringify(expression(env)))
+    return printStmt
+
+  def visitVarStmt(self, stmt: Var) -> StmtCode:
+    initializer: ExprCode = None
+    if stmt.initializer != None:
+      initializer = self.__compile(stmt.initializer)
+
+    if self.scopeDepth == 0:
+      cell: GlobalCell = self.globals.cell(stmt.name.lexeme)
+      if initializer == None:
+        def defineGlobal(env):
+          cell.value = None
+        return defineGlobal
+      def initializeGlobal(env):
+        cell.value = initializer(env)
+      return initializeGlobal
+
+    if initializer == None:
+      def defineLocal(env):
+        env.values.append(None)
+      return defineLocal
+    def initializeLocal(env):
+      env.values.append(initializer(env))
+    return initializeLocal
+
+  def visitBlockStmt(self, stmt: Block) -> StmtCode:
+    if not stmt.declares:
+      return self.__sequence(stmt.statements)
+
+    if stmt.escapes or self.scopeDepth == 0:
+      self.scopeDepth += 1
+      body: StmtCode = self.__sequence(stmt.statements)
+      self.scopeDepth -= 1
+
+      def block(env):
+        return body(Environment(env))
+      return block
+
+    body: StmtCode = self.__sequence(stmt.statements)
+    def scope(env):
+      values = env.values
+      base = len(values)
+      completion = body(env)
+      del values[base:]
+      return completion
+    return scope
+
+  def visitIfStmt(self, stmt: If) -> StmtCode:
+    condition: ExprCode = self.__compile(stmt.condition)
+    thenBranch: StmtCode = self.__compile(stmt.thenBranch)
+
+    if stmt.elseBranch == None:
+      def ifStmt(env):
+        value = condition(env)
+        if value is not None and value is not False:
+          return thenBranch(env)
+      return ifStmt
+
+    elseBranch: StmtCode = self.__compile(stmt.elseBranch)
+    def ifElseStmt(env):
+      value = condition(env)
+      if value is None or value is False:
+        return elseBranch(env)
+      return thenBranch(env)
+    return ifElseStmt
+
+  def visitWhileStmt(self, stmt: While) -> StmtCode:
+    condition: ExprCode = self.__compile(stmt.condition)
+    body: StmtCode = self.__compile(stmt.body)
+
+    def whileStmt(env):
+      while True:
+        value = condition(env)
+        if value is None or value is False:
+          return None
+        completion = body(env)
+        if completion is not None:
+          return completion
+    return whileStmt
+
+  def visitReturnStmt(self, stmt: Return) -> StmtCode:
+    if stmt.value == None:
+      def returnNil(env):
+        return (None,)
+      return returnNil
+
+    value: ExprCode = self.__compile(stmt.value)
+    def returnStmt(env):
+      return (value(env),)
+    return returnStmt
+
+  def visitFunctionStmt(self, stmt: Function) -> StmtCode:
+    body: StmtCode = self.__function(stmt)
+    declare: StmtCode = self.__declare(stmt.name)
+
+    def function(env):
+      declare(env, CompiledFunction(stmt, body, env, False))
+    return function
+
+  def visitClassStmt(self, stmt: Class) -> StmtCode:
+    superclassCode: ExprCode = None
+    if stmt.superclass != None:
+      superclassCode = self.__compile(stmt.superclass)
+
+    methods: list[tuple[Function, StmtCode]] = [(method, self.__function(method)) for method in stmt.methods]
+    isGlobal: bool = self.scopeDepth == 0
+    globals: GlobalEnvironment = self.globals
+    name: Token = stmt.name
+    superclassName: Token = stmt.superclass.name if stmt.superclass != None else None
+
+    def classStmt(env):
+      superclass: any = None
+      if superclassCode != None:
+        superclass = superclassCode(env)
+        if not isinstance(superclass, LoxClass):
+          raise RuntimeException(superclassName, "Superclass must be a class.")
+
+      slot: int = None
+      if isGlobal:
+        globals.define(name.lexeme, None)
+      else:
+        slot = len(env.values)
+        env.define(None)
+
+      closure: Environment = env
+      if superclass != None:
+        closure = Environment(env)
+        closure.define(superclass)
+
+      functions: dict[str, CompiledFunction] = {}
+      for method, body in methods:
+        functions[method.name.lexeme] = CompiledFunction(method, body, closure, method.name.lexeme == "init")
+
+      Klass: LoxClass = LoxClass(name.lexeme, superclass, functions)
+
+      if isGlobal:
+        globals.assign(name, Klass)
+      else:
+        env.values[slot] = Klass
+    return classStmt
+
+  def __compile(self, node: Expr | Stmt) -> Callable:
+    return node.accept(self)
+
+  def __sequence(self, statments: list[Stmt]) -> StmtCode:
+    code: tuple[StmtCode, ...] = tuple(self.__compile(statment) for statment in statments)
+
+    if len(code) == 1:
+      return code[0]
+
+    def sequence(env):
+      for statment in code:
+        completion = statment(env)
+        if completion is not None:
+          return completion
+    return sequence
+
+  def __function(self, declaration: Function) -> StmtCode:
+    self.scopeDepth += 1
+    body: StmtCode = self.__sequence(declaration.body)
+    self.scopeDepth -= 1
+    return body
+
+  def __declare(self, name: Token) -> Callable[[Environment, any], None]:
+    if self.scopeDepth == 0:
+      cell: GlobalCell = self.globals.cell(name.lexeme)
+      def declareGlobal(env, value):
+        cell.value = value
+      return declareGlobal
+
+    def declareLocal(env, value):
+      env.values.append(value)
+    return declareLocal
+
+  def __lookUpVariable(self, name: Token, expr: Expr) -> ExprCode:
+    slot: int = expr.slot
+
+    if expr.depth == None:
+      cell: GlobalCell = self.globals.cell(name.lexeme)
+      def getGlobal(env):
+        value = cell.value
+        if value is EMPTY:
+          raise GlobalEnvironment.undefined(name)
+        return value
+      return getGlobal
+
+    if expr.depth == 0:
+      def getLocal(env):
+        return env.values[slot]
+      return getLocal
+
+    if expr.depth == 1:
+      def getEnclosing(env):
+        return env.enclosing.values[slot]
+      return getEnclosing
+
+    depth: int = expr.depth
+    def getAt(env):
+      return env.getAt(depth, slot)
+    return getAt
+
+class CompiledFunction(LoxCallable):
+  def __init__(self, declaration: Function, body: StmtCode, closure: Environment, isInitializer: bool, receiver: LoxInstance = None) -> None:
+    self.isInitializer = isInitializer
+    self.closure: Environment = closure
+    self.declaration: Function = declaration
+    self.body: StmtCode = body
+    self.receiver: LoxInstance = receiver
+
+  def bind(self, instance: LoxInstance) -> 'CompiledFunction':
+    return CompiledFunction(self.declaration, self.body, self.closure, self.isInitializer, instance)
+
+  def arity(self) -> int:
+    return len(self.declaration.params)
+
+  def call(self, interpreter: ClosureCompiler, arguments: list[any]) -> any:
+    if self.receiver is not None:
+      arguments = [self.receiver, *arguments]
+
+    return self.invoke(interpreter, arguments)
+
+  def invoke(self, interpreter: ClosureCompiler, arguments: list[any]) -> any:
+    environment: Environment = Environment(self.closure)
+    environment.values = arguments
+    completion: tuple = self.body(environment)
+
+    if self.isInitializer:
+      return arguments[0]
+
+    if completion is not None:
+      return completion[0]
+
+    return None
+
+  def __str__(self) -> str:
+    return f"<fn {self.declaration.name.lexeme}>"
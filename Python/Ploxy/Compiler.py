@@ -0,0 +1,382 @@
+from .Expr import Expr, Literal, Grouping, Unary, Binary, Variable, Assign, Logical, Call, Get, Set, Super, This
+from .Stmt import Stmt, Expression, Print, Var, Block, If, While, Function, Return, Class
+from .TokenType import TokenType
+from .Token import Token
+from .Chunk import Chunk, OpCode, FunctionProto
+from .Resolver import FunctionType
+
+class Compiler(Expr.Visitor[None], Stmt.Visitor[None]):
+  class Local:
+    __slots__ = ("name", "depth", "isCaptured")
+
+    def __init__(self, name: str, depth: int) -> None:
+      self.name: str = name
+      self.depth: int = depth
+      self.isCaptured: bool = False
+
+  class FunctionState:
+    def __init__(self, enclosing: 'Compiler.FunctionState', function: FunctionProto, type: FunctionType) -> None:
+      self.enclosing: Compiler.FunctionState = enclosing
+      self.function: FunctionProto = function
+      self.type: FunctionType = type
+      receiver: str = "this" if type in (FunctionType.METHOD, FunctionType.INITIALIZER) else ""
+      self.locals: list[Compiler.Local] = [Compiler.Local(receiver, 0)]
+      self.upvalues: list[tuple[int, bool]] = []
+      self.scopeDepth: int = 0
+
+  binaryOps: dict[TokenType, OpCode] = {
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+  }
+
+  def __init__(self) -> None:
+    self.state: Compiler.FunctionState = None
+    self.line: int = 1
+
+  def compile(self, statments: list[Stmt]) -> FunctionProto:
+    self.state = Compiler.FunctionState(None, FunctionProto(None, 0), FunctionType.NONE)
+    for statment in statments:
+      self.__statement(statment)
+    self.__emitReturn()
+    return self.state.function
+
+  def visitExpressionStmt(self, stmt: Expression) -> None:
+    self.__expression(stmt.expression)
+    self.__emit(OpCode.POP)
+
+  def visitPrintStmt(self, stmt: Print) -> None:
+    self.__expression(stmt.expression)
+    self.__emit(OpCode.PRINT)
+
+  def visitVarStmt(self, stmt: Var) -> None:
+    if stmt.initializer != None:
+      self.__expression(stmt.initializer)
+    else:
+      self.__emit(OpCode.NIL)
+    self.__define(stmt.name)
+
+  def visitBlockStmt(self, stmt: Block) -> None:
+    self.__beginScope()
+    for statment in stmt.statements:
+      self.__statement(statment)
+    self.__endScope()
+
+  def visitIfStmt(self, stmt: If) -> None:
+    self.__expression(stmt.condition)
+    thenJump: int = self.__emitJump(OpCode.JUMP_IF_FALSE)
+    self.__emit(OpCode.POP)
+    self.__statement(stmt.thenBranch)
+    elseJump: int = self.__emitJump(OpCode.JUMP)
+
+    self.__patchJump(thenJump)
+    self.__emit(OpCode.POP)
+    if stmt.elseBranch != None:
+      self.__statement(stmt.elseBranch)
+    self.__patchJump(elseJump)
+
+  def visitWhileStmt(self, stmt: While) -> None:
+    loopStart: int = len(self.__chunk().code)
+    self.__expression(stmt.condition)
+    exitJump: int = self.__emitJump(OpCode.JUMP_IF_FALSE)
+    self.__emit(OpCode.POP)
+    self.__statement(stmt.body)
+    self.__emitLoop(loopStart)
+
+    self.__patchJump(exitJump)
+    self.__emit(OpCode.POP)
+
+  def visitFunctionStmt(self, stmt: Function) -> None:
+    if self.state.scopeDepth > 0:
+      self.__addLocal(stmt.name)
+      self.__function(stmt, FunctionType.FUNCTION)
+    else:
+      self.__function(stmt, FunctionType.FUNCTION)
+      self.__emitShort(OpCode.DEFINE_GLOBAL, self.__constant(stmt.name.lexeme), stmt.name.line)
+
+  def visitReturnStmt(self, stmt: Return) -> None:
+    self.line = stmt.keyword.line
+    if stmt.value != None:
+      self.__expression(stmt.value)
+      self.__emit(OpCode.RETURN)
+    else:
+      self.__emitReturn()
+
+  def visitClassStmt(self, stmt: Class) -> None:
+    name: int = self.__constant(stmt.name.lexeme)
+    if stmt.superclass != None:
+      self.__expression(stmt.superclass)
+      self.__emitShort(OpCode.SUBCLASS, name, stmt.superclass.name.line)
+    else:
+      self.__emitShort(OpCode.CLASS, name, stmt.name.line)
+    self.__define(stmt.name)
+
+    if stmt.superclass != None:
+      self.__beginScope()
+      self.__expression(stmt.superclass)
+      self.__addLocal(Token(TokenType.SUPER, "super", None, stmt.superclass.name.line))
+
+    self.__getVariable(stmt.name)
+    for method in stmt.methods:
+      type: FunctionType = FunctionType.INITIALIZER if method.name.lexeme == "init" else FunctionType.METHOD
+      self.__function(method, type)
+      self.__emitShort(OpCode.METHOD, self.__constant(method.name.lexeme), method.name.line)
+    self.__emit(OpCode.POP)
+
+    if stmt.superclass != None:
+      self.__endScope()
+
+  def visitLiteralExpr(self, expr: Literal) -> None:
+    if expr.value is None:
+      self.__emit(OpCode.NIL)
+    elif expr.value is True:
+      self.__emit(OpCode.TRUE)
+    elif expr.value is False:
+      self.__emit(OpCode.FALSE)
+    else:
+      self.__emitShort(OpCode.CONSTANT, self.__constant(expr.value))
+
+  def visitGroupingExpr(self, expr: Grouping) -> None:
+    self.__expression(expr.expression)
+
+  def visitUnaryExpr(self, expr: Unary) -> None:
+    self.__expression(expr.right)
+    if expr.operator.type == TokenType.MINUS:
+      self.__emit(OpCode.NEGATE, expr.operator.line)
+    else:
+      self.__emit(OpCode.NOT, expr.operator.line)
+
+  def visitBinaryExpr(self, expr: Binary) -> None:
+    self.__expression(expr.left)
+    self.__expression(expr.right)
+    if expr.operator.type == TokenType.BANG_EQUAL:
+      self.__emit(OpCode.EQUAL, expr.operator.line)
+      self.__emit(OpCode.NOT)
+    else:
+      self.__emit(Compiler.binaryOps[expr.operator.type], expr.operator.line)
+
+  def visitLogicalExpr(self, expr: Logical) -> None:
+    self.__expression(expr.left)
+    if expr.operator.type == TokenType.OR:
+      elseJump: int = self.__emitJump(OpCode.JUMP_IF_FALSE)
+      endJump: int = self.__emitJump(OpCode.JUMP)
+      self.__patchJump(elseJump)
+      self.__emit(OpCode.POP)
+      self.__expression(expr.right)
+      self.__patchJump(endJump)
+    else:
+      endJump: int = self.__emitJump(OpCode.JUMP_IF_FALSE)
+      self.__emit(OpCode.POP)
+      self.__expression(expr.right)
+      self.__patchJump(endJump)
+
+  def visitVariableExpr(self, expr: Variable) -> None:
+    self.__getVariable(expr.name)
+
+  def visitAssignExpr(self, expr: Assign) -> None:
+    self.__expression(expr.value)
+    self.__setVariable(expr.name)
+
+  def visitCallExpr(self, expr: Call) -> None:
+    callee: Expr = expr.callee
+    if isinstance(callee, Get):
+      self.__expression(callee.object)
+      self.__emitShort(OpCode.GET_METHOD, self.__constant(callee.name.lexeme), callee.name.line)
+      opcode: OpCode = OpCode.CALL_METHOD
+    elif isinstance(callee, Super):
+      self.__getVariable(Token(TokenType.THIS, "this", None, callee.keyword.line))
+      self.__getVariable(callee.keyword)
+      self.__emitShort(OpCode.GET_SUPER_METHOD, self.__constant(callee.method.lexeme), callee.method.line)
+      opcode: OpCode = OpCode.CALL_METHOD
+    else:
+      self.__expression(callee)
+      opcode: OpCode = OpCode.CALL
+
+    for argument in expr.arguments:
+      self.__expression(argument)
+    self.__emitByte(opcode, len(expr.arguments), expr.paren.line)
+
+  def visitGetExpr(self, expr: Get) -> None:
+    self.__expression(expr.object)
+    self.__emitShort(OpCode.GET_PROPERTY, self.__constant(expr.name.lexeme), expr.name.line)
+
+  def visitSetExpr(self, expr: Set) -> None:
+    self.__expression(expr.object)
+    if not isinstance(expr.object, This):
+      self.__emit(OpCode.CHECK_INSTANCE, expr.name.line)
+    self.__expression(expr.value)
+    self.__emitShort(OpCode.SET_PROPERTY, self.__constant(expr.name.lexeme), expr.name.line)
+
+  def visitSuperExpr(self, expr: Super) -> None:
+    self.__getVariable(Token(TokenType.THIS, "this", None, expr.keyword.line))
+    self.__getVariable(expr.keyword)
+    self.__emitShort(OpCode.GET_SUPER, self.__constant(expr.method.lexeme), expr.method.line)
+
+  def visitThisExpr(self, expr: This) -> None:
+    self.__getVariable(expr.keyword)
+
+  def __function(self, stmt: Function, type: FunctionType) -> None:
+    function: FunctionProto = FunctionProto(stmt.name.lexeme, len(stmt.params))
+    self.state = Compiler.FunctionState(self.state, function, type)
+    self.__beginScope()
+    for param in stmt.params:
+      self.__addLocal(param)
+    for statment in stmt.body:
+      self.__statement(statment)
+    self.__emitReturn()
+
+    state: Compiler.FunctionState = self.state
+    self.state = state.enclosing
+    self.__emitShort(OpCode.CLOSURE, self.__constant(function), stmt.name.line)
+    for index, isLocal in state.upvalues:
+      self.__emit(1 if isLocal else 0)
+      self.__emit(index)
+
+  def __define(self, name: Token) -> None:
+    if self.state.scopeDepth > 0:
+      self.__addLocal(name)
+    else:
+      self.__emitShort(OpCode.DEFINE_GLOBAL, self.__constant(name.lexeme), name.line)
+
+  def __addLocal(self, name: Token) -> None:
+    if len(self.state.locals) == 256:
+      from .Lox import Lox
+      Lox.errort(name, "Too many local variables in function.")
+      return
+    self.state.locals.append(Compiler.Local(name.lexeme, self.state.scopeDepth))
+
+  def __getVariable(self, name: Token) -> None:
+    slot: int = self.__resolveLocal(self.state, name.lexeme)
+    if slot != -1:
+      self.__emitByte(OpCode.GET_LOCAL, slot, name.line)
+      return
+
+    slot = self.__resolveUpvalue(self.state, name)
+    if slot != -1:
+      self.__emitByte(OpCode.GET_UPVALUE, slot, name.line)
+    else:
+      self.__emitShort(OpCode.GET_GLOBAL, self.__constant(name.lexeme), name.line)
+
+  def __setVariable(self, name: Token) -> None:
+    slot: int = self.__resolveLocal(self.state, name.lexeme)
+    if slot != -1:
+      self.__emitByte(OpCode.SET_LOCAL, slot, name.line)
+      return
+
+    slot = self.__resolveUpvalue(self.state, name)
+    if slot != -1:
+      self.__emitByte(OpCode.SET_UPVALUE, slot, name.line)
+    else:
+      self.__emitShort(OpCode.SET_GLOBAL, self.__constant(name.lexeme), name.line)
+
+  @staticmethod
+  def __resolveLocal(state: 'Compiler.FunctionState', name: str) -> int:
+    for i in range(len(state.locals) - 1, -1, -1):
+      if state.locals[i].name == name:
+        return i
+    return -1
+
+  def __resolveUpvalue(self, state: 'Compiler.FunctionState', name: Token) -> int:
+    if state.enclosing is None:
+      return -1
+
+    local: int = self.__resolveLocal(state.enclosing, name.lexeme)
+    if local != -1:
+      state.enclosing.locals[local].isCaptured = True
+      return self.__addUpvalue(state, local, True, name)
+
+    upvalue: int = self.__resolveUpvalue(state.enclosing, name)
+    if upvalue != -1:
+      return self.__addUpvalue(state, upvalue, False, name)
+
+    return -1
+
+  def __addUpvalue(self, state: 'Compiler.FunctionState', index: int, isLocal: bool, name: Token) -> int:
+    upvalue: tuple[int, bool] = (index, isLocal)
+    if upvalue in state.upvalues:
+      return state.upvalues.index(upvalue)
+
+    if len(state.upvalues) == 256:
+      from .Lox import Lox
+      Lox.errort(name, "Too many closure variables in function.")
+      return 0
+
+    state.upvalues.append(upvalue)
+    state.function.upvalueCount = len(state.upvalues)
+    return len(state.upvalues) - 1
+
+  def __beginScope(self) -> None:
+    self.state.scopeDepth += 1
+
+  def __endScope(self) -> None:
+    state: Compiler.FunctionState = self.state
+    state.scopeDepth -= 1
+    while state.locals and state.locals[-1].depth > state.scopeDepth:
+      self.__emit(OpCode.CLOSE_UPVALUE if state.locals[-1].isCaptured else OpCode.POP)
+      state.locals.pop()
+
+  def __chunk(self) -> Chunk:
+    return self.state.function.chunk
+
+  def __emit(self, byte: int, line: int = None) -> None:
+    if line is not None:
+      self.line = line
+    self.__chunk().write(byte, self.line)
+
+  def __emitByte(self, op: OpCode, operand: int, line: int) -> None:
+    self.__emit(op, line)
+    self.__emit(operand)
+
+  def __emitShort(self, op: OpCode, operand: int, line: int = None) -> None:
+    self.__emit(op, line)
+    self.__emit(operand >> 8)
+    self.__emit(operand & 0xff)
+
+  def __emitJump(self, op: OpCode) -> int:
+    self.__emitShort(op, 0xffff)
+    return len(self.__chunk().code) - 2
+
+  def __patchJump(self, offset: int) -> None:
+    code = self.__chunk().code
+    jump: int = len(code) - offset - 2
+    if jump > 0xffff:
+      from .Lox import Lox
+      Lox.errorl(self.line, "Too much code to jump over.")
+      return
+    code[offset] = jump >> 8
+    code[offset + 1] = jump & 0xff
+
+  def __emitLoop(self, loopStart: int) -> None:
+    offset: int = len(self.__chunk().code) - loopStart + 3
+    if offset > 0xffff:
+      from .Lox import Lox
+      Lox.errorl(self.line, "Loop body too large.")
+      return
+    self.__emitShort(OpCode.LOOP, offset)
+
+  def __emitReturn(self) -> None:
+    if self.state.type == FunctionType.INITIALIZER:
+      self.__emitByte(OpCode.GET_LOCAL, 0, self.line)
+    else:
+      self.__emit(OpCode.NIL)
+    self.__emit(OpCode.RETURN)
+
+  def __constant(self, value: any) -> int:
+    index: int = self.__chunk().addConstant(value)
+    if index > 0xffff:
+      from .Lox import Lox
+      Lox.errorl(self.line, "Too many constants in one chunk.")
+      return 0
+    return index
+
+  def __statement(self, stmt: Stmt) -> None:
+    stmt.accept(self)
+
+  def __expression(self, expr: Expr) -> None:
+    expr.accept(self)
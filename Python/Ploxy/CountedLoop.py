@@ -0,0 +1,17 @@
+from typing import Callable
+from .Expr import Expr
+from .Stmt import Stmt
+
+class CountedLoop:
+  # The shape a counting for loop desugars to,
+  #   for (var i = start; i < limit; i = i + step) body
+  # with the limit a literal or a variable and the step a number literal.
+  __slots__ = ("slot", "compare", "limit", "step", "increment", "body")
+  
+  def __init__(self, slot: int, compare: Callable[[float, float], bool], limit: Expr, step: float, increment: Expr, body: Stmt) -> None:
+    self.slot: int = slot
+    self.compare: Callable[[float, float], bool] = compare
+    self.limit: Expr = limit
+    self.step: float = step
+    self.increment: Expr = increment
+    self.body: Stmt = body
@@ -1,22 +1,12 @@
-from .Token import Token
-from .RuntimeError import RuntimeException
-
 class Environment:
-  def __init__(self, enclosing = None) -> None:
+  __slots__ = ("enclosing", "values")
+  
+  def __init__(self, enclosing: 'Environment' = None) -> None:
     self.enclosing: Environment = enclosing
-    self.values: dict[str, any] = {}
-    
-  def get(self, name: Token) -> any:
-    if name.lexeme in self.values:
-      return self.values[name.lexeme]
-    
-    if self.enclosing != None:
-      return self.enclosing.get(name)
-    
-    raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
+    self.values: list[any] = []
     
-  def define(self, name:str, value: any) -> None:
-    self.values[name] = value
+  def define(self, value: any) -> None:
+    self.values.append(value)
     
   def ancestor(self, distance: int) -> 'Environment':
     environment: Environment = self
@@ -25,20 +15,8 @@ class Environment:
       
     return environment
     
-  def getAt(self, distance: int, name: str) -> any:
-    return self.ancestor(distance).values.get(name)
+  def getAt(self, distance: int, slot: int) -> any:
+    return self.ancestor(distance).values[slot]
   
-  def assignAt(self, distance: int, name: Token, value: any) -> None:
-    self.ancestor(distance).values[name.lexeme] = value
-      
-  def assign(self, name: Token, value: any) -> None:
-    if name.lexeme in self.values:
-      self.values[name.lexeme] = value
-      return
-    
-    if self.enclosing != None:
-      self.enclosing.assign(name, value)
-      return
-      
-    raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
-    
\ No newline at end of file
+  def assignAt(self, distance: int, slot: int, value: any) -> None:
+    self.ancestor(distance).values[slot] = value
@@ -1,48 +1,57 @@
 # This file is auto-generated by __defineAst.
 
-from typing import Protocol, TypeVar
+from typing import TYPE_CHECKING, Protocol, TypeVar
 from abc import ABC, abstractmethod
 from .Token import Token
 
+if TYPE_CHECKING:
+    from .GlobalEnvironment import GlobalCell
+    from .LoxCallable import LoxCallable
+    from .LoxClass import LoxClass
+    from .LoxFunction import LoxFunction
+    from .Shape import Shape
+
 R = TypeVar('R')
 
 class Expr(ABC):
+    __slots__ = ()
+
     class Visitor(Protocol[R]):
        @abstractmethod
-       def visitAssignExpr(self, expr: 'Expr.Assign'):
+       def visitAssignExpr(self, expr: 'Assign'):
           pass
        @abstractmethod
-       def visitBinaryExpr(self, expr: 'Expr.Binary'):
+       def visitBinaryExpr(self, expr: 'Binary'):
           pass
        @abstractmethod
-       def visitCallExpr(self, expr: 'Expr.Call'):
+       def visitCallExpr(self, expr: 'Call'):
           pass
        @abstractmethod
-       def visitGetExpr(self, expr: 'Expr.Get'):
+       def visitGetExpr(self, expr: 'Get'):
           pass
        @abstractmethod
-       def visitGroupingExpr(self, expr: 'Expr.Grouping'):
+       def visitGroupingExpr(self, expr: 'Grouping'):
           pass
        @abstractmethod
-       def visitLiteralExpr(self, expr: 'Expr.Literal'):
+       def visitLiteralExpr(self, expr: 'Literal'):
           pass
        @abstractmethod
-       def visitLogicalExpr(self, expr: 'Expr.Logical'):
+       def visitLogicalExpr(self, expr: 'Logical'):
           pass
        @abstractmethod
-       def visitSetExpr(self, expr: 'Expr.Set'):
+       def visitSetExpr(self, expr: 'Set'):
           pass
        @abstractmethod
-       def visitSuperExpr(self, expr: 'Expr.Super'):
+       def visitSuperExpr(self, expr: 'Super'):
           pass
        @abstractmethod
-       def visitThisExpr(self, expr: 'Expr.This'):
+       def visitThisExpr(self, expr: 'This'):
           pass
        @abstractmethod
-       def visitUnaryExpr(self, expr: 'Expr.Unary'):
+       def visitUnaryExpr(self, expr: 'Unary'):
           pass
        @abstractmethod
-       def visitVariableExpr(self, expr: 'Expr.Variable'):
+       def visitVariableExpr(self, expr: 'Variable'):
           pass
 
     @abstractmethod
@@ -50,40 +59,63 @@ class Expr(ABC):
         raise NotImplementedError()
 
 class Assign(Expr):
+    __slots__ = ("name", "value", "depth", "slot", "cell")
+
     def __init__(self, name: Token, value: Expr) -> None:
         self.name = name
         self.value = value
+        self.depth: int = None
+        self.slot: int = None
+        self.cell: GlobalCell = None
 
     def accept(self, visitor) -> R:
         return visitor.visitAssignExpr(self)
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right", "operand", "operation", "hits")
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
         self.right = right
+        self.operand: type = None
+        self.operation: any = None
+        self.hits: int = 0
 
     def accept(self, visitor) -> R:
         return visitor.visitBinaryExpr(self)
 
 class Call(Expr):
+    __slots__ = ("callee", "paren", "arguments", "function", "hits")
+
     def __init__(self, callee: Expr, paren: Token, arguments: list[Expr]) -> None:
         self.callee = callee
         self.paren = paren
         self.arguments = arguments
+        self.function: LoxCallable = None
+        self.hits: int = 0
 
     def accept(self, visitor) -> R:
         return visitor.visitCallExpr(self)
 
 class Get(Expr):
+    __slots__ = ("object", "name", "shape", "index", "method", "shapes", "hits")
+
     def __init__(self, object: Expr, name: Token) -> None:
         self.object = object
         self.name = name
+        self.shape: Shape = None
+        self.index: int = None
+        self.method: LoxFunction = None
+        self.shapes: dict = None
+        self.hits: int = 0
 
     def accept(self, visitor) -> R:
         return visitor.visitGetExpr(self)
 
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -91,6 +123,8 @@ class Grouping(Expr):
         return visitor.visitGroupingExpr(self)
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: any) -> None:
         self.value = value
 
@@ -98,6 +132,8 @@ class Literal(Expr):
         return visitor.visitLiteralExpr(self)
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
@@ -107,30 +143,47 @@ class Logical(Expr):
         return visitor.visitLogicalExpr(self)
 
 class Set(Expr):
+    __slots__ = ("object", "name", "value", "shape", "index", "transition")
+
     def __init__(self, object: Expr, name: Token, value: Expr) -> None:
         self.object = object
         self.name = name
         self.value = value
+        self.shape: Shape = None
+        self.index: int = None
+        self.transition: Shape = None
 
     def accept(self, visitor) -> R:
         return visitor.visitSetExpr(self)
 
 class Super(Expr):
+    __slots__ = ("keyword", "method", "depth", "slot", "superclass", "function")
+
     def __init__(self, keyword: Token, method: Token) -> None:
         self.keyword = keyword
         self.method = method
+        self.depth: int = None
+        self.slot: int = None
+        self.superclass: LoxClass = None
+        self.function: LoxFunction = None
 
     def accept(self, visitor) -> R:
         return visitor.visitSuperExpr(self)
 
 class This(Expr):
+    __slots__ = ("keyword", "depth", "slot")
+
     def __init__(self, keyword: Token) -> None:
         self.keyword = keyword
+        self.depth: int = None
+        self.slot: int = None
 
     def accept(self, visitor) -> R:
         return visitor.visitThisExpr(self)
 
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr) -> None:
         self.operator = operator
         self.right = right
@@ -139,8 +192,14 @@ class Unary(Expr):
         return visitor.visitUnaryExpr(self)
 
 class Variable(Expr):
+    __slots__ = ("name", "depth", "slot", "hits", "cell")
+
     def __init__(self, name: Token) -> None:
         self.name = name
+        self.depth: int = None
+        self.slot: int = None
+        self.hits: int = 0
+        self.cell: GlobalCell = None
 
     def accept(self, visitor) -> R:
         return visitor.visitVariableExpr(self)
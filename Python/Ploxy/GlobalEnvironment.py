@@ -0,0 +1,46 @@
+from .Token import Token
+from .RuntimeError import RuntimeException
+
+EMPTY = object()
+
+class GlobalCell:
+  # Holds one global. A cell is created the first time its name is looked
+  # up or defined, and is never replaced, so a use site can keep a reference
+  # to it. A name that is referenced before it is defined has an EMPTY cell.
+  __slots__ = ("value",)
+
+  def __init__(self) -> None:
+    self.value: any = EMPTY
+
+class GlobalEnvironment:
+  def __init__(self) -> None:
+    self.cells: dict[str, GlobalCell] = {}
+
+  def cell(self, name: str) -> GlobalCell:
+    cell: GlobalCell = self.cells.get(name)
+    if cell is None:
+      cell = GlobalCell()
+      self.cells[name] = cell
+    return cell
+
+  def get(self, name: Token) -> any:
+    cell: GlobalCell = self.cells.get(name.lexeme)
+    if cell is not None and cell.value is not EMPTY:
+      return cell.value
+
+    raise GlobalEnvironment.undefined(name)
+
+  def define(self, name: str, value: any) -> None:
+    self.cell(name).value = value
+
+  def assign(self, name: Token, value: any) -> None:
+    cell: GlobalCell = self.cells.get(name.lexeme)
+    if cell is not None and cell.value is not EMPTY:
+      cell.value = value
+      return
+
+    raise GlobalEnvironment.undefined(name)
+
+  @staticmethod
+  def undefined(name: Token) -> RuntimeException:
+    return RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
@@ -1,28 +1,51 @@
-from typing import TYPE_CHECKING
 import time
+import operator
 from .Expr import Expr, Literal, Grouping, Unary, Binary, Variable, Assign, Logical, Call, Get, Set, Super, This
 from .TokenType import TokenType
 from .Token import Token
 from .RuntimeError import RuntimeException
 from .Stmt import Stmt, Expression, Print, Var, Block, If, While, Function, Return, Class
 from .Environment import Environment
+from .GlobalEnvironment import GlobalEnvironment, GlobalCell, EMPTY
 from .LoxCallable import LoxCallable
-from .Return import Return
 from .LoxClass import LoxClass
 from .LoxInstance import LoxInstance
-
-if TYPE_CHECKING:
-  from LoxFunction import LoxFunction
+from .LoxFunction import LoxFunction
+from .Shape import Shape
+from .CountedLoop import CountedLoop
+from .Specialized import LocalVariable, GlobalVariable, FieldGet, FunctionCall, MethodCall, TypedBinary
+from .Runtime import isEqual, checkNumberOperands, stringify
 
 class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
+  POLYMORPHIC_LIMIT: int = 8
+  # Executions before a node specializes, and after a failed guard or a
+  # failed attempt, how many more it runs generically before trying again.
+  WARMUP: int = 8
+  COOLDOWN: int = 64
+  # Operators a Binary node quickens to, by operand type.
+  specializations: dict[tuple[TokenType, type], any] = {
+    (TokenType.BANG_EQUAL, float): operator.ne,
+    (TokenType.EQUAL_EQUAL, float): operator.eq,
+    (TokenType.GREATER, float): operator.gt,
+    (TokenType.GREATER_EQUAL, float): operator.ge,
+    (TokenType.LESS, float): operator.lt,
+    (TokenType.LESS_EQUAL, float): operator.le,
+    (TokenType.MINUS, float): operator.sub,
+    (TokenType.PLUS, float): operator.add,
+    (TokenType.SLASH, float): operator.truediv,
+    (TokenType.STAR, float): operator.mul,
+    (TokenType.BANG_EQUAL, str): operator.ne,
+    (TokenType.EQUAL_EQUAL, str): operator.eq,
+    (TokenType.PLUS, str): operator.add,
+  }
+  
   def __init__(self) -> None:
-    self.globals: Environment = Environment()
+    self.globals: GlobalEnvironment = GlobalEnvironment()
     self.environment: Environment = self.globals
     self.globals.define("clock", ClockFunction())
-    self.locals: dict[Expr, int] = {}
   
   def interpret(self, statments: list[Stmt]) -> None:
-    from Lox import Lox
+    from .Lox import Lox
     try:
       for statment in statments:
         self.__execute(statment)
@@ -39,7 +62,7 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
     right: any = self.__evaluate(expr.right)
     
     if expr.operator.type == TokenType.MINUS:
-      self.__checkNumberOperands(expr.operator, right)
+      self.__checkNumberOperand(expr.operator, right)
       return -float(right)
     elif expr.operator.type == TokenType.BANG:
       return not self.__isTruthy(right)
@@ -50,26 +73,57 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
     left: any = self.__evaluate(expr.left)
     right: any = self.__evaluate(expr.right)
     
+    value: any = self.__binary(expr, left, right)
+    
+    expr.hits += 1
+    if expr.hits == Interpreter.WARMUP:
+      operation: any = None
+      if type(left) is type(right):
+        operation = Interpreter.specializations.get((expr.operator.type, type(left)))
+      if operation is not None:
+        expr.operand = type(left)
+        expr.operation = operation
+        expr.__class__ = TypedBinary
+      else:
+        expr.hits = -Interpreter.COOLDOWN
+    return value
+  
+  def visitTypedBinaryExpr(self, expr: TypedBinary) -> any:
+    # Applies the operator for the operand type the node has seen, for as
+    # long as both operands still have that type.
+    left: any = expr.left.accept(self)
+    right: any = expr.right.accept(self)
+    operand: type = expr.operand
+    if type(left) is operand and type(right) is operand:
+      try:
+        return expr.operation(left, right)
+      except ZeroDivisionError:
+        return self.__binary(expr, left, right)
+    
+    self.__deoptimize(expr, Binary)
+    return self.__binary(expr, left, right)
+  
+  def __binary(self, expr: Binary, left: any, right: any) -> any:
     if expr.operator.type == TokenType.BANG_EQUAL:
-      return not self.__isEqual(left, right)
+      return not isEqual(left, right)
     elif expr.operator.type == TokenType.EQUAL_EQUAL:
-      return self.__isEqual(left, right)
+      return isEqual(left, right)
     
     elif expr.operator.type == TokenType.GREATER:
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       return float(left) > float(right)
     elif expr.operator.type == TokenType.GREATER_EQUAL:
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       return float(left) >= float(right)
     elif expr.operator.type == TokenType.LESS: 
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       return float(left) < float(right)
     elif expr.operator.type == TokenType.LESS_EQUAL:
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       return float(left) <= float(right)
     
     elif expr.operator.type == TokenType.MINUS:
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       return float(left) - float(right)
     
     elif expr.operator.type == TokenType.PLUS:
@@ -81,13 +135,13 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
         raise RuntimeException(expr.operator, "Operands must be two numbers or two strings.")
       
     elif expr.operator.type == TokenType.SLASH:
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       if float(right) == 0:
         raise RuntimeException(expr.operator, "Division by zero.")
       return float(left) / float(right)
     
     elif expr.operator.type == TokenType.STAR:
-      self.__checkNumberOperands(expr.operator, left, right)
+      checkNumberOperands(expr.operator, left, right)
       return float(left) * float(right)
     
     return None
@@ -98,31 +152,47 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
   
   def visitFunctionStmt(self, stmt:Function) -> None: 
     function: LoxFunction = LoxFunction(stmt, self.environment, False)
-    self.environment.define(stmt.name.lexeme, function)
+    self.__declare(stmt.name, function)
     return None
   
   def visitPrintStmt(self, stmt: Print) -> None:
     value: any = self.__evaluate(stmt.expression)
-    print(self.__stringify(value))
+    print(stringify(value))
     return None
   
-  def visitReturnStmt(self, stmt: Return) -> None:
+  def visitReturnStmt(self, stmt: Return) -> tuple:
     value: any = None
     if stmt.value != None:
       value = self.__evaluate(stmt.value)
     
-    raise Return(value)
+    # Statements complete with None, or with a one-element tuple holding the
+    # value of a return that has to unwind to the enclosing call.
+    return (value,)
   
   def visitVarStmt(self, stmt: Var) -> None:
     value: any = None
     if stmt.initializer != None:
       value = self.__evaluate(stmt.initializer)
       
-    self.environment.define(stmt.name.lexeme, value)
+    self.__declare(stmt.name, value)
     return None
   
-  def visitBlockStmt(self, stmt: Block) -> None:
-    self.executeBlock(stmt.statements, Environment(self.environment))
+  def visitBlockStmt(self, stmt: Block) -> tuple:
+    if stmt.declares and (stmt.escapes or self.environment is self.globals):
+      return self.executeBlock(stmt.statements, Environment(self.environment))
+    
+    # The block's locals, if any, were given the slots after those of the
+    # environment around it, and are dropped again once it completes. An
+    # early return leaves them behind, but the frame is discarded anyway.
+    values: list[any] = self.environment.values if stmt.declares else None
+    base: int = len(values) if stmt.declares else None
+    for statment in stmt.statements:
+      completion: tuple = statment.accept(self)
+      if completion is not None:
+        return completion
+    
+    if values is not None:
+      del values[base:]
     return None
   
   def visitClassStmt(self, stmt: Class) -> None:
@@ -132,11 +202,15 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
       if not isinstance(superclass, LoxClass):
         raise RuntimeException(stmt.superclass.name, "Superclass must be a class.")
       
-    self.environment.define(stmt.name.lexeme, None)
+    environment: Environment = self.environment
+    slot: int = None
+    if environment is not self.globals:
+      slot = len(environment.values)
+    self.__declare(stmt.name, None)
     
     if stmt.superclass != None:
       self.environment = Environment(self.environment)
-      self.environment.define("super", superclass)
+      self.environment.define(superclass)
     
     methods: dict[str, LoxFunction] = {}
     for method in stmt.methods:
@@ -148,36 +222,92 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
     if superclass != None:
       self.environment = self.environment.enclosing
       
-    self.environment.assign(stmt.name, Klass)
+    if slot is None:
+      self.globals.assign(stmt.name, Klass)
+    else:
+      environment.values[slot] = Klass
     return None
   
-  def visitIfStmt(self, stmt: If) -> None:
+  def visitIfStmt(self, stmt: If) -> tuple:
     if self.__isTruthy(self.__evaluate(stmt.condition)):
-      self.__execute(stmt.thenBranch)
+      return self.__execute(stmt.thenBranch)
     elif stmt.elseBranch != None:
-      self.__execute(stmt.elseBranch)
+      return self.__execute(stmt.elseBranch)
       
     return None
   
-  def visitWhileStmt(self, stmt: While) -> None:
+  def visitWhileStmt(self, stmt: While) -> tuple:
+    if stmt.counted is not None:
+      return self.__countedLoop(stmt, stmt.counted)
+    
     while self.__isTruthy(self.__evaluate(stmt.condition)):
-      self.__execute(stmt.body)
+      completion: tuple = self.__execute(stmt.body)
+      if completion is not None:
+        return completion
       
     return None
   
   def visitAssignExpr(self, expr: Assign) -> any:
     value: any = self.__evaluate(expr.value)
     
-    distance: int = self.locals.get(expr)
-    if distance != None:
-      self.environment.assignAt(distance, expr.name, value)
+    if expr.depth != None:
+      self.environment.assignAt(expr.depth, expr.slot, value)
     else:
-      self.globals.assign(expr.name, value)
+      cell: GlobalCell = self.__globalCell(expr)
+      if cell.value is EMPTY:
+        raise GlobalEnvironment.undefined(expr.name)
+      cell.value = value
 
     return value
 
   def visitCallExpr(self, expr: Call) -> any:
+    if type(expr.callee) is Get:
+      return self.__invoke(expr, expr.callee)
+    
     callee: any = self.__evaluate(expr.callee)
+    expr.hits += 1
+    if expr.hits == Interpreter.WARMUP:
+      if isinstance(callee, LoxCallable) and callee.arity() == len(expr.arguments):
+        expr.function = callee
+        expr.__class__ = FunctionCall
+      else:
+        expr.hits = -Interpreter.COOLDOWN
+    return self.__call(expr, callee)
+  
+  def visitFunctionCallExpr(self, expr: FunctionCall) -> any:
+    # The node keeps calling the function it has always called, so its
+    # arity has already been checked.
+    callee: any = expr.callee.accept(self)
+    if callee is not expr.function:
+      self.__deoptimize(expr, Call)
+      return self.__call(expr, callee)
+    
+    arguments: list[any] = []
+    for argument in expr.arguments:
+      arguments.append(argument.accept(self))
+    try:
+      return callee.call(self, arguments)
+    except RecursionError:
+      raise RuntimeException(expr.paren, "Stack overflow.") from None
+  
+  def visitMethodCallExpr(self, expr: MethodCall) -> any:
+    # The receiver still has the shape the method was looked up for, so the
+    # method cached on the callee is the one to run.
+    get: Get = expr.callee
+    object: any = get.object.accept(self)
+    if type(object) is not LoxInstance or object.shape is not get.shape:
+      self.__deoptimize(expr, Call)
+      return self.__invokeOn(expr, get, object)
+    
+    arguments: list[any] = [object]
+    for argument in expr.arguments:
+      arguments.append(argument.accept(self))
+    try:
+      return get.method.invoke(self, arguments)
+    except RecursionError:
+      raise RuntimeException(expr.paren, "Stack overflow.") from None
+  
+  def __call(self, expr: Call, callee: any) -> any:
     arguments: list[any] = []
     
     for argument in expr.arguments:
@@ -191,14 +321,91 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
     if len(arguments) != function.arity():
       raise RuntimeException(expr.paren, f"Expected {function.arity()} arguments but got {len(arguments)}.")
     
-    return function.call(self, arguments)
+    try:
+      return function.call(self, arguments)
+    except RecursionError:
+      raise RuntimeException(expr.paren, "Stack overflow.") from None
+  
+  def __invoke(self, expr: Call, get: Get) -> any:
+    # obj.method(args) runs the method with the receiver in slot 0 of the
+    # argument list, so no bound method is created for the call.
+    object: any = self.__evaluate(get.object)
+    return self.__invokeOn(expr, get, object)
+  
+  def __invokeOn(self, expr: Call, get: Get, object: any) -> any:
+    if not isinstance(object, LoxInstance):
+      raise RuntimeException(get.name, "Only instances have properties.")
+    
+    if object.shape is not get.shape:
+      self.__cacheProperty(get, object)
+    if get.index is not None:
+      return self.__call(expr, object.values[get.index])
+    
+    method: LoxFunction = get.method
+    expr.hits += 1
+    if expr.hits == Interpreter.WARMUP:
+      if method.arity() == len(expr.arguments):
+        expr.__class__ = MethodCall
+      else:
+        expr.hits = -Interpreter.COOLDOWN
+    arguments: list[any] = [object]
+    for argument in expr.arguments:
+      arguments.append(self.__evaluate(argument))
+    
+    if len(arguments) - 1 != method.arity():
+      raise RuntimeException(expr.paren, f"Expected {method.arity()} arguments but got {len(arguments) - 1}.")
+    
+    try:
+      return method.invoke(self, arguments)
+    except RecursionError:
+      raise RuntimeException(expr.paren, "Stack overflow.") from None
 
   def visitGetExpr(self, expr: Get) -> any:
     object: any = self.__evaluate(expr.object)
+    return self.__getProperty(expr, object)
+  
+  def __getProperty(self, expr: Get, object: any) -> any:
     if isinstance(object, LoxInstance):
-      return object.get(expr.name)
+      if object.shape is not expr.shape:
+        self.__cacheProperty(expr, object)
+      if expr.index is not None:
+        expr.hits += 1
+        if expr.hits == Interpreter.WARMUP:
+          expr.__class__ = FieldGet
+        return object.values[expr.index]
+      return expr.method.bind(object)
     
     raise RuntimeException(expr.name, "Only instances have properties.")
+  
+  def visitFieldGetExpr(self, expr: FieldGet) -> any:
+    object: any = expr.object.accept(self)
+    if type(object) is LoxInstance and object.shape is expr.shape:
+      return object.values[expr.index]
+    
+    self.__deoptimize(expr, Get)
+    return self.__getProperty(expr, object)
+  
+  def __cacheProperty(self, expr: Get, object: LoxInstance) -> None:
+    # The node caches the last shape it saw (monomorphic) and every shape
+    # seen so far in a small table (polymorphic). Shapes are per class, so a
+    # cached method stays valid for as long as the shape matches.
+    shape: Shape = object.shape
+    entry: tuple[int, LoxFunction] = expr.shapes.get(shape) if expr.shapes is not None else None
+    if entry is None:
+      lexeme: str = expr.name.lexeme
+      entry = (shape.index.get(lexeme), None)
+      if entry[0] is None:
+        entry = (None, object.Klass.findMethod(lexeme))
+        if entry[1] is None:
+          raise RuntimeException(expr.name, f"Undefined property '{lexeme}'.")
+      
+      if expr.shapes is None:
+        expr.shapes = {}
+      if len(expr.shapes) < Interpreter.POLYMORPHIC_LIMIT:
+        expr.shapes[shape] = entry
+    
+    expr.shape = shape
+    expr.index, expr.method = entry
 
   def visitLogicalExpr(self, expr: Logical) -> any:
     left: any = self.__evaluate(expr.left)
@@ -217,52 +424,146 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
       raise RuntimeException(expr.name, "Only instances have fields.")
     
     value: any = self.__evaluate(expr.value)
-    object.set(expr.name, value)
+    shape: Shape = object.shape
+    if shape is not expr.shape:
+      expr.shape = shape
+      expr.index = shape.index.get(expr.name.lexeme)
+      expr.transition = shape.add(expr.name.lexeme) if expr.index is None else None
+    
+    if expr.transition is None:
+      object.values[expr.index] = value
+    else:
+      object.shape = expr.transition
+      object.values.append(value)
     return value
       
   def visitSuperExpr(self, expr: Super) -> any:
-    distance: int = self.locals.get(expr)
-    superclass: LoxClass = self.environment.getAt(distance, "super")
+    distance: int = expr.depth
+    superclass: LoxClass = self.environment.getAt(distance, expr.slot)
+    
+    object: LoxInstance = self.environment.getAt(distance - 1, 0)
     
-    object: LoxInstance = self.environment.getAt(distance - 1, "this")
+    if superclass is expr.superclass:
+      return expr.function.bind(object)
     
     method: LoxFunction = superclass.findMethod(expr.method.lexeme)
     
     if method == None:
       raise RuntimeException(expr.method, f"Undefined property '{expr.method.lexeme}'.")
     
+    expr.superclass = superclass
+    expr.function = method
     return method.bind(object)
 
   def visitThisExpr(self, expr: This) -> any:
     return self.__lookUpVariable(expr.keyword, expr)
 
   def visitVariableExpr(self, expr: Variable) -> any:
+    expr.hits += 1
+    if expr.hits == Interpreter.WARMUP:
+      expr.__class__ = LocalVariable if expr.depth is not None else GlobalVariable
     return self.__lookUpVariable(expr.name, expr)
   
+  def visitLocalVariableExpr(self, expr: LocalVariable) -> any:
+    environment: Environment = self.environment
+    depth: int = expr.depth
+    while depth:
+      environment = environment.enclosing
+      depth -= 1
+    return environment.values[expr.slot]
+  
+  def visitGlobalVariableExpr(self, expr: GlobalVariable) -> any:
+    value: any = expr.cell.value
+    if value is not EMPTY:
+      return value
+    
+    self.__deoptimize(expr, Variable)
+    raise GlobalEnvironment.undefined(expr.name)
+  
   def __lookUpVariable(self, name: Token, expr: Expr) -> any:
-    distance: int = self.locals.get(expr)
+    distance: int = expr.depth
     if distance != None:
-      return self.environment.getAt(distance, name.lexeme)
+      environment: Environment = self.environment
+      for _ in range(distance):
+        environment = environment.enclosing
+      return environment.values[expr.slot]
+    else:
+      value: any = self.__globalCell(expr).value
+      if value is EMPTY:
+        raise GlobalEnvironment.undefined(name)
+      return value
+  
+  def __globalCell(self, expr: Variable | Assign) -> GlobalCell:
+    # A global is looked up by name once per use site. The cell stays valid
+    # for good, whether the global is defined later or redefined.
+    cell: GlobalCell = expr.cell
+    if cell is None:
+      cell = self.globals.cell(expr.name.lexeme)
+      expr.cell = cell
+    return cell
+  
+  def __declare(self, name: Token, value: any) -> None:
+    if self.environment is self.globals:
+      self.globals.define(name.lexeme, value)
     else:
-      return self.globals.get(name)
+      self.environment.define(value)
     
   def __evaluate(self, expr: Expr) -> any:
     return expr.accept(self)
   
-  def __execute(self, stmt: Stmt) -> None:
-    stmt.accept(self)
+  @staticmethod
+  def __deoptimize(expr: Expr, generic: type) -> None:
+    # A failed guard returns the node to its generic class, which counts
+    # up from below zero before the node may be specialized again.
+    expr.__class__ = generic
+    expr.hits = -Interpreter.COOLDOWN
+  
+  def __countedLoop(self, stmt: While, loop: CountedLoop) -> tuple:
+    # The counter is compared and stepped as a float straight in its slot.
+    # A counter or limit that is not a number drops back to evaluating the
+    # condition and increment as written.
+    values: list[any] = self.environment.values
+    slot: int = loop.slot
+    compare: any = loop.compare
+    limit: Expr = loop.limit
+    constant: bool = isinstance(limit, Literal)
+    bound: any = limit.value if constant else None
+    step: float = loop.step
+    body: Stmt = loop.body
+    while True:
+      if not constant:
+        bound = self.__evaluate(limit)
+      counter: any = values[slot]
+      if type(counter) is float and type(bound) is float:
+        if not compare(counter, bound):
+          return None
+      elif not self.__isTruthy(self.__evaluate(stmt.condition)):
+        return None
+      
+      completion: tuple = body.accept(self)
+      if completion is not None:
+        return completion
+      
+      counter = values[slot]
+      if type(counter) is float:
+        values[slot] = counter + step
+      else:
+        self.__evaluate(loop.increment)
     
-  def resolve(self, expr: Expr, depth: int) -> None:
-    self.locals[expr] = depth
+  def __execute(self, stmt: Stmt) -> tuple:
+    return stmt.accept(self)
     
-  def executeBlock(self, statments: list[Stmt], environment: Environment) -> None:
+  def executeBlock(self, statments: list[Stmt], environment: Environment) -> tuple:
     previous: Environment = self.environment
     try:
       self.environment = environment
       
       for statment in statments:
-        self.__execute(statment)
+        completion: tuple = statment.accept(self)
+        if completion is not None:
+          return completion
         
+      return None
     finally:
       self.environment = previous
   
@@ -274,41 +575,11 @@ class Interpreter(Expr.Visitor[object], Stmt.Visitor[None]):
         return obj
     return True
   
-  @staticmethod
-  def __isEqual(a: any, b: any) -> bool:
-    if a == None and b == None:
-      return True
-    
-    if a == None:
-      return False
-    
-    return a == b
-  
   @staticmethod
   def __checkNumberOperand(operator: Token, operand: any) -> None:
     if isinstance(operand, (int, float)):
       return
     raise RuntimeException(operator, "Operand must be a number.")
-  
-  @staticmethod
-  def __checkNumberOperands(operator: Token, left: any, right: any) -> None:
-    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
-      return
-    raise RuntimeException(operator, "Operands must be numbers.")
-  
-  @staticmethod
-  def __stringify(obj: any) -> str:
-    if obj == None:
-      return "nil"
-    
-    if isinstance(obj, (int, float)):
-      text: str = str(obj)
-      if text.endswith(".0"):
-        text = text[:-2]
-
-      return text
-    
-    return str(obj)
 
 class ClockFunction(LoxCallable):
   def arity(self) -> int:
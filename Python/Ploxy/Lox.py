@@ -1,4 +1,5 @@
 import sys
+from typing import Iterable
 from .Scanner import Scanner
 from .Token import Token
 from .TokenType import TokenType
@@ -7,17 +8,57 @@ from .RuntimeError import RuntimeException
 from .Interpreter import Interpreter
 from .Stmt import Stmt
 from .Resolver import Resolver
+from .ClosureCompiler import ClosureCompiler
+from .Transpiler import Transpiler
+from .NativeVM import NativeVM
+from .VM import VM
+from .ProgramCache import ProgramCache
+from .Optimizer import Optimizer
+from .Profiler import Profiler
+from .Sampler import Sampler
 
 class Lox:
+  engines: dict[str, type] = {
+    "interpreter": Interpreter,
+    "closure": ClosureCompiler,
+    "compile": Transpiler,
+    "bytecode": VM,
+  }
+  if NativeVM.available:
+    engines["vm"] = NativeVM
   interpreter: Interpreter = Interpreter()
+  useCache: bool = True
+  optimize: bool = True
+  stream: bool = False
+  maxDepth: int = None
+  profiler: Profiler | Sampler = None
   hadError: bool = False
   hadRuntimeError: bool = False
   
+  @staticmethod
+  def useEngine(name: str) -> bool:
+    engine: type = Lox.engines.get(name)
+    if engine == None:
+      return False
+    
+    Lox.interpreter = engine()
+    return True
+    
   @staticmethod
   def runFile(path: str) -> None:
+    if Lox.profiler is not None:
+      Lox.profiler.start()
+    
     with open(path, "r", encoding="utf-8") as file:
-        contents = file.read()
-    Lox.__run(contents)
+      if Lox.stream and not isinstance(Lox.interpreter, NativeVM):
+        Lox.__runStream(file)
+      else:
+        Lox.__run(file.read(), path)
+    
+    if Lox.profiler is not None and not Lox.hadError:
+      Lox.profiler.stop()
+      Lox.profiler.report()
+      Lox.profiler.writeCollapsed(f"{path}.folded")
     
     if Lox.hadError:
       sys.exit(65)
@@ -35,20 +76,54 @@ class Lox:
       Lox.hadError = False
       
   @staticmethod
-  def __run(source: str) -> None:
-    scanner: Scanner = Scanner(source)
-    tokens: list[Token] = scanner.scanTokens()
-    parser: Parser = Parser(tokens)
-    statments: list[Stmt] = parser.parse()
-    
-    if Lox.hadError: return
+  def __run(source: str, path: str = None) -> None:
+    cached: bool = path is not None and Lox.useCache
+    statments: list[Stmt] = ProgramCache.load(path, source) if cached else None
     
-    resolver: Resolver = Resolver(Lox.interpreter)
-    resolver.resolve(statments)
+    if statments is None:
+      scanner: Scanner = Scanner(source)
+      tokens: list[Token] = scanner.scanTokens()
+      parser: Parser = Parser(tokens)
+      statments = parser.parse()
+      
+      if Lox.hadError: return
+      
+      resolver: Resolver = Resolver()
+      resolver.resolve(statments)
+      
+      if Lox.hadError: return
+      
+      if cached:
+        ProgramCache.store(path, source, statments)
     
-    if Lox.hadError: return
+    if isinstance(Lox.interpreter, NativeVM):
+      Lox.interpreter.interpretSource(source)
+    else:
+      if Lox.optimize:
+        statments = Optimizer().optimize(statments)
+      if Lox.profiler is not None:
+        statments = Lox.profiler.instrument(statments)
+      Lox.interpreter.interpret(statments)
     
-    Lox.interpreter.interpret(statments)
+  @staticmethod
+  def __runStream(source: Iterable[str]) -> None:
+    # Each top-level declaration is resolved and executed as soon as it has
+    # been parsed. After a compile error the rest of the file is still
+    # checked but nothing more is executed; a runtime error stops the run.
+    parser: Parser = Parser(Scanner(source).scan())
+    resolver: Resolver = Resolver()
+    optimizer: Optimizer = Optimizer() if Lox.optimize else None
+    for statment in parser.declarations():
+      if Lox.hadError: continue
+      
+      resolver.resolve([statment])
+      if Lox.hadError: continue
+      
+      statments: list[Stmt] = [statment] if optimizer is None else optimizer.optimize([statment])
+      if Lox.profiler is not None:
+        statments = Lox.profiler.instrument(statments)
+      Lox.interpreter.interpret(statments)
+      if Lox.hadRuntimeError: return
     
   @staticmethod
   def runtimeError(error: RuntimeException) -> None:
@@ -1,41 +1,48 @@
 from typing import TYPE_CHECKING
 from .LoxCallable import LoxCallable
 from .LoxFunction import LoxFunction
+from .Shape import Shape
 
 if TYPE_CHECKING:
-  from Interpreter import Interpreter
+  from .Interpreter import Interpreter
 
 class LoxClass(LoxCallable):
   def __init__(self, name: str, superclass: 'LoxClass', methods: dict[str, LoxFunction]) -> None:
     self.superclass: 'LoxClass' = superclass
     self.name: str = name
     self.methods: dict[str, LoxFunction] = methods
+    self.shape: Shape = Shape()
+    # Own methods merged over every inherited one, so a lookup is a single
+    # dict access however deep the hierarchy is.
+    self.methodTable: dict[str, LoxFunction] = {} if superclass == None else dict(superclass.methodTable)
+    self.methodTable.update(methods)
+    self.initializer: LoxFunction = self.methodTable.get("init")
+    self.initializerArity: int = None
     
   def __str__(self):
     return self.name
   
+  def defineMethod(self, name: str, method: LoxFunction) -> None:
+    self.methods[name] = method
+    self.methodTable[name] = method
+    if name == "init":
+      self.initializer = method
+      self.initializerArity = None
+  
   def findMethod(self, name: str) -> LoxFunction:
-    if name in self.methods:
-      return self.methods.get(name)
-    
-    if self.superclass != None:
-      return self.superclass.findMethod(name)
-    
-    return None
+    return self.methodTable.get(name)
   
   def call(self, interpreter: 'Interpreter', arguments: list[any]) -> any:
-    from LoxInstance import LoxInstance
+    from .LoxInstance import LoxInstance
     instance: LoxInstance = LoxInstance(self)
-    initializer: LoxFunction = self.findMethod("init")
-    if initializer != None:
-      initializer.bind(instance).call(interpreter, arguments)
+    if self.initializer != None:
+      self.initializer.invoke(interpreter, [instance, *arguments])
     
     return instance
     
   def arity(self) -> int:
-    initializer: LoxFunction = self.findMethod("init")
-    if initializer == None:
-      return 0
+    if self.initializerArity == None:
+      self.initializerArity = 0 if self.initializer == None else self.initializer.arity()
     
-    return initializer.arity()
+    return self.initializerArity
   
\ No newline at end of file
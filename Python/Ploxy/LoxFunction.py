@@ -2,43 +2,45 @@ from typing import TYPE_CHECKING
 from .LoxCallable import LoxCallable
 from .Stmt import Function
 from .Environment import Environment
-from .Return import Return
 
 if TYPE_CHECKING:
   from .LoxInstance import LoxInstance
   from .Interpreter import Interpreter
 
 class LoxFunction(LoxCallable):
-  def __init__(self, declaration: Function, closure: Environment, isInitializer: bool) -> None:
+  def __init__(self, declaration: Function, closure: Environment, isInitializer: bool, receiver: 'LoxInstance' = None) -> None:
     self.isInitializer = isInitializer
     self.closure: Environment = closure
     self.declaration: Function = declaration
+    self.receiver: 'LoxInstance' = receiver
     
   def bind(self, instance: 'LoxInstance') -> 'LoxFunction':
-    environment: Environment = Environment(self.closure)
-    environment.define("this", instance)
-    return LoxFunction(self.declaration, environment, self.isInitializer)
+    return LoxFunction(self.declaration, self.closure, self.isInitializer, instance)
     
   def arity(self) -> int:
     return len(self.declaration.params)
   
   def call(self, interpreter: 'Interpreter', arguments: list[any]) -> any:
+    if self.receiver is not None:
+      arguments = [self.receiver, *arguments]
+    
+    return self.invoke(interpreter, arguments)
+  
+  def invoke(self, interpreter: 'Interpreter', arguments: list[any]) -> any:
+    # Runs the body with arguments as its frame. For a method the receiver
+    # has to be arguments[0].
     environment: Environment = Environment(self.closure)
-    for i, param in enumerate(self.declaration.params):
-      environment.define(param.lexeme, arguments[i])
+    environment.values = arguments
       
-    try:
-      interpreter.executeBlock(self.declaration.body, environment)
-    except Return as returnValue:
-      if self.isInitializer: return self.closure.getAt(0, "this")
-      
-      return returnValue.value
+    completion: tuple = interpreter.executeBlock(self.declaration.body, environment)
     
     if self.isInitializer:
-      return self.closure.getAt(0, "this")
+      return arguments[0]
+    
+    if completion is not None:
+      return completion[0]
       
     return None
   
   def __str__(self) -> str:
-    return f"<fn {self.declaration.name.lexeme}>"
-  
\ No newline at end of file
+    return f"<fn {self.declaration.name.lexeme}>"
\ No newline at end of file
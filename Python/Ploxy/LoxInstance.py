@@ -1,16 +1,22 @@
 from .LoxClass import LoxClass
 from .Token import Token
 from .RuntimeError import RuntimeException
+from .Shape import Shape
 
 class LoxInstance:
+  __slots__ = ("Klass", "shape", "values")
+  
   def __init__(self, Klass: LoxClass) -> None:
     self.Klass: LoxClass = Klass
-    self.fields: dict[str, any] = {}
+    # Each class has its own root shape, so a shape also identifies the class.
+    self.shape: Shape = Klass.shape
+    self.values: list[any] = []
     
   def get(self, name: Token) -> any:
     from .LoxFunction import LoxFunction
-    if name.lexeme in self.fields:
-      return self.fields.get(name.lexeme)
+    index: int = self.shape.index.get(name.lexeme)
+    if index is not None:
+      return self.values[index]
     
     method: LoxFunction = self.Klass.findMethod(name.lexeme)
     if method != None: return method.bind(self)
@@ -18,8 +24,16 @@ class LoxInstance:
     raise RuntimeException(name, f"Undefined property '{name.lexeme}'.")
   
   def set(self, name: Token, value: any) -> None:
-    self.fields[name.lexeme] = value
+    self.setField(name.lexeme, value)
+    
+  def setField(self, name: str, value: any) -> None:
+    index: int = self.shape.index.get(name)
+    if index is None:
+      self.shape = self.shape.add(name)
+      self.values.append(value)
+    else:
+      self.values[index] = value
     
   def __str__(self):
     return self.Klass.name + " instance"
-  
\ No newline at end of file
+  
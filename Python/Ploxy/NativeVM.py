@@ -0,0 +1,26 @@
+import sys
+from .Token import Token
+from .TokenType import TokenType
+from .RuntimeError import RuntimeException
+
+try:
+  from . import _clox
+except ImportError:
+  _clox = None
+
+class NativeVM:
+  available: bool = _clox is not None
+  
+  def __init__(self) -> None:
+    self.vm = _clox.VM()
+    
+  def interpretSource(self, source: str) -> None:
+    from .Lox import Lox
+    status, message, line = self.vm.interpret(source)
+    
+    if status == _clox.INTERPRET_COMPILE_ERROR:
+      print(message, end="", file=sys.stderr)
+      Lox.hadError = True
+    elif status == _clox.INTERPRET_RUNTIME_ERROR:
+      token: Token = Token(TokenType.EOF, "", None, line)
+      Lox.runtimeError(RuntimeException(token, message))
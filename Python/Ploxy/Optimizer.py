@@ -0,0 +1,207 @@
+from .Expr import Expr, Variable, Assign, Binary, Grouping, Call, Literal, Logical, Unary, Get, Set, Super, This
+from .Stmt import Stmt, Block, Var, Function, Expression, If, Print, While, Return, Class
+from .TokenType import TokenType
+from .RuntimeError import RuntimeException
+from .Interpreter import Interpreter
+from .CountedLoop import CountedLoop
+import operator
+
+class Optimizer(Expr.Visitor[Expr], Stmt.Visitor[Stmt]):
+  # Rewrites a resolved program in place: folds operators applied to
+  # literals, drops groupings and prunes branches whose condition is a
+  # literal. It never removes a declaration, so resolver slots stay valid.
+  def __init__(self) -> None:
+    # Constant operators are evaluated by the tree-walk interpreter itself,
+    # so folding cannot drift from runtime semantics. An operation that
+    # would raise is left in place to fail at runtime on its own line.
+    self.evaluator: Interpreter = Interpreter()
+
+  def optimize(self, statments: list[Stmt]) -> list[Stmt]:
+    optimized: list[Stmt] = []
+    for statment in statments:
+      statment = self.__optimizeStmt(statment)
+      if statment is not None:
+        optimized.append(statment)
+    return optimized
+
+  def visitBlockStmt(self, stmt: Block) -> Stmt:
+    stmt.statements = self.optimize(stmt.statements)
+    if len(stmt.statements) == 2 and isinstance(stmt.statements[0], Var) and isinstance(stmt.statements[1], While):
+      stmt.statements[1].counted = Optimizer.__countedLoop(stmt.statements[0], stmt.statements[1])
+    return stmt
+
+  def visitClassStmt(self, stmt: Class) -> Stmt:
+    for method in stmt.methods:
+      self.visitFunctionStmt(method)
+    return stmt
+
+  def visitExpressionStmt(self, stmt: Expression) -> Stmt:
+    stmt.expression = self.__optimizeExpr(stmt.expression)
+    if isinstance(stmt.expression, Literal):
+      return None
+    return stmt
+
+  def visitFunctionStmt(self, stmt: Function) -> Stmt:
+    stmt.body = self.optimize(stmt.body)
+    return stmt
+
+  def visitIfStmt(self, stmt: If) -> Stmt:
+    stmt.condition = self.__optimizeExpr(stmt.condition)
+    if isinstance(stmt.condition, Literal):
+      branch: Stmt = stmt.thenBranch if Optimizer.__isTruthy(stmt.condition.value) else stmt.elseBranch
+      return None if branch is None else self.__optimizeStmt(branch)
+
+    stmt.thenBranch = self.__branch(stmt.thenBranch)
+    if stmt.elseBranch is not None:
+      stmt.elseBranch = self.__optimizeStmt(stmt.elseBranch)
+    return stmt
+
+  def visitPrintStmt(self, stmt: Print) -> Stmt:
+    stmt.expression = self.__optimizeExpr(stmt.expression)
+    return stmt
+
+  def visitReturnStmt(self, stmt: Return) -> Stmt:
+    if stmt.value is not None:
+      stmt.value = self.__optimizeExpr(stmt.value)
+    return stmt
+
+  def visitVarStmt(self, stmt: Var) -> Stmt:
+    if stmt.initializer is not None:
+      stmt.initializer = self.__optimizeExpr(stmt.initializer)
+    return stmt
+
+  def visitWhileStmt(self, stmt: While) -> Stmt:
+    stmt.condition = self.__optimizeExpr(stmt.condition)
+    if isinstance(stmt.condition, Literal) and not Optimizer.__isTruthy(stmt.condition.value):
+      return None
+
+    stmt.body = self.__branch(stmt.body)
+    return stmt
+
+  def visitAssignExpr(self, expr: Assign) -> Expr:
+    expr.value = self.__optimizeExpr(expr.value)
+    return expr
+
+  def visitBinaryExpr(self, expr: Binary) -> Expr:
+    expr.left = self.__optimizeExpr(expr.left)
+    expr.right = self.__optimizeExpr(expr.right)
+    if isinstance(expr.left, Literal) and isinstance(expr.right, Literal):
+      return self.__fold(expr)
+    return expr
+
+  def visitCallExpr(self, expr: Call) -> Expr:
+    expr.callee = self.__optimizeExpr(expr.callee)
+    expr.arguments = [self.__optimizeExpr(argument) for argument in expr.arguments]
+    return expr
+
+  def visitGetExpr(self, expr: Get) -> Expr:
+    expr.object = self.__optimizeExpr(expr.object)
+    return expr
+
+  def visitGroupingExpr(self, expr: Grouping) -> Expr:
+    return self.__optimizeExpr(expr.expression)
+
+  def visitLiteralExpr(self, expr: Literal) -> Expr:
+    return expr
+
+  def visitLogicalExpr(self, expr: Logical) -> Expr:
+    expr.left = self.__optimizeExpr(expr.left)
+    expr.right = self.__optimizeExpr(expr.right)
+    if isinstance(expr.left, Literal):
+      truthy: bool = Optimizer.__isTruthy(expr.left.value)
+      if truthy == (expr.operator.type == TokenType.OR):
+        return expr.left
+      return expr.right
+    return expr
+
+  def visitSetExpr(self, expr: Set) -> Expr:
+    expr.object = self.__optimizeExpr(expr.object)
+    expr.value = self.__optimizeExpr(expr.value)
+    return expr
+
+  def visitSuperExpr(self, expr: Super) -> Expr:
+    return expr
+
+  def visitThisExpr(self, expr: This) -> Expr:
+    return expr
+
+  def visitUnaryExpr(self, expr: Unary) -> Expr:
+    expr.right = self.__optimizeExpr(expr.right)
+    if isinstance(expr.right, Literal):
+      return self.__fold(expr)
+    return expr
+
+  def visitVariableExpr(self, expr: Variable) -> Expr:
+    return expr
+
+  def __fold(self, expr: Expr) -> Expr:
+    try:
+      return Literal(expr.accept(self.evaluator))
+    except RuntimeException:
+      return expr
+
+  @staticmethod
+  def __countedLoop(counter: Var, loop: While) -> CountedLoop:
+    # Matches the tree Parser builds for a for loop that declares its
+    # counter. The block around the body and the increment declares nothing
+    # and so has no scope: both sides see the counter at depth 0.
+    condition: Expr = loop.condition
+    if not isinstance(condition, Binary) or condition.operator.type not in Optimizer.comparisons:
+      return None
+    if not Optimizer.__isCounter(condition.left, counter):
+      return None
+    limit: Expr = condition.right
+    if not (isinstance(limit, Literal) and type(limit.value) is float or isinstance(limit, Variable)):
+      return None
+    
+    # A body that declares has to go through visitBlockStmt, which drops
+    # its locals again after every iteration.
+    if not isinstance(loop.body, Block) or len(loop.body.statements) != 2 or loop.body.declares:
+      return None
+    body, increment = loop.body.statements
+    if not isinstance(increment, Expression) or not isinstance(increment.expression, Assign):
+      return None
+    assign: Assign = increment.expression
+    if assign.name.lexeme != counter.name.lexeme or assign.depth != 0 or assign.slot != condition.left.slot:
+      return None
+    value: Expr = assign.value
+    if not isinstance(value, Binary) or value.operator.type not in (TokenType.PLUS, TokenType.MINUS):
+      return None
+    if not Optimizer.__isCounter(value.left, counter) or value.left.slot != assign.slot:
+      return None
+    if not isinstance(value.right, Literal) or type(value.right.value) is not float:
+      return None
+    
+    step: float = value.right.value if value.operator.type == TokenType.PLUS else -value.right.value
+    return CountedLoop(assign.slot, Optimizer.comparisons[condition.operator.type], limit, step, assign, body)
+  
+  @staticmethod
+  def __isCounter(expr: Expr, counter: Var) -> bool:
+    return isinstance(expr, Variable) and expr.name.lexeme == counter.name.lexeme and expr.depth == 0
+  
+  def __branch(self, stmt: Stmt) -> Stmt:
+    # Loop bodies and then-branches must stay statements even when all of
+    # their code was folded away.
+    stmt = self.__optimizeStmt(stmt)
+    return Block([]) if stmt is None else stmt
+
+  def __optimizeExpr(self, expr: Expr) -> Expr:
+    return expr.accept(self)
+
+  def __optimizeStmt(self, stmt: Stmt) -> Stmt:
+    return stmt.accept(self)
+
+  @staticmethod
+  def __isTruthy(value: any) -> bool:
+    if value is None:
+      return False
+    if isinstance(value, bool):
+      return value
+    return True
+  
+  comparisons: dict[TokenType, any] = {
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+  }
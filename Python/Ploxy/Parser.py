@@ -1,3 +1,4 @@
+from typing import Iterable, Iterator
 from .Token import Token
 from .Expr import Expr, Binary, Unary, Literal, Grouping, Variable, Assign, Logical, Call, Get, Set, This, Super
 from .TokenType import TokenType
@@ -7,17 +8,21 @@ class Parser:
   class ParseError(Exception):
     pass
   
-  def __init__(self, tokens: list[Token]):
-    self.tokens: list[Token] = tokens
-    self.current: int = 0
+  def __init__(self, tokens: Iterable[Token]):
+    # Tokens are pulled on demand, so the parser only holds the current
+    # token and the one before it. The current token is fetched the first
+    # time it is peeked at, so a finished declaration never waits on input
+    # that follows it.
+    self.tokens: Iterator[Token] = iter(tokens)
+    self.current: Token = None
+    self.previous: Token = None
         
   def parse(self) -> list[Stmt]:
-    statments: list[Stmt] = []
-
+    return list(self.declarations())
+  
+  def declarations(self) -> Iterator[Stmt]:
     while not self.__isAtEnd():
-      statments.append(self.__decleration())
-    
-    return statments
+      yield self.__decleration()
   
   def __expression(self) -> Expr:
     return self.__assignment()
@@ -334,7 +339,7 @@ class Parser:
 
   
   def __error(self, token:Token, message:str) -> "Parser.ParseError":
-    from Lox import Lox
+    from .Lox import Lox
     Lox.errort(token, message)
     return Parser.ParseError()
   
@@ -357,15 +362,18 @@ class Parser:
   
   def __advance(self) -> Token:
     if not self.__isAtEnd():
-      self.current += 1
+      self.previous = self.current
+      self.current = None
     
-    return self.__previous()
+    return self.previous
   
   def __peek(self) -> Token:
-    return self.tokens[self.current]
+    if self.current is None:
+      self.current = next(self.tokens)
+    return self.current
   
   def __previous(self) -> Token:
-    return self.tokens[self.current - 1]
+    return self.previous
   
   def __synchronize(self) -> None:
     self.__advance()
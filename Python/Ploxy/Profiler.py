@@ -0,0 +1,216 @@
+import sys
+import time
+from typing import TextIO
+from .Expr import Expr, Assign, Binary, Call, Get, Grouping, Logical, Set, Super, This, Unary, Variable
+from .Stmt import Stmt, Block, Class, Expression, Function, If, Print, Return, Var, While
+
+class ProfileEntry:
+  __slots__ = ("name", "calls", "inclusive", "exclusive", "active", "start")
+
+  def __init__(self, name: str) -> None:
+    self.name: str = name
+    self.calls: int = 0
+    self.inclusive: float = 0.0
+    self.exclusive: float = 0.0
+    # Recursive activations are only timed once, from the outermost one.
+    self.active: int = 0
+    self.start: float = 0.0
+
+class Profiler:
+  # A deterministic profiler for the tree-walk interpreter. It wraps every
+  # statement and function body of a resolved program in nodes that report
+  # to it, so a run without --profile executes the tree unchanged. Time
+  # between two events is charged to the function and line on top of the
+  # stacks; inclusive time runs from the outermost entry to its exit.
+  SCRIPT: str = "<script>"
+  REPORT_LINES: int = 20
+
+  def __init__(self) -> None:
+    self.clock = time.perf_counter
+    self.functions: dict[str, ProfileEntry] = {}
+    self.lines: dict[int, ProfileEntry] = {}
+    self.stacks: dict[str, float] = {}
+    self.functionStack: list[ProfileEntry] = []
+    self.lineStack: list[ProfileEntry] = []
+    self.paths: list[str] = []
+    self.last: float = 0.0
+    self.total: float = 0.0
+
+  def instrument(self, statments: list[Stmt]) -> list[Stmt]:
+    return [self.__wrap(statment, 0) for statment in statments]
+
+  def start(self) -> None:
+    self.last = self.clock()
+    self.total = -self.last
+    self.enterFunction(self.__function(Profiler.SCRIPT))
+
+  def stop(self) -> None:
+    while self.lineStack:
+      self.exitLine(self.lineStack[-1])
+    while self.functionStack:
+      self.exitFunction(self.functionStack[-1])
+    self.total += self.last
+
+  def enterFunction(self, entry: ProfileEntry) -> None:
+    now: float = self.__charge()
+    entry.calls += 1
+    if entry.active == 0:
+      entry.start = now
+    entry.active += 1
+    self.functionStack.append(entry)
+    self.paths.append(f"{self.paths[-1]};{entry.name}" if self.paths else entry.name)
+
+  def exitFunction(self, entry: ProfileEntry) -> None:
+    now: float = self.__charge()
+    entry.active -= 1
+    if entry.active == 0:
+      entry.inclusive += now - entry.start
+    self.functionStack.pop()
+    self.paths.pop()
+
+  def enterLine(self, entry: ProfileEntry) -> None:
+    now: float = self.__charge()
+    entry.calls += 1
+    if entry.active == 0:
+      entry.start = now
+    entry.active += 1
+    self.lineStack.append(entry)
+
+  def exitLine(self, entry: ProfileEntry) -> None:
+    now: float = self.__charge()
+    entry.active -= 1
+    if entry.active == 0:
+      entry.inclusive += now - entry.start
+    self.lineStack.pop()
+
+  def report(self, file: TextIO = sys.stderr) -> None:
+    print(f"\nProfile: {self.total * 1000:.3f} ms total", file=file)
+
+    print("\nFunctions by exclusive time", file=file)
+    print(f"{'calls':>10} {'inclusive ms':>13} {'exclusive ms':>13}  function", file=file)
+    for entry in sorted(self.functions.values(), key=lambda entry: entry.exclusive, reverse=True):
+      print(f"{entry.calls:>10} {entry.inclusive * 1000:>13.3f} {entry.exclusive * 1000:>13.3f}  {entry.name}", file=file)
+
+    print("\nLines by exclusive time", file=file)
+    print(f"{'hits':>10} {'inclusive ms':>13} {'exclusive ms':>13}  line", file=file)
+    lines: list[ProfileEntry] = sorted(self.lines.values(), key=lambda entry: entry.exclusive, reverse=True)
+    for entry in lines[:Profiler.REPORT_LINES]:
+      print(f"{entry.calls:>10} {entry.inclusive * 1000:>13.3f} {entry.exclusive * 1000:>13.3f}  {entry.name}", file=file)
+
+  def writeCollapsed(self, path: str) -> None:
+    # One "caller;callee count" line per call stack, with exclusive time in
+    # microseconds, as read by flamegraph.pl and speedscope.
+    with open(path, "w", encoding="utf-8") as file:
+      for stack, elapsed in sorted(self.stacks.items()):
+        microseconds: int = round(elapsed * 1_000_000)
+        if microseconds > 0:
+          file.write(f"{stack} {microseconds}\n")
+
+  def __charge(self) -> float:
+    now: float = self.clock()
+    elapsed: float = now - self.last
+    self.last = now
+    if self.functionStack:
+      self.functionStack[-1].exclusive += elapsed
+      path: str = self.paths[-1]
+      self.stacks[path] = self.stacks.get(path, 0.0) + elapsed
+    if self.lineStack:
+      self.lineStack[-1].exclusive += elapsed
+    return now
+
+  def __function(self, name: str) -> ProfileEntry:
+    entry: ProfileEntry = self.functions.get(name)
+    if entry is None:
+      entry = ProfileEntry(name)
+      self.functions[name] = entry
+    return entry
+
+  def __line(self, line: int) -> ProfileEntry:
+    entry: ProfileEntry = self.lines.get(line)
+    if entry is None:
+      entry = ProfileEntry(str(line))
+      self.lines[line] = entry
+    return entry
+
+  def __wrap(self, stmt: Stmt, line: int) -> Stmt:
+    if isinstance(stmt, Block):
+      stmt.statements = [self.__wrap(statment, line) for statment in stmt.statements]
+      return stmt
+
+    line = Profiler.lineOf(stmt) or line
+    if isinstance(stmt, Function):
+      self.__wrapBody(stmt, stmt.name.lexeme)
+    elif isinstance(stmt, Class):
+      for method in stmt.methods:
+        self.__wrapBody(method, f"{stmt.name.lexeme}.{method.name.lexeme}")
+    elif isinstance(stmt, If):
+      stmt.thenBranch = self.__wrap(stmt.thenBranch, line)
+      if stmt.elseBranch is not None:
+        stmt.elseBranch = self.__wrap(stmt.elseBranch, line)
+    elif isinstance(stmt, While):
+      stmt.body = self.__wrap(stmt.body, line)
+      if stmt.counted is not None:
+        stmt.counted.body = stmt.body.statements[0]
+    return ProfiledStatement(stmt, self.__line(line), self)
+
+  def __wrapBody(self, function: Function, name: str) -> None:
+    line: int = function.name.line
+    body: list[Stmt] = [self.__wrap(statment, line) for statment in function.body]
+    function.body = [ProfiledBody(body, self.__function(f"{name}:{line}"), self)]
+
+  @staticmethod
+  def lineOf(node: Stmt | Expr) -> int:
+    if isinstance(node, (Var, Function, Class)):
+      return node.name.line
+    if isinstance(node, Return):
+      return node.keyword.line
+    if isinstance(node, (Expression, Print)):
+      return Profiler.lineOf(node.expression)
+    if isinstance(node, (If, While)):
+      return Profiler.lineOf(node.condition)
+    if isinstance(node, (Assign, Get, Set, Variable)):
+      return node.name.line
+    if isinstance(node, (Binary, Logical, Unary)):
+      return node.operator.line
+    if isinstance(node, Call):
+      return node.paren.line
+    if isinstance(node, (Super, This)):
+      return node.keyword.line
+    if isinstance(node, Grouping):
+      return Profiler.lineOf(node.expression)
+    return None
+
+class ProfiledStatement(Stmt):
+  __slots__ = ("statement", "entry", "profiler")
+
+  def __init__(self, statement: Stmt, entry: ProfileEntry, profiler: Profiler) -> None:
+    self.statement = statement
+    self.entry = entry
+    self.profiler = profiler
+
+  def accept(self, visitor) -> any:
+    self.profiler.enterLine(self.entry)
+    try:
+      return self.statement.accept(visitor)
+    finally:
+      self.profiler.exitLine(self.entry)
+
+class ProfiledBody(Stmt):
+  # Replaces a function's body, so entering it marks a call.
+  __slots__ = ("statements", "entry", "profiler")
+
+  def __init__(self, statements: list[Stmt], entry: ProfileEntry, profiler: Profiler) -> None:
+    self.statements = statements
+    self.entry = entry
+    self.profiler = profiler
+
+  def accept(self, visitor) -> any:
+    self.profiler.enterFunction(self.entry)
+    try:
+      for statment in self.statements:
+        completion: tuple = statment.accept(visitor)
+        if completion is not None:
+          return completion
+      return None
+    finally:
+      self.profiler.exitFunction(self.entry)
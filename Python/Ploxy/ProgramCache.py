@@ -0,0 +1,81 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from . import __version__
+from .Stmt import Stmt
+
+class ProgramCache:
+  MAGIC: bytes = b"LOXC"
+  DIRECTORY: str = "__loxcache__"
+  frontEnd: bytes = None
+  
+  @staticmethod
+  def load(path: str, source: str) -> list[Stmt]:
+    try:
+      with open(ProgramCache.__cachePath(path), "rb") as file:
+        data: bytes = file.read()
+    except OSError:
+      return None
+    
+    header: bytes = ProgramCache.__header(source)
+    if not data.startswith(header):
+      return None
+    
+    try:
+      return pickle.loads(data[len(header):])
+    except Exception:
+      return None
+  
+  @staticmethod
+  def store(path: str, source: str, statments: list[Stmt]) -> None:
+    cachePath: str = ProgramCache.__cachePath(path)
+    try:
+      payload: bytes = pickle.dumps(statments, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError):
+      return
+    
+    try:
+      directory: str = os.path.dirname(cachePath)
+      os.makedirs(directory, exist_ok=True)
+      # Write to a temporary file beside the target and rename it into place,
+      # so concurrent runs never observe a partially written artifact.
+      fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+      try:
+        with os.fdopen(fd, "wb") as file:
+          file.write(ProgramCache.__header(source))
+          file.write(payload)
+        os.replace(temporary, cachePath)
+      except BaseException:
+        os.unlink(temporary)
+        raise
+    except OSError:
+      pass
+  
+  @staticmethod
+  def __cachePath(path: str) -> str:
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, ProgramCache.DIRECTORY, name + "c")
+  
+  @staticmethod
+  def __header(source: str) -> bytes:
+    key = hashlib.sha256()
+    key.update(f"ploxy-{__version__}-py{sys.version_info[0]}.{sys.version_info[1]}\0".encode())
+    key.update(ProgramCache.__frontEndDigest())
+    key.update(source.encode("utf-8", "surrogatepass"))
+    return ProgramCache.MAGIC + key.digest()
+  
+  @staticmethod
+  def __frontEndDigest() -> bytes:
+    # The modules that decide what a resolved program looks like, from token
+    # contents and lines to tree shape and slots. Hashing them invalidates
+    # old artifacts when any of these changes, even without a version bump.
+    if ProgramCache.frontEnd is None:
+      digest = hashlib.sha256()
+      directory: str = os.path.dirname(__file__)
+      for name in ("Token.py", "TokenType.py", "Scanner.py", "Parser.py", "Expr.py", "Stmt.py", "Resolver.py"):
+        with open(os.path.join(directory, name), "rb") as file:
+          digest.update(file.read())
+      ProgramCache.frontEnd = digest.digest()
+    return ProgramCache.frontEnd
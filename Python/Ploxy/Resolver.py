@@ -1,6 +1,5 @@
 from .Expr import Expr, Variable, Assign, Binary, Grouping, Call, Literal, Logical, Unary, Get, Set, Super, This
 from .Stmt import Stmt, Block, Var, Function, Expression, If, Print, While, Return, Class
-from .Interpreter import Interpreter
 from collections import deque
 from .Token import Token
 from enum import Enum
@@ -17,9 +16,16 @@ class ClassType(Enum):
   SUBCLASS = "SUBCLASS"
 
 class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
-  def __init__(self, interpreter: Interpreter):
-    self.interpreter: Interpreter = interpreter
+  def __init__(self):
+    # Resolution results are stored on the nodes themselves: each variable
+    # reference gets the depth and slot of the local it names, or keeps a
+    # depth of None for a global.
     self.scopes: deque = deque()
+    # Parallel to scopes: whether each scope gets an environment of its own
+    # at runtime, and the slot its first local takes. A block whose locals
+    # nothing can capture keeps them in the environment around it instead.
+    self.frames: deque = deque()
+    self.bases: deque = deque()
     self.currentFunction: FunctionType = FunctionType.NONE
     self.currentClass: ClassType = ClassType.NONE
     
@@ -28,13 +34,21 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
       self.__resolveStmt(statment)
       
   def visitBlockStmt(self, stmt: Block) -> None:
-    self.beginScope()
+    stmt.declares = any(isinstance(statment, (Var, Function, Class)) for statment in stmt.statements)
+    if stmt.escapes is None:
+      stmt.escapes = Resolver.__captures(stmt.statements)
+    if not stmt.declares:
+      self.resolve(stmt.statements)
+      return None
+    
+    # Globals have no slots, so a top-level block always needs its own.
+    self.beginScope(stmt.escapes or not self.scopes)
     self.resolve(stmt.statements)
     self.endScope()
     return None
   
   def visitClassStmt(self, stmt: Class) -> None:
-    from Lox import Lox
+    from .Lox import Lox
     enclosingClass: ClassType = self.currentClass
     self.currentClass = ClassType.CLASS
     
@@ -50,19 +64,18 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
       
     if stmt.superclass != None:
       self.beginScope()
-      self.scopes[-1]["super"] = True
+      self.scopes[-1]["super"] = (True, 0)
       
-    self.beginScope()
-    self.scopes[-1]["this"] = True
-    
     for method in stmt.methods:
       declaration: FunctionType = FunctionType.METHOD
       if method.name.lexeme == "init":
         declaration = FunctionType.INITIALIZER
         
       self.__resolveFunction(method, declaration)
+    
+    if stmt.superclass != None:
+      self.endScope()
       
-    self.endScope()
     self.currentClass = enclosingClass
     return None
   
@@ -88,7 +101,7 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
     return None
   
   def visitReturnStmt(self, stmt: Return) -> None:
-    from Lox import Lox
+    from .Lox import Lox
     if self.currentFunction == FunctionType.NONE:
       Lox.errort(stmt.keyword, "Can't return from top-level code.")
       
@@ -157,7 +170,7 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
     return None
   
   def visitSuperExpr(self, expr: Super) -> None:
-    from Lox import Lox
+    from .Lox import Lox
     if self.currentClass == ClassType.NONE:
       Lox.errort(expr.keyword, "Can't use 'super' outside of a class.")
     elif self.currentClass != ClassType.SUBCLASS:
@@ -167,19 +180,17 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
     return None
   
   def visitVariableExpr(self, expr: Variable) -> None:
-    from Lox import Lox
-    if self.scopes and self.scopes[-1].get(expr.name.lexeme) is False:
-      isDeclared, _ = self.scopes[-1][expr.name.lexeme]
-      if not isDeclared:
+    from .Lox import Lox
+    if self.scopes and expr.name.lexeme in self.scopes[-1]:
+      isDefined, _ = self.scopes[-1][expr.name.lexeme]
+      if not isDefined:
         Lox.errort(expr.name, "Can't read local variable in its own initializer.")
-        
-      self.scopes[-1][expr.name.lexeme] = (isDeclared, True)
       
     self.__resolveLocal(expr, expr.name)
     return None
   
   def visitThisExpr(self, expr: This) -> None:
-    from Lox import Lox
+    from .Lox import Lox
     if self.currentClass == ClassType.NONE:
       Lox.errort(expr.keyword, "Can't use 'this' outside of a class.")
       return None
@@ -194,30 +205,42 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
     expr.accept(self)
     
   def __declare(self, name: Token) -> None:
-    from Lox import Lox
+    from .Lox import Lox
     if not self.scopes:
       return
-    scope: dict[str, bool] = self.scopes[-1]
+    scope: dict[str, tuple[bool, int]] = self.scopes[-1]
     if name.lexeme in scope:
       Lox.errort(name, "Already variable with this name in this scope.")
+      return
       
-    scope[name.lexeme] = (False, False)
+    scope[name.lexeme] = (False, self.bases[-1] + len(scope))
     
   def __define(self, name: Token) -> None:
     if not self.scopes:
       return
-    self.scopes[-1][name.lexeme] = (True, False)
+    scope: dict[str, tuple[bool, int]] = self.scopes[-1]
+    _, slot = scope[name.lexeme]
+    scope[name.lexeme] = (True, slot)
     
   def __resolveLocal(self, expr: Expr, name: Token) -> None:
+    depth: int = 0
     for i in range(len(self.scopes) - 1, -1, -1):
       if name.lexeme in self.scopes[i]:
-        self.interpreter.resolve(expr, len(self.scopes) - 1 - i)
+        _, slot = self.scopes[i][name.lexeme]
+        expr.depth = depth
+        expr.slot = slot
         return
+      if self.frames[i]:
+        depth += 1
       
   def __resolveFunction(self, function: Function, type: FunctionType) -> None:
     enclosingFunction: FunctionType = self.currentFunction
     self.currentFunction = type
     self.beginScope()
+    # A method's receiver occupies slot 0 of its own call frame, ahead of the
+    # parameters, so calling a method needs no separate environment for it.
+    if type == FunctionType.METHOD or type == FunctionType.INITIALIZER:
+      self.scopes[-1]["this"] = (True, 0)
     for param in function.params:
       self.__declare(param)
       self.__define(param)
@@ -226,9 +249,32 @@ class Resolver(Expr.Visitor[None], Stmt.Visitor[None]):
     self.endScope()
     self.currentFunction = enclosingFunction
     
-  def beginScope(self) -> None:
+  @staticmethod
+  def __captures(statments: list[Stmt]) -> bool:
+    # Functions and classes are the only things that capture an environment.
+    # Nested blocks are annotated on the way so each is scanned only once.
+    captures: bool = False
+    for statment in statments:
+      if isinstance(statment, (Function, Class)):
+        captures = True
+      elif isinstance(statment, Block):
+        if statment.escapes is None:
+          statment.escapes = Resolver.__captures(statment.statements)
+        captures = captures or statment.escapes
+      elif isinstance(statment, If):
+        branches: list[Stmt] = [statment.thenBranch] if statment.elseBranch == None else [statment.thenBranch, statment.elseBranch]
+        captures = Resolver.__captures(branches) or captures
+      elif isinstance(statment, While):
+        captures = Resolver.__captures([statment.body]) or captures
+    return captures
+    
+  def beginScope(self, frame: bool = True) -> None:
+    self.bases.append(0 if frame else self.bases[-1] + len(self.scopes[-1]))
+    self.frames.append(frame)
     self.scopes.append({})
     
   def endScope(self) -> None:
     self.scopes.pop()
+    self.frames.pop()
+    self.bases.pop()
     
\ No newline at end of file
@@ -1,5 +0,0 @@
-class Return(Exception):
-  def __init__(self, value):
-    super().__init__()
-    self.value: any = value
-    
\ No newline at end of file
@@ -0,0 +1,32 @@
+from .Token import Token
+from .RuntimeError import RuntimeException
+
+# Lox value semantics shared by every engine, so that their output and
+# error messages cannot drift apart.
+
+def isEqual(a: any, b: any) -> bool:
+  if a == None and b == None:
+    return True
+
+  if a == None:
+    return False
+
+  return a == b
+
+def checkNumberOperands(operator: Token, left: any, right: any) -> None:
+  if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+    return
+  raise RuntimeException(operator, "Operands must be numbers.")
+
+def stringify(obj: any) -> str:
+  if obj == None:
+    return "nil"
+
+  if isinstance(obj, (int, float)):
+    text: str = str(obj)
+    if text.endswith(".0"):
+      text = text[:-2]
+
+    return text
+
+  return str(obj)
@@ -0,0 +1,148 @@
+import signal
+import sys
+import threading
+import time
+from types import FrameType
+from typing import TextIO
+from .Stmt import Stmt, Block, Class, Function, If, While
+from .Interpreter import Interpreter
+from .LoxFunction import LoxFunction
+from .Profiler import Profiler
+
+class Sampler:
+  # A sampling profiler for the tree-walk interpreter. Every Lox call runs
+  # in its own LoxFunction.invoke frame and every statement in a visit
+  # method frame of the interpreter, so the Python stack already is the Lox
+  # call stack. It is walked once per tick and nothing is recorded between
+  # ticks: the program runs unchanged, apart from the walks themselves.
+  INTERVAL: float = 0.005
+  REPORT_LINES: int = 20
+
+  INVOKE = LoxFunction.invoke.__code__
+  STATEMENTS = {
+    getattr(Interpreter, name).__code__
+    for name in dir(Interpreter) if name.startswith("visit") and name.endswith("Stmt")
+  }
+
+  def __init__(self, interval: float = INTERVAL) -> None:
+    self.interval: float = interval
+    self.names: dict[Function, str] = {}
+    self.samples: int = 0
+    # Sample counts as [exclusive, inclusive] pairs.
+    self.functions: dict[str, list[int]] = {}
+    self.lines: dict[int, list[int]] = {}
+    self.stacks: dict[str, int] = {}
+    self.thread: threading.Thread = None
+    self.running: bool = False
+
+  def instrument(self, statments: list[Stmt]) -> list[Stmt]:
+    # The tree is left as it is; methods are only named after their class.
+    for statment in statments:
+      self.__name(statment)
+    return statments
+
+  def start(self) -> None:
+    self.running = True
+    if hasattr(signal, "setitimer"):
+      signal.signal(signal.SIGPROF, self.__handle)
+      signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+    else:
+      self.thread = threading.Thread(target=self.__poll, args=(threading.main_thread().ident,), daemon=True)
+      self.thread.start()
+
+  def stop(self) -> None:
+    self.running = False
+    if self.thread is None:
+      signal.setitimer(signal.ITIMER_PROF, 0)
+      signal.signal(signal.SIGPROF, signal.SIG_DFL)
+    else:
+      self.thread.join()
+
+  def report(self, file: TextIO = sys.stderr) -> None:
+    total: int = max(self.samples, 1)
+    print(f"\nProfile: {self.samples} samples every {self.interval * 1000:g} ms", file=file)
+
+    print("\nFunctions by exclusive samples", file=file)
+    print(f"{'exclusive':>10} {'%':>6} {'inclusive':>10} {'%':>6}  function", file=file)
+    for name, (exclusive, inclusive) in sorted(self.functions.items(), key=lambda item: item[1], reverse=True):
+      print(f"{exclusive:>10} {exclusive * 100 / total:>6.1f} {inclusive:>10} {inclusive * 100 / total:>6.1f}  {name}", file=file)
+
+    print("\nLines by exclusive samples", file=file)
+    print(f"{'exclusive':>10} {'%':>6} {'inclusive':>10} {'%':>6}  line", file=file)
+    lines: list[tuple[int, list[int]]] = sorted(self.lines.items(), key=lambda item: item[1], reverse=True)
+    for line, (exclusive, inclusive) in lines[:Sampler.REPORT_LINES]:
+      print(f"{exclusive:>10} {exclusive * 100 / total:>6.1f} {inclusive:>10} {inclusive * 100 / total:>6.1f}  {line}", file=file)
+
+  def writeCollapsed(self, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+      for stack, samples in sorted(self.stacks.items()):
+        file.write(f"{stack} {samples}\n")
+
+  def __handle(self, signum: int, frame: FrameType) -> None:
+    self.__sample(frame)
+
+  def __poll(self, ident: int) -> None:
+    while self.running:
+      time.sleep(self.interval)
+      frame: FrameType = sys._current_frames().get(ident)
+      if frame is not None:
+        self.__sample(frame)
+
+  def __sample(self, frame: FrameType) -> None:
+    # Walks outwards from the innermost frame. The first statement seen
+    # after entering a function is the line it is running.
+    functions: list[str] = []
+    lines: list[int] = []
+    line: int = None
+    while frame is not None:
+      code = frame.f_code
+      if code is Sampler.INVOKE:
+        functions.append(self.__nameOf(frame.f_locals["self"].declaration))
+        lines.append(line)
+        line = None
+      elif line is None and code in Sampler.STATEMENTS:
+        line = Profiler.lineOf(frame.f_locals["stmt"])
+      frame = frame.f_back
+    functions.append(Profiler.SCRIPT)
+    lines.append(line)
+
+    self.samples += 1
+    self.__count(self.functions, functions)
+    self.__count(self.lines, [line for line in lines if line is not None])
+    stack: str = ";".join(reversed(functions))
+    self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+  @staticmethod
+  def __count(counts: dict, keys: list) -> None:
+    if not keys:
+      return
+    for key in set(keys):
+      if key not in counts:
+        counts[key] = [0, 0]
+      counts[key][1] += 1
+    counts[keys[0]][0] += 1
+
+  def __nameOf(self, declaration: Function) -> str:
+    name: str = self.names.get(declaration)
+    if name is None:
+      name = f"{declaration.name.lexeme}:{declaration.name.line}"
+      self.names[declaration] = name
+    return name
+
+  def __name(self, stmt: Stmt) -> None:
+    if isinstance(stmt, Block):
+      for statment in stmt.statements:
+        self.__name(statment)
+    elif isinstance(stmt, Function):
+      for statment in stmt.body:
+        self.__name(statment)
+    elif isinstance(stmt, Class):
+      for method in stmt.methods:
+        self.names[method] = f"{stmt.name.lexeme}.{method.name.lexeme}:{method.name.line}"
+        self.__name(method)
+    elif isinstance(stmt, If):
+      self.__name(stmt.thenBranch)
+      if stmt.elseBranch is not None:
+        self.__name(stmt.elseBranch)
+    elif isinstance(stmt, While):
+      self.__name(stmt.body)
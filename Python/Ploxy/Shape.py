@@ -0,0 +1,16 @@
+class Shape:
+  # A hidden class: the layout shared by every instance that gained the same
+  # fields in the same order. Instances keep their field values in a list
+  # indexed through the shape, and adding a field moves to a cached child.
+  __slots__ = ("index", "transitions")
+  
+  def __init__(self, index: dict[str, int] = None) -> None:
+    self.index: dict[str, int] = {} if index is None else index
+    self.transitions: dict[str, Shape] = {}
+    
+  def add(self, name: str) -> 'Shape':
+    shape: Shape = self.transitions.get(name)
+    if shape is None:
+      shape = Shape({**self.index, name: len(self.index)})
+      self.transitions[name] = shape
+    return shape
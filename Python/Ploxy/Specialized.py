@@ -0,0 +1,43 @@
+from .Expr import Variable, Get, Call, Binary
+
+# Specialized forms of hot nodes. Once a node has run often enough with
+# stable operands, the interpreter switches its class to one of these, so
+# that its next evaluation goes straight to a fast routine. Each routine
+# checks a guard and switches the node back to its generic class when the
+# guard fails. None adds fields, so a node can change class in place.
+
+class LocalVariable(Variable):
+  __slots__ = ()
+
+  def accept(self, visitor):
+    return visitor.visitLocalVariableExpr(self)
+
+class GlobalVariable(Variable):
+  __slots__ = ()
+
+  def accept(self, visitor):
+    return visitor.visitGlobalVariableExpr(self)
+
+class FieldGet(Get):
+  __slots__ = ()
+
+  def accept(self, visitor):
+    return visitor.visitFieldGetExpr(self)
+
+class FunctionCall(Call):
+  __slots__ = ()
+
+  def accept(self, visitor):
+    return visitor.visitFunctionCallExpr(self)
+
+class MethodCall(Call):
+  __slots__ = ()
+
+  def accept(self, visitor):
+    return visitor.visitMethodCallExpr(self)
+
+class TypedBinary(Binary):
+  __slots__ = ()
+
+  def accept(self, visitor):
+    return visitor.visitTypedBinaryExpr(self)
@@ -1,13 +1,18 @@
 # This file is auto-generated by __defineAst.
 
-from typing import Protocol, TypeVar
+from typing import TYPE_CHECKING, Protocol, TypeVar
 from abc import ABC, abstractmethod
 from .Token import Token
 from .Expr import Expr, Variable
 
+if TYPE_CHECKING:
+    from .CountedLoop import CountedLoop
+
 R = TypeVar('R')
 
 class Stmt(ABC):
+    __slots__ = ()
+
     class Visitor(Protocol[R]):
        @abstractmethod
        def visitBlockStmt(self, stmt: 'Block'):
@@ -42,13 +47,19 @@ class Stmt(ABC):
         raise NotImplementedError()
 
 class Block(Stmt):
+    __slots__ = ("statements", "declares", "escapes")
+
     def __init__(self, statements: list[Stmt]) -> None:
         self.statements = statements
+        self.declares: bool = None
+        self.escapes: bool = None
 
     def accept(self, visitor) -> R:
         return visitor.visitBlockStmt(self)
 
 class Class(Stmt):
+    __slots__ = ("name", "superclass", "methods")
+
     def __init__(self, name: Token, superclass: Variable, methods: list['Function']) -> None:
         self.name = name
         self.superclass = superclass
@@ -58,6 +69,8 @@ class Class(Stmt):
         return visitor.visitClassStmt(self)
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -65,6 +78,8 @@ class Expression(Stmt):
         return visitor.visitExpressionStmt(self)
 
 class Function(Stmt):
+    __slots__ = ("name", "params", "body")
+
     def __init__(self, name: Token, params: list[Token], body: list[Stmt]) -> None:
         self.name = name
         self.params = params
@@ -74,6 +89,8 @@ class Function(Stmt):
         return visitor.visitFunctionStmt(self)
 
 class If(Stmt):
+    __slots__ = ("condition", "thenBranch", "elseBranch")
+
     def __init__(self, condition: Expr, thenBranch: Stmt, elseBranch: Stmt) -> None:
         self.condition = condition
         self.thenBranch = thenBranch
@@ -83,6 +100,8 @@ class If(Stmt):
         return visitor.visitIfStmt(self)
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -90,6 +109,8 @@ class Print(Stmt):
         return visitor.visitPrintStmt(self)
 
 class Return(Stmt):
+    __slots__ = ("keyword", "value")
+
     def __init__(self, keyword: Token, value: Expr) -> None:
         self.keyword = keyword
         self.value = value
@@ -98,6 +119,8 @@ class Return(Stmt):
         return visitor.visitReturnStmt(self)
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer")
+
     def __init__(self, name: Token, initializer: Expr) -> None:
         self.name = name
         self.initializer = initializer
@@ -106,9 +129,12 @@ class Var(Stmt):
         return visitor.visitVarStmt(self)
 
 class While(Stmt):
+    __slots__ = ("condition", "body", "counted")
+
     def __init__(self, condition: Expr, body: Stmt) -> None:
         self.condition = condition
         self.body = body
+        self.counted: CountedLoop = None
 
     def accept(self, visitor) -> R:
         return visitor.visitWhileStmt(self)
@@ -2,6 +2,8 @@ from typing import Any
 from .TokenType import TokenType
 
 class Token:
+  __slots__ = ("type", "lexeme", "literal", "line")
+  
   def __init__(self, type: TokenType, lexeme: str, literal: Any, line: int) -> None:
     self.type = type
     self.lexeme = lexeme
@@ -9,4 +11,4 @@ class Token:
     self.line = line
     
   def __str__(self) -> str:
-    return f"{self.type} {self.lexeme} {self.literal}"
\ No newline at end of file
+    return f"{self.type} {self.lexeme} {self.literal}"
@@ -0,0 +1,663 @@
+import ast
+from functools import partial
+from .Expr import Expr, Literal, Grouping, Unary, Binary, Variable, Assign, Logical, Call, Get, Set, Super, This
+from .TokenType import TokenType
+from .Token import Token
+from .RuntimeError import RuntimeException
+from .Stmt import Stmt, Expression, Print, Var, Block, If, While, Function, Return, Class
+from .LoxCallable import LoxCallable
+from .LoxClass import LoxClass
+from .LoxInstance import LoxInstance
+from .Interpreter import ClockFunction
+from .Runtime import checkNumberOperands, stringify
+
+class Transpiler(Expr.Visitor[ast.expr], Stmt.Visitor[list[ast.stmt]]):
+  FILENAME: str = "<lox>"
+  NO_RETURN: object = object()
+
+  class Context:
+    def __init__(self, enclosing: 'Transpiler.Context', isInitializer: bool = False) -> None:
+      self.enclosing: Transpiler.Context = enclosing
+      self.isInitializer: bool = isInitializer
+      self.globals: set[str] = set()
+      self.nonlocals: set[str] = set()
+      self.loopDepth: int = 0
+      self.hasReturn: bool = False
+
+  class Scope:
+    def __init__(self, context: 'Transpiler.Context') -> None:
+      self.context: Transpiler.Context = context
+      self.names: list[str] = []
+
+  def __init__(self) -> None:
+    self.tokens: list[Token] = []
+    self.namespace: dict[str, any] = {
+      "_tokens": self.tokens,
+      "_noReturn": Transpiler.NO_RETURN,
+      "_Function": TranspiledFunction,
+      "_Class": LoxClass,
+      "_Instance": LoxInstance,
+      "_call": self.__callable,
+      "_print": Transpiler.__print,
+      "_add": Transpiler.__add,
+      "_subtract": Transpiler.__subtract,
+      "_multiply": Transpiler.__multiply,
+      "_divide": Transpiler.__divide,
+      "_greater": Transpiler.__greater,
+      "_greaterEqual": Transpiler.__greaterEqual,
+      "_less": Transpiler.__less,
+      "_lessEqual": Transpiler.__lessEqual,
+      "_negate": Transpiler.__negate,
+      "_get": Transpiler.__get,
+      "_checkFields": Transpiler.__checkFields,
+      "_checkGlobal": self.__checkGlobal,
+      "_checkSuperclass": Transpiler.__checkSuperclass,
+      "_super": Transpiler.__super,
+      "g_clock": ClockFunction(),
+    }
+    self.scopes: list[Transpiler.Scope] = []
+    self.context: Transpiler.Context = None
+    self.counter: int = 0
+
+  def interpret(self, statments: list[Stmt]) -> None:
+    from .Lox import Lox
+    code = compile(self.transpile(statments), Transpiler.FILENAME, "exec")
+    exec(code, self.namespace)
+    main = self.namespace.pop("_main")
+    try:
+      main()
+    except RuntimeException as error:
+      Lox.runtimeError(error)
+    except NameError as error:
+      if not (error.name or "").startswith("g_"):
+        raise
+      Lox.runtimeError(self.__undefinedVariable(error))
+    except RecursionError as error:
+      Lox.runtimeError(RuntimeException(Token(TokenType.IDENTIFIER, "", None, self.__errorLine(error)), "Stack overflow."))
+
+  def transpile(self, statments: list[Stmt]) -> ast.Module:
+    self.context = Transpiler.Context(None)
+    body: list[ast.stmt] = self.__statements(statments)
+    main: ast.FunctionDef = self.__functionDef("_main", [], self.__header(self.context) + body)
+    self.context = None
+
+    module: ast.Module = ast.Module(body=[main], type_ignores=[])
+    return ast.fix_missing_locations(module)
+
+  def visitLiteralExpr(self, expr: Literal) -> ast.expr:
+    return ast.Constant(expr.value)
+
+  def visitGroupingExpr(self, expr: Grouping) -> ast.expr:
+    return self.__expression(expr.expression)
+
+  def visitUnaryExpr(self, expr: Unary) -> ast.expr:
+    if expr.operator.type == TokenType.BANG:
+      return ast.UnaryOp(ast.Not(), self.__truthy(expr.right))
+
+    value: str = self.__temp()
+    return ast.IfExp(
+      self.__isFloat(self.__walrus(value, self.__expression(expr.right))),
+      ast.UnaryOp(ast.USub(), self.__load(value)),
+      self.__helper("_negate", self.__load(value), self.__token(expr.operator)),
+    )
+
+  def visitBinaryExpr(self, expr: Binary) -> ast.expr:
+    operatorType: TokenType = expr.operator.type
+
+    if operatorType == TokenType.EQUAL_EQUAL:
+      return ast.Compare(self.__expression(expr.left), [ast.Eq()], [self.__expression(expr.right)])
+    if operatorType == TokenType.BANG_EQUAL:
+      return ast.Compare(self.__expression(expr.left), [ast.NotEq()], [self.__expression(expr.right)])
+
+    if operatorType == TokenType.PLUS:
+      return self.__numeric(expr, lambda a, b: ast.BinOp(a, ast.Add(), b), "_add")
+    if operatorType == TokenType.MINUS:
+      return self.__numeric(expr, lambda a, b: ast.BinOp(a, ast.Sub(), b), "_subtract")
+    if operatorType == TokenType.STAR:
+      return self.__numeric(expr, lambda a, b: ast.BinOp(a, ast.Mult(), b), "_multiply")
+    if operatorType == TokenType.SLASH:
+      return self.__numeric(expr, lambda a, b: ast.BinOp(a, ast.Div(), b), "_divide", nonZero=True)
+    if operatorType == TokenType.GREATER:
+      return self.__numeric(expr, lambda a, b: ast.Compare(a, [ast.Gt()], [b]), "_greater")
+    if operatorType == TokenType.GREATER_EQUAL:
+      return self.__numeric(expr, lambda a, b: ast.Compare(a, [ast.GtE()], [b]), "_greaterEqual")
+    if operatorType == TokenType.LESS:
+      return self.__numeric(expr, lambda a, b: ast.Compare(a, [ast.Lt()], [b]), "_less")
+    if operatorType == TokenType.LESS_EQUAL:
+      return self.__numeric(expr, lambda a, b: ast.Compare(a, [ast.LtE()], [b]), "_lessEqual")
+
+    return ast.Constant(None)
+
+  def visitLogicalExpr(self, expr: Logical) -> ast.expr:
+    value: str = self.__temp()
+    left: ast.expr = self.__walrus(value, self.__expression(expr.left))
+    right: ast.expr = self.__expression(expr.right)
+
+    if expr.operator.type == TokenType.OR:
+      return ast.IfExp(self.__isTruthy(left, value), self.__load(value), right)
+
+    return ast.IfExp(self.__isTruthy(left, value), right, self.__load(value))
+
+  def visitVariableExpr(self, expr: Variable) -> ast.expr:
+    return self.__variable(expr.name, expr)
+
+  def visitThisExpr(self, expr: This) -> ast.expr:
+    return self.__variable(expr.keyword, expr)
+
+  def visitAssignExpr(self, expr: Assign) -> ast.expr:
+    value: ast.expr = self.__expression(expr.value)
+    if expr.depth == None:
+      name: str = self.__global(expr.name.lexeme)
+      self.context.globals.add(name)
+      value = self.__helper("_checkGlobal", value, ast.Constant(name), self.__token(expr.name))
+      return ast.NamedExpr(self.__store(name), value)
+
+    return ast.NamedExpr(self.__store(self.__local(expr, assign=True)), value)
+
+  def visitCallExpr(self, expr: Call) -> ast.expr:
+    callee: str = self.__temp()
+    guard: ast.expr = ast.BoolOp(ast.And(), [
+      ast.Compare(self.__type(self.__walrus(callee, self.__expression(expr.callee))), [ast.Is()], [self.__load("_Function")]),
+      ast.Compare(ast.Attribute(self.__load(callee), "paramCount", ast.Load()), [ast.Eq()], [ast.Constant(len(expr.arguments))]),
+    ])
+
+    fast: ast.expr = ast.Attribute(self.__load(callee), "function", ast.Load())
+    slow: ast.expr = self.__helper("_call", self.__load(callee), self.__token(expr.paren))
+    call: ast.Call = ast.Call(
+      ast.IfExp(guard, fast, slow),
+      [self.__expression(argument) for argument in expr.arguments],
+      [],
+    )
+    # Tagged with the Lox line so a stack overflow can be traced to it.
+    call.lineno = call.end_lineno = expr.paren.line
+    call.col_offset = call.end_col_offset = 0
+    return call
+
+  def visitGetExpr(self, expr: Get) -> ast.expr:
+    object: str = self.__temp()
+    index: str = self.__temp()
+    shapeIndex: ast.expr = ast.Attribute(ast.Attribute(self.__load(object), "shape", ast.Load()), "index", ast.Load())
+    lookup: ast.expr = ast.Call(ast.Attribute(shapeIndex, "get", ast.Load()), [ast.Constant(expr.name.lexeme)], [])
+    guard: ast.expr = ast.BoolOp(ast.And(), [
+      ast.Compare(self.__type(self.__walrus(object, self.__expression(expr.object))), [ast.Is()], [self.__load("_Instance")]),
+      ast.Compare(self.__walrus(index, lookup), [ast.IsNot()], [ast.Constant(None)]),
+    ])
+
+    fast: ast.expr = ast.Subscript(ast.Attribute(self.__load(object), "values", ast.Load()), self.__load(index), ast.Load())
+    slow: ast.expr = self.__helper("_get", self.__load(object), self.__token(expr.name))
+    return ast.IfExp(guard, fast, slow)
+
+  def visitSetExpr(self, expr: Set) -> ast.expr:
+    object: str = self.__temp()
+    value: str = self.__temp()
+    return ast.Subscript(ast.Tuple([
+      self.__helper("_checkFields", self.__walrus(object, self.__expression(expr.object)), self.__token(expr.name)),
+      self.__walrus(value, self.__expression(expr.value)),
+      self.__setField(object, expr.name, self.__load(value)),
+    ], ast.Load()), ast.Constant(1), ast.Load())
+
+  def visitSuperExpr(self, expr: Super) -> ast.expr:
+    superclass: str = self.scopes[-1 - expr.depth].names[expr.slot]
+    this: str = self.scopes[-expr.depth].names[0]
+    return self.__helper("_super", self.__load(superclass), self.__load(this), self.__token(expr.method))
+
+  def visitExpressionStmt(self, stmt: Expression) -> list[ast.stmt]:
+    expression: Expr = stmt.expression
+
+    if isinstance(expression, Assign) and expression.depth != None:
+      return [ast.Assign([self.__store(self.__local(expression, assign=True))], self.__expression(expression.value))]
+
+    if isinstance(expression, Set):
+      object: str = self.__temp()
+      return [
+        ast.Expr(self.__helper("_checkFields", self.__walrus(object, self.__expression(expression.object)), self.__token(expression.name))),
+        ast.Expr(self.__setField(object, expression.name, self.__expression(expression.value))),
+      ]
+
+    return [ast.Expr(self.__expression(expression))]
+
+  def visitPrintStmt(self, stmt: Print) -> list[ast.stmt]:
+    return [ast.Expr(self.__helper("_print", self.__expression(stmt.expression)))]
+
+  def visitVarStmt(self, stmt: Var) -> list[ast.stmt]:
+    value: ast.expr = ast.Constant(None)
+    if stmt.initializer != None:
+      value = self.__expression(stmt.initializer)
+
+    return [ast.Assign([self.__store(self.__declare(stmt.name))], value)]
+
+  def visitBlockStmt(self, stmt: Block) -> list[ast.stmt]:
+    if not stmt.declares:
+      return self.__statements(stmt.statements)
+
+    if not stmt.escapes and self.scopes:
+      names: list[str] = self.scopes[-1].names
+      base: int = len(names)
+      body: list[ast.stmt] = self.__statements(stmt.statements)
+      del names[base:]
+      return body
+
+    if self.context.loopDepth == 0 or not stmt.escapes:
+      self.__beginScope()
+      body: list[ast.stmt] = self.__statements(stmt.statements)
+      self.__endScope()
+      return body
+
+    enclosing: Transpiler.Context = self.context
+    self.context = Transpiler.Context(enclosing, enclosing.isInitializer)
+    self.__beginScope()
+    body: list[ast.stmt] = self.__statements(stmt.statements)
+    self.__endScope()
+    block: Transpiler.Context = self.context
+    self.context = enclosing
+
+    name: str = self.__unique("_block")
+    definition: ast.FunctionDef = self.__functionDef(name, [], self.__header(block) + body + [
+      ast.Return(self.__load("_noReturn")),
+    ])
+
+    if not block.hasReturn:
+      return [definition, ast.Expr(ast.Call(self.__load(name), [], []))]
+
+    self.context.hasReturn = True
+    completion: str = self.__temp()
+    return [definition, ast.If(
+      ast.Compare(self.__walrus(completion, ast.Call(self.__load(name), [], [])), [ast.IsNot()], [self.__load("_noReturn")]),
+      [ast.Return(self.__load(completion))],
+      [],
+    )]
+
+  def visitIfStmt(self, stmt: If) -> list[ast.stmt]:
+    condition: ast.expr = self.__truthy(stmt.condition)
+    thenBranch: list[ast.stmt] = self.__statement(stmt.thenBranch) or [ast.Pass()]
+    elseBranch: list[ast.stmt] = []
+    if stmt.elseBranch != None:
+      elseBranch = self.__statement(stmt.elseBranch)
+
+    return [ast.If(condition, thenBranch, elseBranch)]
+
+  def visitWhileStmt(self, stmt: While) -> list[ast.stmt]:
+    condition: ast.expr = self.__truthy(stmt.condition)
+    self.context.loopDepth += 1
+    body: list[ast.stmt] = self.__statement(stmt.body) or [ast.Pass()]
+    self.context.loopDepth -= 1
+    return [ast.While(condition, body, [])]
+
+  def visitReturnStmt(self, stmt: Return) -> list[ast.stmt]:
+    self.context.hasReturn = True
+    if self.context.isInitializer:
+      return [ast.Return(self.__load("this"))]
+
+    value: ast.expr = ast.Constant(None)
+    if stmt.value != None:
+      value = self.__expression(stmt.value)
+
+    return [ast.Return(value)]
+
+  def visitFunctionStmt(self, stmt: Function) -> list[ast.stmt]:
+    name: str = self.__declare(stmt.name)
+    definition: ast.FunctionDef = self.__function(stmt, False, False)
+
+    return [definition, ast.Assign([self.__store(name)], self.__helper(
+      "_Function",
+      self.__load(definition.name),
+      ast.Constant(stmt.name.lexeme),
+      ast.Constant(len(stmt.params)),
+      ast.Constant(False),
+    ))]
+
+  def visitClassStmt(self, stmt: Class) -> list[ast.stmt]:
+    superclass: ast.expr = ast.Constant(None)
+    if stmt.superclass != None:
+      superclass = self.__helper("_checkSuperclass", self.__expression(stmt.superclass), self.__token(stmt.superclass.name))
+
+    superclassValue: str = self.__temp()
+    name: str = self.__declare(stmt.name)
+
+    enclosing: Transpiler.Context = self.context
+    self.context = Transpiler.Context(enclosing)
+    superclassName: str = self.__unique("_superclass")
+    if stmt.superclass != None:
+      self.__beginScope()
+      self.scopes[-1].names.append(superclassName)
+
+    methods: list[ast.stmt] = []
+    table: ast.Dict = ast.Dict([], [])
+    for method in stmt.methods:
+      isInitializer: bool = method.name.lexeme == "init"
+      definition: ast.FunctionDef = self.__function(method, True, isInitializer)
+      methods.append(definition)
+      table.keys.append(ast.Constant(method.name.lexeme))
+      table.values.append(self.__helper(
+        "_Function",
+        self.__load(definition.name),
+        ast.Constant(method.name.lexeme),
+        ast.Constant(len(method.params)),
+        ast.Constant(isInitializer),
+      ))
+
+    if stmt.superclass != None:
+      self.__endScope()
+
+    body: list[ast.stmt] = self.__header(self.context) + methods + [ast.Return(table)]
+    self.context = enclosing
+
+    factory: str = self.__unique("_class")
+    return [
+      ast.Assign([self.__store(superclassValue)], superclass),
+      ast.Assign([self.__store(name)], ast.Constant(None)),
+      self.__functionDef(factory, [superclassName], body),
+      ast.Assign([self.__store(name)], self.__helper(
+        "_Class",
+        ast.Constant(stmt.name.lexeme),
+        self.__load(superclassValue),
+        ast.Call(self.__load(factory), [self.__load(superclassValue)], []),
+      )),
+    ]
+
+  def __expression(self, expr: Expr) -> ast.expr:
+    return expr.accept(self)
+
+  def __statement(self, stmt: Stmt) -> list[ast.stmt]:
+    return stmt.accept(self)
+
+  def __statements(self, statments: list[Stmt]) -> list[ast.stmt]:
+    body: list[ast.stmt] = []
+    for statment in statments:
+      body.extend(self.__statement(statment))
+    return body
+
+  def __function(self, declaration: Function, isMethod: bool, isInitializer: bool) -> ast.FunctionDef:
+    enclosing: Transpiler.Context = self.context
+    self.context = Transpiler.Context(enclosing, isInitializer)
+    self.__beginScope()
+
+    parameters: list[str] = []
+    if isMethod:
+      self.scopes[-1].names.append("this")
+      parameters.append("this")
+    parameters.extend(self.__declare(param) for param in declaration.params)
+    body: list[ast.stmt] = self.__statements(declaration.body)
+    if isInitializer:
+      body.append(ast.Return(self.__load("this")))
+
+    self.__endScope()
+    body = self.__header(self.context) + body
+    self.context = enclosing
+
+    return self.__functionDef(self.__unique(f"_{declaration.name.lexeme}_"), parameters, body)
+
+  def __functionDef(self, name: str, parameters: list[str], body: list[ast.stmt]) -> ast.FunctionDef:
+    return ast.FunctionDef(
+      name=name,
+      args=ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(parameter) for parameter in parameters],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+      ),
+      body=body or [ast.Pass()],
+      decorator_list=[],
+      returns=None,
+    )
+
+  def __header(self, context: 'Transpiler.Context') -> list[ast.stmt]:
+    header: list[ast.stmt] = []
+    if context.globals:
+      header.append(ast.Global(sorted(context.globals)))
+    if context.nonlocals:
+      header.append(ast.Nonlocal(sorted(context.nonlocals)))
+    return header
+
+  def __declare(self, name: Token) -> str:
+    if not self.scopes:
+      pythonName: str = self.__global(name.lexeme)
+      self.context.globals.add(pythonName)
+      return pythonName
+
+    pythonName: str = self.__unique(f"l_{name.lexeme}_")
+    self.scopes[-1].names.append(pythonName)
+    return pythonName
+
+  def __variable(self, name: Token, expr: Expr) -> ast.expr:
+    if expr.depth == None:
+      node: ast.Name = self.__load(self.__global(name.lexeme))
+      node.lineno = node.end_lineno = name.line
+      node.col_offset = node.end_col_offset = 0
+      return node
+
+    return self.__load(self.__local(expr))
+
+  def __local(self, expr: Expr, assign: bool = False) -> str:
+    scope: Transpiler.Scope = self.scopes[-1 - expr.depth]
+    name: str = scope.names[expr.slot]
+    if assign and scope.context is not self.context:
+      self.context.nonlocals.add(name)
+    return name
+
+  def __truthy(self, expr: Expr) -> ast.expr:
+    while isinstance(expr, Grouping):
+      expr = expr.expression
+
+    if isinstance(expr, Literal):
+      return ast.Constant(expr.value is not None and expr.value is not False)
+    if isinstance(expr, Unary) and expr.operator.type == TokenType.BANG:
+      return self.__expression(expr)
+    if isinstance(expr, Binary) and expr.operator.type in Transpiler.__COMPARISONS:
+      return self.__expression(expr)
+
+    value: str = self.__temp()
+    return self.__isTruthy(self.__walrus(value, self.__expression(expr)), value)
+
+  def __isTruthy(self, value: ast.expr, name: str) -> ast.expr:
+    return ast.BoolOp(ast.And(), [
+      ast.Compare(value, [ast.IsNot()], [ast.Constant(None)]),
+      ast.Compare(self.__load(name), [ast.IsNot()], [ast.Constant(False)]),
+    ])
+
+  def __numeric(self, expr: Binary, operation, helper: str, nonZero: bool = False) -> ast.expr:
+    left: str = self.__temp()
+    right: str = self.__temp()
+    guard: ast.expr = ast.Compare(
+      self.__type(self.__walrus(left, self.__expression(expr.left))),
+      [ast.Is(), ast.Is()],
+      [self.__type(self.__walrus(right, self.__expression(expr.right))), self.__load("float")],
+    )
+    if nonZero:
+      guard = ast.BoolOp(ast.And(), [guard, self.__load(right)])
+
+    return ast.IfExp(
+      guard,
+      operation(self.__load(left), self.__load(right)),
+      self.__helper(helper, self.__load(left), self.__load(right), self.__token(expr.operator)),
+    )
+
+  def __setField(self, object: str, name: Token, value: ast.expr) -> ast.expr:
+    return ast.Call(
+      ast.Attribute(self.__load(object), "setField", ast.Load()),
+      [ast.Constant(name.lexeme), value],
+      [],
+    )
+
+  def __isFloat(self, value: ast.expr) -> ast.expr:
+    return ast.Compare(self.__type(value), [ast.Is()], [self.__load("float")])
+
+  def __type(self, value: ast.expr) -> ast.expr:
+    return ast.Call(self.__load("type"), [value], [])
+
+  def __walrus(self, name: str, value: ast.expr) -> ast.expr:
+    return ast.NamedExpr(self.__store(name), value)
+
+  def __helper(self, name: str, *arguments: ast.expr) -> ast.expr:
+    return ast.Call(self.__load(name), list(arguments), [])
+
+  def __token(self, token: Token) -> ast.expr:
+    self.tokens.append(token)
+    return ast.Subscript(self.__load("_tokens"), ast.Constant(len(self.tokens) - 1), ast.Load())
+
+  def __temp(self) -> str:
+    return self.__unique("_t")
+
+  def __unique(self, prefix: str) -> str:
+    self.counter += 1
+    return f"{prefix}{self.counter}"
+
+  def __beginScope(self) -> None:
+    self.scopes.append(Transpiler.Scope(self.context))
+
+  def __endScope(self) -> None:
+    self.scopes.pop()
+
+  def __undefinedVariable(self, error: NameError) -> RuntimeException:
+    lexeme: str = error.name[2:]
+    return RuntimeException(Token(TokenType.IDENTIFIER, lexeme, None, self.__errorLine(error)), f"Undefined variable '{lexeme}'.")
+
+  def __errorLine(self, error: Exception) -> int:
+    line: int = 0
+    traceback = error.__traceback__
+    while traceback != None:
+      if traceback.tb_frame.f_code.co_filename == Transpiler.FILENAME:
+        line = traceback.tb_lineno
+      traceback = traceback.tb_next
+    return line
+
+  def __callable(self, callee: any, paren: Token) -> any:
+    return partial(self.__callValue, callee, paren)
+
+  def __callValue(self, callee: any, paren: Token, *arguments: any) -> any:
+    arguments: list[any] = list(arguments)
+    if not isinstance(callee, LoxCallable):
+      raise RuntimeException(paren, "Can only call functions and classes.")
+
+    if len(arguments) != callee.arity():
+      raise RuntimeException(paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+
+    return callee.call(self, arguments)
+
+  def __checkGlobal(self, value: any, name: str, token: Token) -> any:
+    if name not in self.namespace:
+      raise RuntimeException(token, f"Undefined variable '{token.lexeme}'.")
+    return value
+
+  __COMPARISONS: set[TokenType] = {
+    TokenType.EQUAL_EQUAL,
+    TokenType.BANG_EQUAL,
+    TokenType.GREATER,
+    TokenType.GREATER_EQUAL,
+    TokenType.LESS,
+    TokenType.LESS_EQUAL,
+  }
+
+  @staticmethod
+  def __global(lexeme: str) -> str:
+    return f"g_{lexeme}"
+
+  @staticmethod
+  def __load(name: str) -> ast.Name:
+    return ast.Name(name, ast.Load())
+
+  @staticmethod
+  def __store(name: str) -> ast.Name:
+    return ast.Name(name, ast.Store())
+
+  @staticmethod
+  def __print(value: any) -> None:
+    print(stringify(value))
+
+  @staticmethod
+  def __add(left: any, right: any, operator: Token) -> any:
+    if isinstance(left, float) and isinstance(right, float):
+      return left + right
+    if isinstance(left, str) and isinstance(right, str):
+      return left + right
+    raise RuntimeException(operator, "Operands must be two numbers or two strings.")
+
+  @staticmethod
+  def __subtract(left: any, right: any, operator: Token) -> float:
+    checkNumberOperands(operator, left, right)
+    return float(left) - float(right)
+
+  @staticmethod
+  def __multiply(left: any, right: any, operator: Token) -> float:
+    checkNumberOperands(operator, left, right)
+    return float(left) * float(right)
+
+  @staticmethod
+  def __divide(left: any, right: any, operator: Token) -> float:
+    checkNumberOperands(operator, left, right)
+    if float(right) == 0:
+      raise RuntimeException(operator, "Division by zero.")
+    return float(left) / float(right)
+
+  @staticmethod
+  def __greater(left: any, right: any, operator: Token) -> bool:
+    checkNumberOperands(operator, left, right)
+    return float(left) > float(right)
+
+  @staticmethod
+  def __greaterEqual(left: any, right: any, operator: Token) -> bool:
+    checkNumberOperands(operator, left, right)
+    return float(left) >= float(right)
+
+  @staticmethod
+  def __less(left: any, right: any, operator: Token) -> bool:
+    checkNumberOperands(operator, left, right)
+    return float(left) < float(right)
+
+  @staticmethod
+  def __lessEqual(left: any, right: any, operator: Token) -> bool:
+    checkNumberOperands(operator, left, right)
+    return float(left) <= float(right)
+
+  @staticmethod
+  def __negate(operand: any, operator: Token) -> float:
+    if isinstance(operand, (int, float)):
+      return -float(operand)
+    raise RuntimeException(operator, "Operand must be a number.")
+
+  @staticmethod
+  def __get(object: any, name: Token) -> any:
+    if isinstance(object, LoxInstance):
+      return object.get(name)
+    raise RuntimeException(name, "Only instances have properties.")
+
+  @staticmethod
+  def __checkFields(object: any, name: Token) -> None:
+    if not isinstance(object, LoxInstance):
+      raise RuntimeException(name, "Only instances have fields.")
+
+  @staticmethod
+  def __checkSuperclass(superclass: any, name: Token) -> LoxClass:
+    if not isinstance(superclass, LoxClass):
+      raise RuntimeException(name, "Superclass must be a class.")
+    return superclass
+
+  @staticmethod
+  def __super(superclass: LoxClass, this: LoxInstance, method: Token) -> 'TranspiledFunction':
+    function: TranspiledFunction = superclass.findMethod(method.lexeme)
+    if function == None:
+      raise RuntimeException(method, f"Undefined property '{method.lexeme}'.")
+    return function.bind(this)
+
+class TranspiledFunction(LoxCallable):
+  def __init__(self, function, name: str, paramCount: int, isInitializer: bool) -> None:
+    self.function = function
+    self.name: str = name
+    self.paramCount: int = paramCount
+    self.isInitializer: bool = isInitializer
+
+  def bind(self, instance: LoxInstance) -> 'TranspiledFunction':
+    return TranspiledFunction(partial(self.function, instance), self.name, self.paramCount, self.isInitializer)
+
+  def arity(self) -> int:
+    return self.paramCount
+
+  def call(self, interpreter: Transpiler, arguments: list[any]) -> any:
+    return self.function(*arguments)
+
+  def invoke(self, interpreter: Transpiler, arguments: list[any]) -> any:
+    return self.function(*arguments)
+
+  def __str__(self) -> str:
+    return f"<fn {self.name}>"
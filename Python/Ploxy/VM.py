@@ -0,0 +1,515 @@
+from .Chunk import Chunk, OpCode, FunctionProto
+from .Compiler import Compiler
+from .Stmt import Stmt
+from .Token import Token
+from .TokenType import TokenType
+from .RuntimeError import RuntimeException
+from .LoxCallable import LoxCallable
+from .LoxClass import LoxClass
+from .LoxInstance import LoxInstance
+from .Interpreter import ClockFunction
+from .Runtime import stringify
+
+class Upvalue:
+  __slots__ = ("values", "index")
+
+  def __init__(self, values: list[any], index: int) -> None:
+    # While open, values is the VM stack itself; closing moves the value
+    # into a private one-element list so reads never need to branch.
+    self.values: list[any] = values
+    self.index: int = index
+
+  def close(self) -> None:
+    self.values = [self.values[self.index]]
+    self.index = 0
+
+class Closure:
+  __slots__ = ("function", "upvalues")
+
+  def __init__(self, function: FunctionProto, upvalues: list[Upvalue]) -> None:
+    self.function: FunctionProto = function
+    self.upvalues: list[Upvalue] = upvalues
+
+  def __str__(self) -> str:
+    return str(self.function)
+
+class BoundMethod:
+  __slots__ = ("receiver", "method")
+
+  def __init__(self, receiver: LoxInstance, method: Closure) -> None:
+    self.receiver: LoxInstance = receiver
+    self.method: Closure = method
+
+  def __str__(self) -> str:
+    return str(self.method)
+
+# Marks a field value sitting where a method call expects its receiver.
+EMPTY = object()
+
+class VM:
+  FRAMES_MAX: int = 1024
+
+  def __init__(self) -> None:
+    self.globals: dict[str, any] = {"clock": ClockFunction()}
+    self.stack: list[any] = []
+    self.frames: list[tuple] = []
+    self.openUpvalues: list[Upvalue] = []
+
+  def interpret(self, statments: list[Stmt]) -> None:
+    from .Lox import Lox
+    function: FunctionProto = Compiler().compile(statments)
+    if Lox.hadError:
+      return
+
+    self.run(function)
+
+  def run(self, function: FunctionProto) -> None:
+    from .Lox import Lox
+    self.stack.append(Closure(function, []))
+    try:
+      self.__run()
+    except RuntimeException as error:
+      self.stack.clear()
+      self.frames.clear()
+      self.openUpvalues.clear()
+      Lox.runtimeError(error)
+
+  def __run(self) -> None:
+    from .Lox import Lox
+    CONSTANT = OpCode.CONSTANT.value
+    NIL = OpCode.NIL.value
+    TRUE = OpCode.TRUE.value
+    FALSE = OpCode.FALSE.value
+    POP = OpCode.POP.value
+    GET_LOCAL = OpCode.GET_LOCAL.value
+    SET_LOCAL = OpCode.SET_LOCAL.value
+    GET_GLOBAL = OpCode.GET_GLOBAL.value
+    DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+    SET_GLOBAL = OpCode.SET_GLOBAL.value
+    GET_UPVALUE = OpCode.GET_UPVALUE.value
+    SET_UPVALUE = OpCode.SET_UPVALUE.value
+    GET_PROPERTY = OpCode.GET_PROPERTY.value
+    SET_PROPERTY = OpCode.SET_PROPERTY.value
+    CHECK_INSTANCE = OpCode.CHECK_INSTANCE.value
+    GET_SUPER = OpCode.GET_SUPER.value
+    EQUAL = OpCode.EQUAL.value
+    GREATER = OpCode.GREATER.value
+    GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+    LESS = OpCode.LESS.value
+    LESS_EQUAL = OpCode.LESS_EQUAL.value
+    ADD = OpCode.ADD.value
+    SUBTRACT = OpCode.SUBTRACT.value
+    MULTIPLY = OpCode.MULTIPLY.value
+    DIVIDE = OpCode.DIVIDE.value
+    NOT = OpCode.NOT.value
+    NEGATE = OpCode.NEGATE.value
+    PRINT = OpCode.PRINT.value
+    JUMP = OpCode.JUMP.value
+    JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+    LOOP = OpCode.LOOP.value
+    CALL = OpCode.CALL.value
+    GET_METHOD = OpCode.GET_METHOD.value
+    GET_SUPER_METHOD = OpCode.GET_SUPER_METHOD.value
+    CALL_METHOD = OpCode.CALL_METHOD.value
+    CLOSURE = OpCode.CLOSURE.value
+    CLOSE_UPVALUE = OpCode.CLOSE_UPVALUE.value
+    RETURN = OpCode.RETURN.value
+    CLASS = OpCode.CLASS.value
+    METHOD = OpCode.METHOD.value
+    SUBCLASS = OpCode.SUBCLASS.value
+
+    stack: list[any] = self.stack
+    push = stack.append
+    pop = stack.pop
+    frames: list[tuple] = self.frames
+    globals: dict[str, any] = self.globals
+    openUpvalues: list[Upvalue] = self.openUpvalues
+    framesLimit: int = (VM.FRAMES_MAX if Lox.maxDepth is None else Lox.maxDepth) - 1
+    error = self.__error
+
+    closure: Closure = stack[-1]
+    base: int = len(stack) - 1
+    chunk: Chunk = closure.function.chunk
+    code = chunk.code
+    constants: list[any] = chunk.constants
+    upvalues: list[Upvalue] = closure.upvalues
+    ip: int = 0
+
+    while True:
+      op: int = code[ip]
+      ip += 1
+
+      if op == GET_LOCAL:
+        push(stack[base + code[ip]])
+        ip += 1
+
+      elif op == CONSTANT:
+        push(constants[code[ip] << 8 | code[ip + 1]])
+        ip += 2
+
+      elif op == GET_GLOBAL:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        value: any = globals.get(name, EMPTY)
+        if value is EMPTY:
+          raise error(closure, ip, f"Undefined variable '{name}'.")
+        push(value)
+
+      elif op == GET_UPVALUE:
+        upvalue: Upvalue = upvalues[code[ip]]
+        ip += 1
+        push(upvalue.values[upvalue.index])
+
+      elif op == ADD:
+        b: any = pop()
+        a: any = stack[-1]
+        if type(a) is float and type(b) is float:
+          stack[-1] = a + b
+        elif type(a) is str and type(b) is str:
+          stack[-1] = a + b
+        else:
+          raise error(closure, ip, "Operands must be two numbers or two strings.")
+
+      elif op == SUBTRACT:
+        b: any = pop()
+        a: any = stack[-1]
+        if type(a) is float and type(b) is float:
+          stack[-1] = a - b
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+          stack[-1] = float(a) - float(b)
+        else:
+          raise error(closure, ip, "Operands must be numbers.")
+
+      elif op == LESS:
+        b: any = pop()
+        a: any = stack[-1]
+        if type(a) is float and type(b) is float:
+          stack[-1] = a < b
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+          stack[-1] = float(a) < float(b)
+        else:
+          raise error(closure, ip, "Operands must be numbers.")
+
+      elif op == JUMP_IF_FALSE:
+        value: any = stack[-1]
+        if value is None or value is False:
+          ip += code[ip] << 8 | code[ip + 1]
+        ip += 2
+
+      elif op == POP:
+        pop()
+
+      elif op == CALL:
+        argCount: int = code[ip]
+        ip += 1
+        callee: any = stack[-1 - argCount]
+        if type(callee) is not Closure:
+          callee = self.__callValue(callee, argCount, closure, ip)
+          if callee is None:
+            continue
+
+        function: FunctionProto = callee.function
+        if argCount != function.arity:
+          raise error(closure, ip, f"Expected {function.arity} arguments but got {argCount}.")
+        if len(frames) == framesLimit:
+          raise error(closure, ip, "Stack overflow.")
+
+        frames.append((closure, ip, base))
+        closure = callee
+        chunk = function.chunk
+        code = chunk.code
+        constants = chunk.constants
+        upvalues = callee.upvalues
+        ip = 0
+        base = len(stack) - argCount - 1
+
+      elif op == RETURN:
+        result: any = pop()
+        if openUpvalues and openUpvalues[-1].index >= base:
+          self.__closeUpvalues(base)
+        del stack[base:]
+        if not frames:
+          return
+
+        push(result)
+        closure, ip, base = frames.pop()
+        chunk = closure.function.chunk
+        code = chunk.code
+        constants = chunk.constants
+        upvalues = closure.upvalues
+
+      elif op == SET_LOCAL:
+        stack[base + code[ip]] = stack[-1]
+        ip += 1
+
+      elif op == JUMP:
+        ip += (code[ip] << 8 | code[ip + 1]) + 2
+
+      elif op == LOOP:
+        ip += 2 - (code[ip] << 8 | code[ip + 1])
+
+      elif op == GET_PROPERTY:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        instance: any = stack[-1]
+        if type(instance) is not LoxInstance:
+          raise error(closure, ip, "Only instances have properties.")
+
+        index: int = instance.shape.index.get(name)
+        if index is not None:
+          stack[-1] = instance.values[index]
+        else:
+          method: Closure = instance.Klass.findMethod(name)
+          if method is None:
+            raise error(closure, ip, f"Undefined property '{name}'.")
+          stack[-1] = BoundMethod(instance, method)
+
+      elif op == GET_METHOD:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        instance: any = stack[-1]
+        if type(instance) is not LoxInstance:
+          raise error(closure, ip, "Only instances have properties.")
+
+        index: int = instance.shape.index.get(name)
+        if index is not None:
+          stack[-1] = instance.values[index]
+          push(EMPTY)
+        else:
+          method: Closure = instance.Klass.findMethod(name)
+          if method is None:
+            raise error(closure, ip, f"Undefined property '{name}'.")
+          stack[-1] = method
+          push(instance)
+
+      elif op == CALL_METHOD:
+        # The stack holds [callee][receiver][arguments...]; the receiver
+        # is EMPTY when the callee came from a field instead of a method.
+        argCount: int = code[ip]
+        ip += 1
+        index: int = -2 - argCount
+        callee: any = stack[index]
+        if stack[index + 1] is EMPTY:
+          del stack[index + 1]
+          if type(callee) is not Closure:
+            callee = self.__callValue(callee, argCount, closure, ip)
+            if callee is None:
+              continue
+        else:
+          del stack[index]
+
+        function: FunctionProto = callee.function
+        if argCount != function.arity:
+          raise error(closure, ip, f"Expected {function.arity} arguments but got {argCount}.")
+        if len(frames) == framesLimit:
+          raise error(closure, ip, "Stack overflow.")
+
+        frames.append((closure, ip, base))
+        closure = callee
+        chunk = function.chunk
+        code = chunk.code
+        constants = chunk.constants
+        upvalues = callee.upvalues
+        ip = 0
+        base = len(stack) - argCount - 1
+
+      elif op == SET_PROPERTY:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        value: any = pop()
+        stack[-1].setField(name, value)
+        stack[-1] = value
+
+      elif op == CHECK_INSTANCE:
+        if type(stack[-1]) is not LoxInstance:
+          raise error(closure, ip, "Only instances have fields.")
+
+      elif op == MULTIPLY:
+        b: any = pop()
+        a: any = stack[-1]
+        if type(a) is float and type(b) is float:
+          stack[-1] = a * b
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+          stack[-1] = float(a) * float(b)
+        else:
+          raise error(closure, ip, "Operands must be numbers.")
+
+      elif op == DIVIDE:
+        b: any = pop()
+        a: any = stack[-1]
+        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
+          raise error(closure, ip, "Operands must be numbers.")
+        if float(b) == 0:
+          raise error(closure, ip, "Division by zero.")
+        stack[-1] = float(a) / float(b)
+
+      elif op == GREATER:
+        b: any = pop()
+        a: any = stack[-1]
+        if type(a) is float and type(b) is float:
+          stack[-1] = a > b
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+          stack[-1] = float(a) > float(b)
+        else:
+          raise error(closure, ip, "Operands must be numbers.")
+
+      elif op == GREATER_EQUAL:
+        b: any = pop()
+        a: any = stack[-1]
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+          stack[-1] = float(a) >= float(b)
+        else:
+          raise error(closure, ip, "Operands must be numbers.")
+
+      elif op == LESS_EQUAL:
+        b: any = pop()
+        a: any = stack[-1]
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+          stack[-1] = float(a) <= float(b)
+        else:
+          raise error(closure, ip, "Operands must be numbers.")
+
+      elif op == EQUAL:
+        b: any = pop()
+        stack[-1] = stack[-1] == b
+
+      elif op == NOT:
+        value: any = stack[-1]
+        stack[-1] = value is None or value is False
+
+      elif op == NEGATE:
+        value: any = stack[-1]
+        if not isinstance(value, (int, float)):
+          raise error(closure, ip, "Operand must be a number.")
+        stack[-1] = -float(value)
+
+      elif op == NIL:
+        push(None)
+
+      elif op == TRUE:
+        push(True)
+
+      elif op == FALSE:
+        push(False)
+
+      elif op == SET_GLOBAL:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        if name not in globals:
+          raise error(closure, ip, f"Undefined variable '{name}'.")
+        globals[name] = stack[-1]
+
+      elif op == SET_UPVALUE:
+        upvalue: Upvalue = upvalues[code[ip]]
+        ip += 1
+        upvalue.values[upvalue.index] = stack[-1]
+
+      elif op == DEFINE_GLOBAL:
+        globals[constants[code[ip] << 8 | code[ip + 1]]] = pop()
+        ip += 2
+
+      elif op == PRINT:
+        print(stringify(pop()))
+
+      elif op == CLOSURE:
+        function: FunctionProto = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        captured: list[Upvalue] = []
+        for _ in range(function.upvalueCount):
+          if code[ip]:
+            captured.append(self.__captureUpvalue(base + code[ip + 1]))
+          else:
+            captured.append(upvalues[code[ip + 1]])
+          ip += 2
+        push(Closure(function, captured))
+
+      elif op == CLOSE_UPVALUE:
+        self.__closeUpvalues(len(stack) - 1)
+        pop()
+
+      elif op == GET_SUPER:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        superclass: LoxClass = pop()
+        method: Closure = superclass.findMethod(name)
+        if method is None:
+          raise error(closure, ip, f"Undefined property '{name}'.")
+        stack[-1] = BoundMethod(stack[-1], method)
+
+      elif op == GET_SUPER_METHOD:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        superclass: LoxClass = pop()
+        method: Closure = superclass.findMethod(name)
+        if method is None:
+          raise error(closure, ip, f"Undefined property '{name}'.")
+        receiver: LoxInstance = stack[-1]
+        stack[-1] = method
+        push(receiver)
+
+      elif op == CLASS:
+        push(LoxClass(constants[code[ip] << 8 | code[ip + 1]], None, {}))
+        ip += 2
+
+      elif op == SUBCLASS:
+        name: str = constants[code[ip] << 8 | code[ip + 1]]
+        ip += 2
+        superclass: any = stack[-1]
+        if not isinstance(superclass, LoxClass):
+          raise error(closure, ip, "Superclass must be a class.")
+        stack[-1] = LoxClass(name, superclass, {})
+
+      elif op == METHOD:
+        method: Closure = pop()
+        stack[-1].defineMethod(constants[code[ip] << 8 | code[ip + 1]], method)
+        ip += 2
+
+      else:
+        raise error(closure, ip, f"Unknown opcode {op}.")
+
+  def __callValue(self, callee: any, argCount: int, closure: Closure, ip: int) -> Closure:
+    stack: list[any] = self.stack
+    if type(callee) is BoundMethod:
+      stack[-1 - argCount] = callee.receiver
+      return callee.method
+
+    if type(callee) is LoxClass:
+      stack[-1 - argCount] = LoxInstance(callee)
+      initializer: Closure = callee.initializer
+      if initializer is None:
+        if argCount != 0:
+          raise self.__error(closure, ip, f"Expected 0 arguments but got {argCount}.")
+        return None
+      return initializer
+
+    if isinstance(callee, LoxCallable):
+      if argCount != callee.arity():
+        raise self.__error(closure, ip, f"Expected {callee.arity()} arguments but got {argCount}.")
+      arguments: list[any] = stack[len(stack) - argCount:]
+      del stack[-1 - argCount:]
+      stack.append(callee.call(None, arguments))
+      return None
+
+    raise self.__error(closure, ip, "Can only call functions and classes.")
+
+  def __captureUpvalue(self, slot: int) -> Upvalue:
+    openUpvalues: list[Upvalue] = self.openUpvalues
+    i: int = len(openUpvalues)
+    while i > 0 and openUpvalues[i - 1].index > slot:
+      i -= 1
+    if i > 0 and openUpvalues[i - 1].index == slot:
+      return openUpvalues[i - 1]
+
+    upvalue: Upvalue = Upvalue(self.stack, slot)
+    openUpvalues.insert(i, upvalue)
+    return upvalue
+
+  def __closeUpvalues(self, last: int) -> None:
+    openUpvalues: list[Upvalue] = self.openUpvalues
+    while openUpvalues and openUpvalues[-1].index >= last:
+      openUpvalues.pop().close()
+
+  @staticmethod
+  def __error(closure: Closure, ip: int, message: str) -> RuntimeException:
+    line: int = closure.function.chunk.getLine(ip - 1)
+    return RuntimeException(Token(TokenType.EOF, "", None, line), message)
@@ -1 +1,2 @@
 # Ploxy package
+__version__ = "0.1.0"
@@ -1,20 +1,57 @@
 from sys import argv, exit
 from .Lox import Lox
+from .Profiler import Profiler
+from .Sampler import Sampler
+
+def usage():
+    engines = "|".join(Lox.engines)
+    print(f"Usage: ploxy [--engine={engines}] [--no-cache] [--no-optimize] [--stream] [--max-depth=N] [--profile[=sample]] [run] [script]")
+    exit(64)
 
 def main():
     print("Welcome to Ploxy!")
-    if len(argv) > 2:
-        print("Usage: ploxy [command] [script]")
-        exit(64)
-    elif len(argv) == 2:
-        if argv[1] == "run":
-            Lox.runPrompt()
+    args = []
+    for arg in argv[1:]:
+        if arg.startswith("--engine="):
+            if not Lox.useEngine(arg[len("--engine="):]):
+                usage()
+        elif arg == "--no-cache":
+            Lox.useCache = False
+        elif arg == "--no-optimize":
+            Lox.optimize = False
+        elif arg == "--stream":
+            Lox.stream = True
+        elif arg.startswith("--max-depth="):
+            depth = arg[len("--max-depth="):]
+            if not depth.isdigit() or int(depth) < 1:
+                usage()
+            Lox.maxDepth = int(depth)
+        elif arg == "--profile":
+            Lox.profiler = Profiler()
+        elif arg == "--profile=sample":
+            Lox.profiler = Sampler()
+        elif arg.startswith("--"):
+            usage()
         else:
-            Lox.runFile(argv[1])
-    elif len(argv) == 3 and argv[1] == "run":
-        Lox.runFile(argv[2])
+            args.append(arg)
+
+    if args and args[0] == "run":
+        args = args[1:]
+
+    if len(args) > 1:
+        usage()
+    # Only the bytecode engine keeps Lox frames on its own stack. The other
+    # engines are bounded by Python's recursion limit or by the native VM's.
+    if Lox.maxDepth is not None and type(Lox.interpreter) is not Lox.engines["bytecode"]:
+        usage()
+    # Only the tree-walk interpreter runs the instrumented tree.
+    if Lox.profiler is not None and (not args or type(Lox.interpreter) is not Lox.engines["interpreter"]):
+        usage()
+
+    if len(args) == 1:
+        Lox.runFile(args[0])
     else:
         Lox.runPrompt()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,27 @@
+from Ploxy.Environment import Environment
+from Ploxy.Interpreter import Interpreter
+from Ploxy.Optimizer import Optimizer
+from Ploxy.Parser import Parser
+from Ploxy.Resolver import Resolver
+from Ploxy.Scanner import Scanner
+from Ploxy.Stmt import Stmt
+
+def test_loop_body_locals_are_dropped_every_iteration(monkeypatch):
+  # A while loop shaped like a desugared for loop, but whose body itself
+  # declares, used to be run as a counted loop that skipped the block's
+  # cleanup, leaving one slot per iteration in the enclosing environment.
+  source: str = "{ var i = 0; while (i < 1000) { var x = i; i = i + 1; } }"
+  statments: list[Stmt] = Parser(Scanner(source).scanTokens()).parse()
+  Resolver().resolve(statments)
+  statments = Optimizer().optimize(statments)
+
+  sizes: list[int] = []
+  executeBlock = Interpreter.executeBlock
+  def recordSize(self, statments: list[Stmt], environment: Environment) -> tuple:
+    completion: tuple = executeBlock(self, statments, environment)
+    sizes.append(len(environment.values))
+    return completion
+  monkeypatch.setattr(Interpreter, "executeBlock", recordSize)
+
+  Interpreter().interpret(statments)
+  assert sizes == [1]
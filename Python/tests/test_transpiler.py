@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+PYTHON_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def run(source: str, tmp_path, *args: str) -> list[str]:
+  script = tmp_path / "script.lox"
+  script.write_text(source, encoding="utf-8")
+  result = subprocess.run(
+    [sys.executable, "-m", "Ploxy", *args, str(script)],
+    cwd=PYTHON_DIR, capture_output=True, text=True, check=True,
+  )
+  # The first line is the welcome banner.
+  return result.stdout.splitlines()[1:]
+
+def test_digit_suffixed_method_names_do_not_collide(tmp_path):
+  # Generated function names used to be the Lox name followed directly by
+  # a counter, so method t1 numbered 3 and method t numbered 13 were both
+  # emitted as _t13, and the later def replaced the earlier one. Each
+  # method takes one number, so 9 or 99 methods in between make t's number
+  # t1's with a 1 in front, whatever t1's number is below 100.
+  for between in (9, 99):
+    fillers: str = "".join(f"  m{n}() {{}}\n" for n in range(between))
+    source: str = (
+      "class A {\n"
+      "  t1() { return \"t1\"; }\n"
+      f"{fillers}"
+      "  t() { return \"t\"; }\n"
+      "}\n"
+      "print A().t1();\n"
+      "print A().t();\n"
+    )
+    assert run(source, tmp_path, "--engine=compile") == ["t1", "t"]
@@ -0,0 +1,191 @@
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Ploxy.Lox import Lox
+from Ploxy.Scanner import Scanner
+from Ploxy.Token import Token
+from Ploxy.Stmt import Stmt
+from Ploxy.Parser import Parser
+from Ploxy.Resolver import Resolver
+from Ploxy.Optimizer import Optimizer
+from Ploxy.Interpreter import Interpreter
+
+class Benchmark:
+  PHASES: list[str] = ["Scanner", "Parser", "Resolver", "Optimizer", "Interpreter"]
+  DIRECTORY: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "benchmarks")
+  RUNS: int = 5
+  THRESHOLD: float = 10.0
+  # Phases that take well under a millisecond are mostly timer jitter.
+  MIN_DIFFERENCE: float = 1.0
+
+  # The scanning and parsing benchmark is generated rather than checked in:
+  # every copy declares its own names, so the program still runs.
+  LARGE_FILE: str = "large_file"
+  LARGE_FILE_COPIES: int = 300
+  LARGE_FILE_CHUNK: str = """
+// Copy {n}: a class, a function and a loop over both.
+class Point{n} {{
+  init(x, y) {{
+    this.x = x;
+    this.y = y;
+  }}
+
+  add(other) {{
+    return Point{n}(this.x + other.x, this.y + other.y);
+  }}
+}}
+
+fun describe{n}(point) {{
+  if (point.x > point.y and point.x != 0) {{
+    return "wide " + "point";
+  }} else {{
+    return "tall " + "point";
+  }}
+}}
+
+var total{n} = 0;
+for (var i = 0; i < 2; i = i + 1) {{
+  var point = Point{n}(i, {n}).add(Point{n}(1.5, -2));
+  total{n} = total{n} + point.x * point.y / (1 + i);
+  describe{n}(point);
+}}
+"""
+
+  @staticmethod
+  def main(args: list[str]) -> None:
+    runs: int = Benchmark.RUNS
+    threshold: float = Benchmark.THRESHOLD
+    baselinePath: str = os.path.join(Benchmark.DIRECTORY, "baseline.json")
+    save: bool = False
+    names: list[str] = []
+    for arg in args:
+      if arg.startswith("--runs=") and arg[len("--runs="):].isdigit() and int(arg[len("--runs="):]) > 1:
+        runs = int(arg[len("--runs="):])
+      elif arg.startswith("--threshold="):
+        threshold = float(arg[len("--threshold="):])
+      elif arg.startswith("--baseline="):
+        baselinePath = arg[len("--baseline="):]
+      elif arg == "--save":
+        save = True
+      elif arg.startswith("--"):
+        Benchmark.__usage()
+      else:
+        names.append(arg)
+
+    available: list[str] = Benchmark.__available()
+    for name in names:
+      if name not in available:
+        print(f"Unknown benchmark '{name}'.", file=sys.stderr)
+        sys.exit(64)
+
+    baseline: dict = {}
+    if os.path.exists(baselinePath):
+      with open(baselinePath, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    regressions: list[str] = []
+    print(f"{'benchmark':<16} {'phase':<12} {'median ms':>11} {'stdev ms':>10} {'baseline ms':>12} {'change':>8}")
+    for name in names or available:
+      results[name] = Benchmark.__measure(Benchmark.__source(name), runs)
+      for phase, result in results[name].items():
+        before: dict[str, float] = baseline.get(name, {}).get(phase)
+        line: str = f"{name:<16} {phase:<12} {result['median']:>11.3f} {result['stdev']:>10.3f}"
+        if before is not None:
+          change: float = (result["median"] - before["median"]) * 100 / before["median"]
+          line += f" {before['median']:>12.3f} {change:>+7.1f}%"
+          # A phase only regresses when it slowed down by more than the
+          # threshold and by more than the noise of both measurements.
+          noise: float = max(2 * result["stdev"], 2 * before["stdev"], Benchmark.MIN_DIFFERENCE)
+          if change > threshold and result["median"] - before["median"] > noise:
+            line += "  REGRESSION"
+            regressions.append(f"{name} {phase}")
+        print(line)
+
+    if save:
+      baseline.update(results)
+      with open(baselinePath, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+      print(f"\nBaseline saved to {baselinePath}.")
+
+    if regressions:
+      print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+      sys.exit(1)
+
+  @staticmethod
+  def __usage() -> None:
+    print("Usage: Benchmark [--runs=N] [--threshold=PERCENT] [--baseline=FILE] [--save] [benchmark ...]", file=sys.stderr)
+    sys.exit(64)
+
+  @staticmethod
+  def __available() -> list[str]:
+    names: list[str] = [file[:-len(".lox")] for file in os.listdir(Benchmark.DIRECTORY) if file.endswith(".lox")]
+    return sorted(names) + [Benchmark.LARGE_FILE]
+
+  @staticmethod
+  def __source(name: str) -> str:
+    if name == Benchmark.LARGE_FILE:
+      return "".join(Benchmark.LARGE_FILE_CHUNK.format(n=n) for n in range(Benchmark.LARGE_FILE_COPIES))
+
+    with open(os.path.join(Benchmark.DIRECTORY, f"{name}.lox"), "r", encoding="utf-8") as file:
+      return file.read()
+
+  @staticmethod
+  def __measure(source: str, runs: int) -> dict[str, dict[str, float]]:
+    # One untimed run first, so imports and caches are warm.
+    Benchmark.__run(source)
+    samples: dict[str, list[float]] = {phase: [] for phase in Benchmark.PHASES + ["total"]}
+    for _ in range(runs):
+      times: dict[str, float] = Benchmark.__run(source)
+      for phase in Benchmark.PHASES:
+        samples[phase].append(times[phase])
+      samples["total"].append(sum(times.values()))
+
+    return {
+      phase: {"median": statistics.median(times) * 1000, "stdev": statistics.stdev(times) * 1000}
+      for phase, times in samples.items()
+    }
+
+  @staticmethod
+  def __run(source: str) -> dict[str, float]:
+    # The same pipeline as Lox.run, with each phase timed on its own. The
+    # program's output is discarded.
+    times: dict[str, float] = {}
+    start: float = time.perf_counter()
+    tokens: list[Token] = Scanner(source).scanTokens()
+    times["Scanner"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    statments: list[Stmt] = Parser(tokens).parse()
+    times["Parser"] = time.perf_counter() - start
+    if Lox.hadError:
+      sys.exit(65)
+
+    start = time.perf_counter()
+    Resolver().resolve(statments)
+    times["Resolver"] = time.perf_counter() - start
+    if Lox.hadError:
+      sys.exit(65)
+
+    start = time.perf_counter()
+    statments = Optimizer().optimize(statments)
+    times["Optimizer"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+      Interpreter().interpret(statments)
+    times["Interpreter"] = time.perf_counter() - start
+    if Lox.hadRuntimeError:
+      sys.exit(70)
+    return times
+
+if __name__ == "__main__":
+  Benchmark.main(sys.argv[1:])
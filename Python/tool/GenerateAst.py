@@ -13,23 +13,41 @@ class GenerateAst:
 
     outputDir: str = args[0]
     
+    # Fields after "|" are not constructor arguments. They start out as None,
+    # or as the value given after "=", and are filled in later, by the
+    # resolver or by the interpreter's inline caches and counters. Their
+    # types are only imported for type checkers, since most of them import
+    # the AST in turn.
     GenerateAst.__defineAst(outputDir, "Expr", [
-    "Assign   : Token name, Expr value",
-    "Binary   : Expr left, Token operator, Expr right",   
-    "Call     : Expr callee, Token paren, list[Expr] arguments",  
-    "Get      : Expr object, Token name",
+      "from .Token import Token"
+    ], [
+      "from .GlobalEnvironment import GlobalCell",
+      "from .LoxCallable import LoxCallable",
+      "from .LoxClass import LoxClass",
+      "from .LoxFunction import LoxFunction",
+      "from .Shape import Shape"
+    ], [
+    "Assign   : Token name, Expr value | int depth, int slot, GlobalCell cell",
+    "Binary   : Expr left, Token operator, Expr right | type operand, any operation, int hits = 0",
+    "Call     : Expr callee, Token paren, list[Expr] arguments | LoxCallable function, int hits = 0",
+    "Get      : Expr object, Token name | Shape shape, int index, LoxFunction method, dict shapes, int hits = 0",
     "Grouping : Expr expression",
     "Literal  : any value",
     "Logical  : Expr left, Token operator, Expr right",
-    "Set      : Expr object, Token name, Expr value",
-    "Super    : Token keyword, Token method",
-    "This     : Token keyword",
+    "Set      : Expr object, Token name, Expr value | Shape shape, int index, Shape transition",
+    "Super    : Token keyword, Token method | int depth, int slot, LoxClass superclass, LoxFunction function",
+    "This     : Token keyword | int depth, int slot",
     "Unary    : Token operator, Expr right",
-    "Variable : Token name"
+    "Variable : Token name | int depth, int slot, int hits = 0, GlobalCell cell"
     ])
     
     GenerateAst.__defineAst(outputDir, "Stmt", [
-      "Block : list[Stmt] statements",
+      "from .Token import Token",
+      "from .Expr import Expr, Variable"
+    ], [
+      "from .CountedLoop import CountedLoop"
+    ], [
+      "Block : list[Stmt] statements | bool declares, bool escapes",
       "Class : Token name, Variable superclass," + " list['Function'] methods",
       "Expression : Expr expression",
       "Function : Token name, list[Token] params," + " list[Stmt] body",
@@ -38,23 +56,30 @@ class GenerateAst:
       "Print : Expr expression",
       "Return : Token keyword, Expr value",
       "Var : Token name, Expr initializer",
-      "While : Expr condition, Stmt body"
+      "While : Expr condition, Stmt body | CountedLoop counted"
     ])
     
   @staticmethod
-  def __defineAst(outputDir: str, baseName: str, types: list[str]) -> None:
+  def __defineAst(outputDir: str, baseName: str, imports: list[str], typeImports: list[str], types: list[str]) -> None:
     path = os.path.join(outputDir, f"{baseName}.py")
 
     with open(path, "w", encoding="utf-8") as writer:
         writer.write("# This file is auto-generated by __defineAst.\n")
         writer.write("\n")
-        writer.write("from typing import Protocol, TypeVar\n")
-        writer.write("from Token import Token\n")
+        writer.write("from typing import TYPE_CHECKING, Protocol, TypeVar\n")
         writer.write("from abc import ABC, abstractmethod\n")
+        for line in imports:
+          writer.write(f"{line}\n")
+        writer.write("\n")
+        writer.write("if TYPE_CHECKING:\n")
+        for line in typeImports:
+          writer.write(f"    {line}\n")
         writer.write("\n")
         writer.write("R = TypeVar('R')\n\n")
         
         writer.write(f"class {baseName}(ABC):\n")
+        writer.write("    __slots__ = ()\n")
+        writer.write("\n")
         GenerateAst.__defineVisitor(writer, baseName, types)
         writer.write("    @abstractmethod\n")
         writer.write("    def accept(self, visitor: 'Expr.Visitor[R]') -> R:\n")
@@ -69,14 +94,23 @@ class GenerateAst:
   @staticmethod
   def __defineType(writer, baseName: str, className: str, fieldList: str) -> None:
     writer.write(f"class {className}({baseName}):\n")
+    fieldList, _, extraList = fieldList.partition("|")
     fields = [field.strip() for field in fieldList.split(", ")] 
+    extras = [field.strip() for field in extraList.split(", ") if field.strip()]
     constructor_args = ", ".join([f"{field.split(' ')[1]}: {field.split(' ')[0]}" for field in fields])
-          
+    slots = [f'"{field.split(" ")[1]}"' for field in fields + extras]
+    
+    writer.write(f"    __slots__ = ({', '.join(slots)}{',' if len(slots) == 1 else ''})\n")
+    writer.write("\n")
     writer.write(f"    def __init__(self, {constructor_args}) -> None:\n")
 
     for field in fields:
       name = field.split(" ")[1]
       writer.write(f"        self.{name} = {name}\n")
+    for field in extras:
+      field, _, default = field.partition(" = ")
+      type, name = field.split(" ")
+      writer.write(f"        self.{name}: {type} = {default or None}\n")
     writer.write("\n")
     
     writer.write("    def accept(self, visitor) -> R:\n")
@@ -90,7 +124,7 @@ class GenerateAst:
     for type in types:
       typeName: str = type.split(":")[0].strip()
       writer.write("       @abstractmethod\n")
-      writer.write(f"       def visit{typeName}{baseName}(self, {baseName.lower()}: 'Expr.{typeName}'):\n")
+      writer.write(f"       def visit{typeName}{baseName}(self, {baseName.lower()}: '{typeName}'):\n")
       writer.write("          pass\n")
       
     writer.write("\n")
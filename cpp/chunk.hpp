@@ -8,12 +8,46 @@
 enum OpCode
 {
   OP_CONSTANT,
+  OP_NIL,
+  OP_TRUE,
+  OP_FALSE,
+  OP_POP,
+  OP_GET_LOCAL,
+  OP_SET_LOCAL,
+  OP_GET_GLOBAL,
+  OP_DEFINE_GLOBAL,
+  OP_SET_GLOBAL,
+  OP_GET_UPVALUE,
+  OP_SET_UPVALUE,
+  OP_GET_PROPERTY,
+  OP_SET_PROPERTY,
+  OP_CHECK_INSTANCE,
+  OP_GET_SUPER,
+  OP_EQUAL,
+  OP_GREATER,
+  OP_GREATER_EQUAL,
+  OP_LESS,
+  OP_LESS_EQUAL,
   OP_ADD,
   OP_SUBTRACT,
   OP_MULTIPLY,
   OP_DIVIDE,
+  OP_NOT,
   OP_NEGATE,
+  OP_PRINT,
+  OP_JUMP,
+  OP_JUMP_IF_FALSE,
+  OP_LOOP,
+  OP_CALL,
+  OP_GET_METHOD,
+  OP_GET_SUPER_METHOD,
+  OP_CALL_METHOD,
+  OP_CLOSURE,
+  OP_CLOSE_UPVALUE,
   OP_RETURN,
+  OP_CLASS,
+  OP_INHERIT,
+  OP_METHOD,
 };
 
 class Chunk
@@ -32,4 +66,4 @@ private:
   ValueArray constants;
 };
 
-#endif
\ No newline at end of file
+#endif
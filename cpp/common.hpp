@@ -7,6 +7,14 @@
 #include <stddef.h>
 #include <stdint.h>
 
+constexpr bool DEBUG_PRINT_CODE = false;
+constexpr bool DEBUG_TRACE_EXECUTION = false;
+constexpr bool DEBUG_STRESS_GC = false;
+constexpr bool DEBUG_LOG_GC = false;
+
+constexpr int UINT8_COUNT = UINT8_MAX + 1;
+constexpr int UINT16_COUNT = UINT16_MAX + 1;
+
 void log(const std::string &message);
 
-#endif
\ No newline at end of file
+#endif
@@ -1,31 +1,1290 @@
 #include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unordered_map>
 #include "common.hpp"
 #include "compiler.hpp"
+#include "debug.hpp"
 #include "scanner.hpp"
+#include "vm.hpp"
 
-void compile(const std::string *source)
+enum Precedence
 {
-  Scanner scanner(*source);
+  PREC_NONE,
+  PREC_ASSIGNMENT,
+  PREC_OR,
+  PREC_AND,
+  PREC_EQUALITY,
+  PREC_COMPARISON,
+  PREC_TERM,
+  PREC_FACTOR,
+  PREC_UNARY,
+  PREC_CALL,
+  PREC_PRIMARY
+};
 
-  int line = -1;
+class Compiler;
+using ParseFn = void (Compiler::*)(bool canAssign);
 
+struct ParseRule
+{
+  ParseFn prefix;
+  ParseFn infix;
+  Precedence precedence;
+};
+
+struct Local
+{
+  std::string name;
+  int depth;
+  bool isCaptured;
+};
+
+struct Upvalue
+{
+  uint8_t index;
+  bool isLocal;
+};
+
+enum FunctionType
+{
+  TYPE_FUNCTION,
+  TYPE_INITIALIZER,
+  TYPE_METHOD,
+  TYPE_SCRIPT
+};
+
+struct FunctionState
+{
+  FunctionState *enclosing;
+  ObjFunction *function;
+  FunctionType type;
+  std::vector<Local> locals;
+  std::vector<Upvalue> upvalues;
+  int scopeDepth;
+  // Offset just past the last `this` load, so that `this.field = value`
+  // can skip the instance check the receiver is known to pass.
+  size_t thisEnd;
+  std::unordered_map<ObjString *, int> stringConstants;
+  std::unordered_map<uint64_t, int> numberConstants;
+};
+
+struct ClassState
+{
+  ClassState *enclosing;
+  bool hasSuperclass;
+};
+
+class Compiler
+{
+public:
+  Compiler(VM &vm, const std::string &source);
+
+  ObjFunction *compile();
+
+  void grouping(bool canAssign);
+  void call(bool canAssign);
+  void dot(bool canAssign);
+  void unary(bool canAssign);
+  void binary(bool canAssign);
+  void number(bool canAssign);
+  void string(bool canAssign);
+  void literal(bool canAssign);
+  void variable(bool canAssign);
+  void super_(bool canAssign);
+  void this_(bool canAssign);
+  void and_(bool canAssign);
+  void or_(bool canAssign);
+
+private:
+  Chunk &currentChunk();
+
+  void errorAt(const Token &token, const std::string &message);
+  void error(const std::string &message);
+  void errorAtCurrent(const std::string &message);
+
+  void advance();
+  void consume(TokenType type, const std::string &message);
+  bool check(TokenType type) const;
+  bool match(TokenType type);
+
+  void emitByte(uint8_t byte);
+  void emitByte(uint8_t byte, int line);
+  void emitBytes(uint8_t byte1, uint8_t byte2);
+  void emitShort(uint16_t value);
+  void emitShort(uint16_t value, int line);
+  void emitLoop(size_t loopStart);
+  size_t emitJump(uint8_t instruction);
+  void emitReturn();
+  uint16_t makeConstant(Value value);
+  void emitConstant(Value value);
+  void patchJump(size_t offset);
+
+  void beginFunction(FunctionState &state, FunctionType type);
+  ObjFunction *endFunction();
+  void beginScope();
+  void endScope();
+
+  void expression();
+  void statement();
+  void declaration();
+  void block();
+  void function(FunctionType type);
+  void method();
+  void classDeclaration();
+  void funDeclaration();
+  void varDeclaration();
+  void expressionStatement();
+  void forStatement();
+  void ifStatement();
+  void printStatement();
+  void returnStatement();
+  void whileStatement();
+  void synchronize();
+
+  void parsePrecedence(Precedence precedence);
+  uint16_t identifierConstant(const Token &name);
+  int resolveLocal(FunctionState *state, const Token &name);
+  int addUpvalue(FunctionState *state, uint8_t index, bool isLocal);
+  int resolveUpvalue(FunctionState *state, const Token &name);
+  void addLocal(const Token &name);
+  void declareVariable();
+  uint16_t parseVariable(const std::string &message);
+  void markInitialized();
+  void defineVariable(uint16_t global);
+  uint8_t argumentList();
+  void namedVariable(const Token &name, bool canAssign);
+  Token syntheticToken(const char *text) const;
+
+  static const ParseRule &getRule(TokenType type);
+
+  VM &vm;
+  std::vector<Token> tokens;
+  size_t next;
+  Token current;
+  Token previous;
+  bool hadError;
+  bool panicMode;
+  FunctionState *state;
+  ClassState *classState;
+};
+
+Compiler::Compiler(VM &vm, const std::string &source)
+    : vm(vm), next(0), current(TokenType::TOKEN_EOF, "", 1), previous(TokenType::TOKEN_EOF, "", 1),
+      hadError(false), panicMode(false), state(nullptr), classState(nullptr)
+{
+  // Scan everything up front, as the Python front end does, so lexical
+  // errors are all reported before any syntax error.
+  Scanner scanner(source);
   while (true)
   {
     Token token = scanner.scanToken();
+    if (token.type == TokenType::TOKEN_ERROR)
+    {
+      errorAt(token, token.lexeme);
+      panicMode = false;
+      continue;
+    }
+
+    tokens.push_back(token);
+    if (token.type == TokenType::TOKEN_EOF)
+      break;
+  }
+}
+
+Chunk &Compiler::currentChunk()
+{
+  return state->function->chunk;
+}
+
+void Compiler::errorAt(const Token &token, const std::string &message)
+{
+  if (panicMode)
+    return;
+  panicMode = true;
+
+  std::string where;
+  if (token.type == TokenType::TOKEN_EOF)
+  {
+    where = " at end";
+  }
+  else if (token.type != TokenType::TOKEN_ERROR)
+  {
+    where = " at '" + token.lexeme + "'";
+  }
+
+  vm.writeError("[line " + std::to_string(token.line) + "] Error " + where + ": " + message + "\n");
+  hadError = true;
+}
+
+void Compiler::error(const std::string &message)
+{
+  errorAt(previous, message);
+}
+
+void Compiler::errorAtCurrent(const std::string &message)
+{
+  errorAt(current, message);
+}
+
+void Compiler::advance()
+{
+  previous = current;
+  current = tokens[next];
+  if (next + 1 < tokens.size())
+    next++;
+}
+
+void Compiler::consume(TokenType type, const std::string &message)
+{
+  if (current.type == type)
+  {
+    advance();
+    return;
+  }
+
+  errorAtCurrent(message);
+}
+
+bool Compiler::check(TokenType type) const
+{
+  return current.type == type;
+}
+
+bool Compiler::match(TokenType type)
+{
+  if (!check(type))
+    return false;
+  advance();
+  return true;
+}
+
+void Compiler::emitByte(uint8_t byte)
+{
+  currentChunk().writeChunk(byte, previous.line);
+}
+
+void Compiler::emitByte(uint8_t byte, int line)
+{
+  currentChunk().writeChunk(byte, line);
+}
+
+void Compiler::emitBytes(uint8_t byte1, uint8_t byte2)
+{
+  emitByte(byte1);
+  emitByte(byte2);
+}
+
+void Compiler::emitShort(uint16_t value)
+{
+  emitShort(value, previous.line);
+}
+
+void Compiler::emitShort(uint16_t value, int line)
+{
+  emitByte((value >> 8) & 0xff, line);
+  emitByte(value & 0xff, line);
+}
+
+void Compiler::emitLoop(size_t loopStart)
+{
+  emitByte(OP_LOOP);
+
+  size_t offset = currentChunk().getCode().size() - loopStart + 2;
+  if (offset > UINT16_MAX)
+    error("Loop body too large.");
+
+  emitShort(static_cast<uint16_t>(offset));
+}
+
+size_t Compiler::emitJump(uint8_t instruction)
+{
+  emitByte(instruction);
+  emitByte(0xff);
+  emitByte(0xff);
+  return currentChunk().getCode().size() - 2;
+}
+
+void Compiler::emitReturn()
+{
+  if (state->type == TYPE_INITIALIZER)
+  {
+    emitBytes(OP_GET_LOCAL, 0);
+  }
+  else
+  {
+    emitByte(OP_NIL);
+  }
+
+  emitByte(OP_RETURN);
+}
+
+uint16_t Compiler::makeConstant(Value value)
+{
+  if (isString(value))
+  {
+    auto found = state->stringConstants.find(asString(value));
+    if (found != state->stringConstants.end())
+      return found->second;
+  }
+  else if (value.isNumber())
+  {
+    uint64_t bits;
+    double number = value.asNumber();
+    memcpy(&bits, &number, sizeof(bits));
+    auto found = state->numberConstants.find(bits);
+    if (found != state->numberConstants.end())
+      return found->second;
+  }
+
+  int constant = currentChunk().addConstant(value);
+  if (constant > UINT16_MAX)
+  {
+    error("Too many constants in one chunk.");
+    return 0;
+  }
+
+  if (isString(value))
+  {
+    state->stringConstants[asString(value)] = constant;
+  }
+  else if (value.isNumber())
+  {
+    uint64_t bits;
+    double number = value.asNumber();
+    memcpy(&bits, &number, sizeof(bits));
+    state->numberConstants[bits] = constant;
+  }
+
+  return static_cast<uint16_t>(constant);
+}
+
+void Compiler::emitConstant(Value value)
+{
+  uint16_t constant = makeConstant(value);
+  emitByte(OP_CONSTANT);
+  emitShort(constant);
+}
+
+void Compiler::patchJump(size_t offset)
+{
+  std::vector<uint8_t> &code = currentChunk().getCode();
+  size_t jump = code.size() - offset - 2;
+
+  if (jump > UINT16_MAX)
+    error("Too much code to jump over.");
+
+  code[offset] = (jump >> 8) & 0xff;
+  code[offset + 1] = jump & 0xff;
+}
+
+void Compiler::beginFunction(FunctionState &newState, FunctionType type)
+{
+  newState.enclosing = state;
+  newState.function = nullptr;
+  newState.type = type;
+  newState.scopeDepth = 0;
+  newState.thisEnd = SIZE_MAX;
+  newState.function = vm.newFunction();
+  vm.compilerRoots.push_back(newState.function);
+  state = &newState;
+
+  if (type != TYPE_SCRIPT)
+  {
+    state->function->name = vm.copyString(previous.lexeme.data(), previous.lexeme.size());
+  }
+
+  state->locals.push_back(Local{type != TYPE_FUNCTION ? "this" : "", 0, false});
+}
+
+ObjFunction *Compiler::endFunction()
+{
+  emitReturn();
+  ObjFunction *function = state->function;
+
+  if constexpr (DEBUG_PRINT_CODE)
+  {
+    if (!hadError)
+    {
+      Disassembler disassembler;
+      disassembler.disassembleChunk(currentChunk(), function->name != nullptr ? function->name->chars : "<script>");
+    }
+  }
+
+  state = state->enclosing;
+  vm.compilerRoots.pop_back();
+  return function;
+}
+
+void Compiler::beginScope()
+{
+  state->scopeDepth++;
+}
 
-    if (token.line != line)
+void Compiler::endScope()
+{
+  state->scopeDepth--;
+
+  while (!state->locals.empty() && state->locals.back().depth > state->scopeDepth)
+  {
+    if (state->locals.back().isCaptured)
     {
-      std::cout << token.line << " ";
-      line = token.line;
+      emitByte(OP_CLOSE_UPVALUE);
     }
     else
     {
-      std::cout << " | ";
+      emitByte(OP_POP);
     }
+    state->locals.pop_back();
+  }
+}
 
-    std::cout << static_cast<int>(token.type) << " '" << token.lexeme << "'\n";
+uint16_t Compiler::identifierConstant(const Token &name)
+{
+  return makeConstant(Value::object(vm.copyString(name.lexeme.data(), name.lexeme.size())));
+}
 
-    if (token.type == TokenType::TOKEN_EOF)
+int Compiler::resolveLocal(FunctionState *functionState, const Token &name)
+{
+  for (int i = static_cast<int>(functionState->locals.size()) - 1; i >= 0; i--)
+  {
+    const Local &local = functionState->locals[i];
+    if (name.lexeme == local.name)
+    {
+      if (local.depth == -1)
+      {
+        error("Can't read local variable in its own initializer.");
+      }
+      return i;
+    }
+  }
+
+  return -1;
+}
+
+int Compiler::addUpvalue(FunctionState *functionState, uint8_t index, bool isLocal)
+{
+  std::vector<Upvalue> &upvalues = functionState->upvalues;
+  for (size_t i = 0; i < upvalues.size(); i++)
+  {
+    if (upvalues[i].index == index && upvalues[i].isLocal == isLocal)
+    {
+      return static_cast<int>(i);
+    }
+  }
+
+  if (upvalues.size() == UINT8_COUNT)
+  {
+    error("Too many closure variables in function.");
+    return 0;
+  }
+
+  upvalues.push_back(Upvalue{index, isLocal});
+  functionState->function->upvalueCount = static_cast<int>(upvalues.size());
+  return static_cast<int>(upvalues.size()) - 1;
+}
+
+int Compiler::resolveUpvalue(FunctionState *functionState, const Token &name)
+{
+  if (functionState->enclosing == nullptr)
+    return -1;
+
+  int local = resolveLocal(functionState->enclosing, name);
+  if (local != -1)
+  {
+    functionState->enclosing->locals[local].isCaptured = true;
+    return addUpvalue(functionState, static_cast<uint8_t>(local), true);
+  }
+
+  int upvalue = resolveUpvalue(functionState->enclosing, name);
+  if (upvalue != -1)
+  {
+    return addUpvalue(functionState, static_cast<uint8_t>(upvalue), false);
+  }
+
+  return -1;
+}
+
+void Compiler::addLocal(const Token &name)
+{
+  if (state->locals.size() == UINT8_COUNT)
+  {
+    error("Too many local variables in function.");
+    return;
+  }
+
+  state->locals.push_back(Local{name.lexeme, -1, false});
+}
+
+void Compiler::declareVariable()
+{
+  if (state->scopeDepth == 0)
+    return;
+
+  const Token &name = previous;
+  for (int i = static_cast<int>(state->locals.size()) - 1; i >= 0; i--)
+  {
+    const Local &local = state->locals[i];
+    if (local.depth != -1 && local.depth < state->scopeDepth)
+    {
       break;
+    }
+
+    if (name.lexeme == local.name)
+    {
+      error("Already variable with this name in this scope.");
+    }
+  }
+
+  addLocal(name);
+}
+
+uint16_t Compiler::parseVariable(const std::string &message)
+{
+  consume(TokenType::TOKEN_IDENTIFIER, message);
+
+  declareVariable();
+  if (state->scopeDepth > 0)
+    return 0;
+
+  return identifierConstant(previous);
+}
+
+void Compiler::markInitialized()
+{
+  if (state->scopeDepth == 0)
+    return;
+  state->locals.back().depth = state->scopeDepth;
+}
+
+void Compiler::defineVariable(uint16_t global)
+{
+  if (state->scopeDepth > 0)
+  {
+    markInitialized();
+    return;
+  }
+
+  emitByte(OP_DEFINE_GLOBAL);
+  emitShort(global);
+}
+
+uint8_t Compiler::argumentList()
+{
+  uint8_t argCount = 0;
+  if (!check(TokenType::TOKEN_RIGHT_PAREN))
+  {
+    do
+    {
+      expression();
+      if (argCount == 255)
+      {
+        error("Can't have more than 255 arguments.");
+      }
+      argCount++;
+    } while (match(TokenType::TOKEN_COMMA));
+  }
+
+  consume(TokenType::TOKEN_RIGHT_PAREN, "Expect ')' after arguments.");
+  return argCount;
+}
+
+void Compiler::and_(bool canAssign)
+{
+  size_t endJump = emitJump(OP_JUMP_IF_FALSE);
+
+  emitByte(OP_POP);
+  parsePrecedence(PREC_AND);
+
+  patchJump(endJump);
+}
+
+void Compiler::or_(bool canAssign)
+{
+  size_t elseJump = emitJump(OP_JUMP_IF_FALSE);
+  size_t endJump = emitJump(OP_JUMP);
+
+  patchJump(elseJump);
+  emitByte(OP_POP);
+
+  parsePrecedence(PREC_OR);
+  patchJump(endJump);
+}
+
+void Compiler::binary(bool canAssign)
+{
+  TokenType operatorType = previous.type;
+  int line = previous.line;
+  const ParseRule &rule = getRule(operatorType);
+  parsePrecedence(static_cast<Precedence>(rule.precedence + 1));
+
+  switch (operatorType)
+  {
+  case TokenType::TOKEN_BANG_EQUAL:
+    emitBytes(OP_EQUAL, OP_NOT);
+    break;
+  case TokenType::TOKEN_EQUAL_EQUAL:
+    emitByte(OP_EQUAL);
+    break;
+  case TokenType::TOKEN_GREATER:
+    emitByte(OP_GREATER, line);
+    break;
+  case TokenType::TOKEN_GREATER_EQUAL:
+    emitByte(OP_GREATER_EQUAL, line);
+    break;
+  case TokenType::TOKEN_LESS:
+    emitByte(OP_LESS, line);
+    break;
+  case TokenType::TOKEN_LESS_EQUAL:
+    emitByte(OP_LESS_EQUAL, line);
+    break;
+  case TokenType::TOKEN_PLUS:
+    emitByte(OP_ADD, line);
+    break;
+  case TokenType::TOKEN_MINUS:
+    emitByte(OP_SUBTRACT, line);
+    break;
+  case TokenType::TOKEN_STAR:
+    emitByte(OP_MULTIPLY, line);
+    break;
+  case TokenType::TOKEN_SLASH:
+    emitByte(OP_DIVIDE, line);
+    break;
+  default:
+    return;
+  }
+}
+
+void Compiler::call(bool canAssign)
+{
+  uint8_t argCount = argumentList();
+  emitBytes(OP_CALL, argCount);
+}
+
+void Compiler::dot(bool canAssign)
+{
+  bool receiverIsThis = state->thisEnd == currentChunk().getCode().size();
+  consume(TokenType::TOKEN_IDENTIFIER, "Expect property name after '.'.");
+  uint16_t name = identifierConstant(previous);
+  int line = previous.line;
+
+  if (canAssign && match(TokenType::TOKEN_EQUAL))
+  {
+    if (!receiverIsThis)
+    {
+      emitByte(OP_CHECK_INSTANCE, line);
+    }
+    expression();
+    emitByte(OP_SET_PROPERTY, line);
+    emitShort(name, line);
   }
-}
\ No newline at end of file
+  else if (match(TokenType::TOKEN_LEFT_PAREN))
+  {
+    emitByte(OP_GET_METHOD, line);
+    emitShort(name, line);
+    uint8_t argCount = argumentList();
+    emitBytes(OP_CALL_METHOD, argCount);
+  }
+  else
+  {
+    emitByte(OP_GET_PROPERTY, line);
+    emitShort(name, line);
+  }
+}
+
+void Compiler::literal(bool canAssign)
+{
+  switch (previous.type)
+  {
+  case TokenType::TOKEN_FALSE:
+    emitByte(OP_FALSE);
+    break;
+  case TokenType::TOKEN_NIL:
+    emitByte(OP_NIL);
+    break;
+  case TokenType::TOKEN_TRUE:
+    emitByte(OP_TRUE);
+    break;
+  default:
+    return;
+  }
+}
+
+void Compiler::grouping(bool canAssign)
+{
+  expression();
+  consume(TokenType::TOKEN_RIGHT_PAREN, "Expect ')' after expression.");
+}
+
+void Compiler::number(bool canAssign)
+{
+  double value = strtod(previous.lexeme.c_str(), nullptr);
+  emitConstant(Value::number(value));
+}
+
+void Compiler::string(bool canAssign)
+{
+  emitConstant(Value::object(vm.copyString(previous.lexeme.data() + 1, previous.lexeme.size() - 2)));
+}
+
+void Compiler::namedVariable(const Token &name, bool canAssign)
+{
+  uint8_t getOp, setOp;
+  int arg = resolveLocal(state, name);
+  bool isGlobal = false;
+  if (arg != -1)
+  {
+    getOp = OP_GET_LOCAL;
+    setOp = OP_SET_LOCAL;
+  }
+  else if ((arg = resolveUpvalue(state, name)) != -1)
+  {
+    getOp = OP_GET_UPVALUE;
+    setOp = OP_SET_UPVALUE;
+  }
+  else
+  {
+    arg = identifierConstant(name);
+    getOp = OP_GET_GLOBAL;
+    setOp = OP_SET_GLOBAL;
+    isGlobal = true;
+  }
+
+  uint8_t op = getOp;
+  int line = name.line;
+  if (canAssign && match(TokenType::TOKEN_EQUAL))
+  {
+    expression();
+    op = setOp;
+  }
+
+  emitByte(op, line);
+  if (isGlobal)
+  {
+    emitShort(static_cast<uint16_t>(arg), line);
+  }
+  else
+  {
+    emitByte(static_cast<uint8_t>(arg), line);
+  }
+}
+
+void Compiler::variable(bool canAssign)
+{
+  namedVariable(previous, canAssign);
+}
+
+Token Compiler::syntheticToken(const char *text) const
+{
+  return Token(TokenType::TOKEN_IDENTIFIER, text, previous.line);
+}
+
+void Compiler::super_(bool canAssign)
+{
+  if (classState == nullptr)
+  {
+    error("Can't use 'super' outside of a class.");
+  }
+  else if (!classState->hasSuperclass)
+  {
+    error("Can't use 'super' in a class with no superclass.");
+  }
+
+  consume(TokenType::TOKEN_DOT, "Expect '.' after 'super'.");
+  consume(TokenType::TOKEN_IDENTIFIER, "Expect superclass method name.");
+  uint16_t name = identifierConstant(previous);
+  int line = previous.line;
+
+  namedVariable(syntheticToken("this"), false);
+  namedVariable(syntheticToken("super"), false);
+  if (match(TokenType::TOKEN_LEFT_PAREN))
+  {
+    emitByte(OP_GET_SUPER_METHOD, line);
+    emitShort(name, line);
+    uint8_t argCount = argumentList();
+    emitBytes(OP_CALL_METHOD, argCount);
+  }
+  else
+  {
+    emitByte(OP_GET_SUPER, line);
+    emitShort(name, line);
+  }
+}
+
+void Compiler::this_(bool canAssign)
+{
+  if (classState == nullptr)
+  {
+    error("Can't use 'this' outside of a class.");
+    return;
+  }
+
+  variable(false);
+  state->thisEnd = currentChunk().getCode().size();
+}
+
+void Compiler::unary(bool canAssign)
+{
+  TokenType operatorType = previous.type;
+  int line = previous.line;
+
+  parsePrecedence(PREC_UNARY);
+
+  switch (operatorType)
+  {
+  case TokenType::TOKEN_BANG:
+    emitByte(OP_NOT);
+    break;
+  case TokenType::TOKEN_MINUS:
+    emitByte(OP_NEGATE, line);
+    break;
+  default:
+    return;
+  }
+}
+
+const ParseRule &Compiler::getRule(TokenType type)
+{
+  static const ParseRule rules[] = {
+      {&Compiler::grouping, &Compiler::call, PREC_CALL},  // TOKEN_LEFT_PAREN
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_RIGHT_PAREN
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_LEFT_BRACE
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_RIGHT_BRACE
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_COMMA
+      {nullptr, &Compiler::dot, PREC_CALL},               // TOKEN_DOT
+      {&Compiler::unary, &Compiler::binary, PREC_TERM},   // TOKEN_MINUS
+      {nullptr, &Compiler::binary, PREC_TERM},            // TOKEN_PLUS
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_SEMICOLON
+      {nullptr, &Compiler::binary, PREC_FACTOR},          // TOKEN_SLASH
+      {nullptr, &Compiler::binary, PREC_FACTOR},          // TOKEN_STAR
+      {&Compiler::unary, nullptr, PREC_NONE},             // TOKEN_BANG
+      {nullptr, &Compiler::binary, PREC_EQUALITY},        // TOKEN_BANG_EQUAL
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_EQUAL
+      {nullptr, &Compiler::binary, PREC_EQUALITY},        // TOKEN_EQUAL_EQUAL
+      {nullptr, &Compiler::binary, PREC_COMPARISON},      // TOKEN_GREATER
+      {nullptr, &Compiler::binary, PREC_COMPARISON},      // TOKEN_GREATER_EQUAL
+      {nullptr, &Compiler::binary, PREC_COMPARISON},      // TOKEN_LESS
+      {nullptr, &Compiler::binary, PREC_COMPARISON},      // TOKEN_LESS_EQUAL
+      {&Compiler::variable, nullptr, PREC_NONE},          // TOKEN_IDENTIFIER
+      {&Compiler::string, nullptr, PREC_NONE},            // TOKEN_STRING
+      {&Compiler::number, nullptr, PREC_NONE},            // TOKEN_NUMBER
+      {nullptr, &Compiler::and_, PREC_AND},               // TOKEN_AND
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_CLASS
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_ELSE
+      {&Compiler::literal, nullptr, PREC_NONE},           // TOKEN_FALSE
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_FOR
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_FUN
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_IF
+      {&Compiler::literal, nullptr, PREC_NONE},           // TOKEN_NIL
+      {nullptr, &Compiler::or_, PREC_OR},                 // TOKEN_OR
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_PRINT
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_RETURN
+      {&Compiler::super_, nullptr, PREC_NONE},            // TOKEN_SUPER
+      {&Compiler::this_, nullptr, PREC_NONE},             // TOKEN_THIS
+      {&Compiler::literal, nullptr, PREC_NONE},           // TOKEN_TRUE
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_VAR
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_WHILE
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_ERROR
+      {nullptr, nullptr, PREC_NONE},                      // TOKEN_EOF
+  };
+
+  return rules[static_cast<int>(type)];
+}
+
+void Compiler::parsePrecedence(Precedence precedence)
+{
+  advance();
+  ParseFn prefixRule = getRule(previous.type).prefix;
+  if (prefixRule == nullptr)
+  {
+    error("Expect expression.");
+    return;
+  }
+
+  bool canAssign = precedence <= PREC_ASSIGNMENT;
+  (this->*prefixRule)(canAssign);
+
+  while (precedence <= getRule(current.type).precedence)
+  {
+    advance();
+    ParseFn infixRule = getRule(previous.type).infix;
+    (this->*infixRule)(canAssign);
+  }
+
+  if (canAssign && match(TokenType::TOKEN_EQUAL))
+  {
+    error("Invalid assignment target.");
+  }
+}
+
+void Compiler::expression()
+{
+  parsePrecedence(PREC_ASSIGNMENT);
+}
+
+void Compiler::block()
+{
+  while (!check(TokenType::TOKEN_RIGHT_BRACE) && !check(TokenType::TOKEN_EOF))
+  {
+    declaration();
+  }
+
+  consume(TokenType::TOKEN_RIGHT_BRACE, "Expect '}' after block.");
+}
+
+void Compiler::function(FunctionType type)
+{
+  const char *kind = type == TYPE_FUNCTION ? "function" : "method";
+  FunctionState functionState;
+  beginFunction(functionState, type);
+  beginScope();
+
+  consume(TokenType::TOKEN_LEFT_PAREN, std::string("Expect '(' after ") + kind + " name.");
+  if (!check(TokenType::TOKEN_RIGHT_PAREN))
+  {
+    do
+    {
+      state->function->arity++;
+      if (state->function->arity > 255)
+      {
+        errorAtCurrent("Can't have more than 255 parameters.");
+      }
+      uint16_t constant = parseVariable("Expect parameter name.");
+      defineVariable(constant);
+    } while (match(TokenType::TOKEN_COMMA));
+  }
+  consume(TokenType::TOKEN_RIGHT_PAREN, "Expect ')' after parameters.");
+  consume(TokenType::TOKEN_LEFT_BRACE, std::string("Expect '{' before ") + kind + " body.");
+  block();
+
+  ObjFunction *function = endFunction();
+  emitByte(OP_CLOSURE);
+  emitShort(makeConstant(Value::object(function)));
+
+  for (const Upvalue &upvalue : functionState.upvalues)
+  {
+    emitByte(upvalue.isLocal ? 1 : 0);
+    emitByte(upvalue.index);
+  }
+}
+
+void Compiler::method()
+{
+  consume(TokenType::TOKEN_IDENTIFIER, "Expect method name.");
+  uint16_t constant = identifierConstant(previous);
+
+  FunctionType type = TYPE_METHOD;
+  if (previous.lexeme == "init")
+  {
+    type = TYPE_INITIALIZER;
+  }
+
+  function(type);
+  emitByte(OP_METHOD);
+  emitShort(constant);
+}
+
+void Compiler::classDeclaration()
+{
+  consume(TokenType::TOKEN_IDENTIFIER, "Expect class name.");
+  Token className = previous;
+  uint16_t nameConstant = identifierConstant(previous);
+  declareVariable();
+
+  emitByte(OP_CLASS);
+  emitShort(nameConstant);
+  defineVariable(nameConstant);
+
+  ClassState currentClass{classState, false};
+  classState = &currentClass;
+
+  if (match(TokenType::TOKEN_LESS))
+  {
+    consume(TokenType::TOKEN_IDENTIFIER, "Expect superclass name.");
+    variable(false);
+
+    if (className.lexeme == previous.lexeme)
+    {
+      error("A class can't inherit from itself.");
+    }
+
+    beginScope();
+    addLocal(syntheticToken("super"));
+    defineVariable(0);
+
+    namedVariable(className, false);
+    emitByte(OP_INHERIT);
+    currentClass.hasSuperclass = true;
+  }
+
+  namedVariable(className, false);
+  consume(TokenType::TOKEN_LEFT_BRACE, "Expect '{' before class body.");
+  while (!check(TokenType::TOKEN_RIGHT_BRACE) && !check(TokenType::TOKEN_EOF))
+  {
+    method();
+  }
+  consume(TokenType::TOKEN_RIGHT_BRACE, "Expect '}' after class body.");
+  emitByte(OP_POP);
+
+  if (currentClass.hasSuperclass)
+  {
+    endScope();
+  }
+
+  classState = classState->enclosing;
+}
+
+void Compiler::funDeclaration()
+{
+  uint16_t global = parseVariable("Expect function name.");
+  markInitialized();
+  function(TYPE_FUNCTION);
+  defineVariable(global);
+}
+
+void Compiler::varDeclaration()
+{
+  uint16_t global = parseVariable("Expect variable name.");
+
+  if (match(TokenType::TOKEN_EQUAL))
+  {
+    expression();
+  }
+  else
+  {
+    emitByte(OP_NIL);
+  }
+  consume(TokenType::TOKEN_SEMICOLON, "Expect ';' after value.");
+
+  defineVariable(global);
+}
+
+void Compiler::expressionStatement()
+{
+  expression();
+  consume(TokenType::TOKEN_SEMICOLON, "Expect ';' after expression");
+  emitByte(OP_POP);
+}
+
+void Compiler::forStatement()
+{
+  beginScope();
+  consume(TokenType::TOKEN_LEFT_PAREN, "Expect '(' after 'for'.");
+  if (match(TokenType::TOKEN_SEMICOLON))
+  {
+  }
+  else if (match(TokenType::TOKEN_VAR))
+  {
+    varDeclaration();
+  }
+  else
+  {
+    expressionStatement();
+  }
+
+  size_t loopStart = currentChunk().getCode().size();
+  size_t exitJump = SIZE_MAX;
+  if (!match(TokenType::TOKEN_SEMICOLON))
+  {
+    expression();
+    consume(TokenType::TOKEN_SEMICOLON, "Expect ';' after loop condion.");
+
+    exitJump = emitJump(OP_JUMP_IF_FALSE);
+    emitByte(OP_POP);
+  }
+
+  if (!match(TokenType::TOKEN_RIGHT_PAREN))
+  {
+    size_t bodyJump = emitJump(OP_JUMP);
+    size_t incrementStart = currentChunk().getCode().size();
+    expression();
+    emitByte(OP_POP);
+    consume(TokenType::TOKEN_RIGHT_PAREN, "Expect ')' after for clauses.");
+
+    emitLoop(loopStart);
+    loopStart = incrementStart;
+    patchJump(bodyJump);
+  }
+
+  statement();
+  emitLoop(loopStart);
+
+  if (exitJump != SIZE_MAX)
+  {
+    patchJump(exitJump);
+    emitByte(OP_POP);
+  }
+
+  endScope();
+}
+
+void Compiler::ifStatement()
+{
+  consume(TokenType::TOKEN_LEFT_PAREN, "Expect '(' after 'if'.");
+  expression();
+  consume(TokenType::TOKEN_RIGHT_PAREN, "Expect ')' after if condition.");
+
+  size_t thenJump = emitJump(OP_JUMP_IF_FALSE);
+  emitByte(OP_POP);
+  statement();
+
+  size_t elseJump = emitJump(OP_JUMP);
+
+  patchJump(thenJump);
+  emitByte(OP_POP);
+
+  if (match(TokenType::TOKEN_ELSE))
+    statement();
+  patchJump(elseJump);
+}
+
+void Compiler::printStatement()
+{
+  expression();
+  consume(TokenType::TOKEN_SEMICOLON, "Expect ';' after value.");
+  emitByte(OP_PRINT);
+}
+
+void Compiler::returnStatement()
+{
+  if (state->type == TYPE_SCRIPT)
+  {
+    error("Can't return from top-level code.");
+  }
+
+  if (match(TokenType::TOKEN_SEMICOLON))
+  {
+    emitReturn();
+  }
+  else
+  {
+    if (state->type == TYPE_INITIALIZER)
+    {
+      error("Can't return a value from an initializer.");
+    }
+
+    expression();
+    consume(TokenType::TOKEN_SEMICOLON, "Expect ';' after return value.");
+    emitByte(OP_RETURN);
+  }
+}
+
+void Compiler::whileStatement()
+{
+  size_t loopStart = currentChunk().getCode().size();
+  consume(TokenType::TOKEN_LEFT_PAREN, "Expect '(' after 'while'.");
+  expression();
+  consume(TokenType::TOKEN_RIGHT_PAREN, "Expect ')' after condition.");
+
+  size_t exitJump = emitJump(OP_JUMP_IF_FALSE);
+  emitByte(OP_POP);
+  statement();
+  emitLoop(loopStart);
+
+  patchJump(exitJump);
+  emitByte(OP_POP);
+}
+
+void Compiler::synchronize()
+{
+  panicMode = false;
+
+  while (current.type != TokenType::TOKEN_EOF)
+  {
+    if (previous.type == TokenType::TOKEN_SEMICOLON)
+      return;
+    switch (current.type)
+    {
+    case TokenType::TOKEN_CLASS:
+    case TokenType::TOKEN_FUN:
+    case TokenType::TOKEN_VAR:
+    case TokenType::TOKEN_FOR:
+    case TokenType::TOKEN_IF:
+    case TokenType::TOKEN_WHILE:
+    case TokenType::TOKEN_PRINT:
+    case TokenType::TOKEN_RETURN:
+      return;
+    default:;
+    }
+
+    advance();
+  }
+}
+
+void Compiler::declaration()
+{
+  if (match(TokenType::TOKEN_CLASS))
+  {
+    classDeclaration();
+  }
+  else if (match(TokenType::TOKEN_FUN))
+  {
+    funDeclaration();
+  }
+  else if (match(TokenType::TOKEN_VAR))
+  {
+    varDeclaration();
+  }
+  else
+  {
+    statement();
+  }
+
+  if (panicMode)
+    synchronize();
+}
+
+void Compiler::statement()
+{
+  if (match(TokenType::TOKEN_PRINT))
+  {
+    printStatement();
+  }
+  else if (match(TokenType::TOKEN_FOR))
+  {
+    forStatement();
+  }
+  else if (match(TokenType::TOKEN_IF))
+  {
+    ifStatement();
+  }
+  else if (match(TokenType::TOKEN_RETURN))
+  {
+    returnStatement();
+  }
+  else if (match(TokenType::TOKEN_WHILE))
+  {
+    whileStatement();
+  }
+  else if (match(TokenType::TOKEN_LEFT_BRACE))
+  {
+    beginScope();
+    block();
+    endScope();
+  }
+  else
+  {
+    expressionStatement();
+  }
+}
+
+ObjFunction *Compiler::compile()
+{
+  FunctionState scriptState;
+  beginFunction(scriptState, TYPE_SCRIPT);
+
+  advance();
+  while (!match(TokenType::TOKEN_EOF))
+  {
+    declaration();
+  }
+
+  ObjFunction *function = endFunction();
+  return hadError ? nullptr : function;
+}
+
+ObjFunction *compile(VM &vm, const std::string &source)
+{
+  Compiler compiler(vm, source);
+  return compiler.compile();
+}
@@ -1,8 +1,11 @@
 #ifndef clox_compiler_hpp
 #define clox_compiler_hpp
 
+#include "object.hpp"
 #include <iostream>
 
-void compile(const std::string *source);
+class VM;
 
-#endif
\ No newline at end of file
+ObjFunction *compile(VM &vm, const std::string &source);
+
+#endif
@@ -1,11 +1,12 @@
 #include "debug.hpp"
+#include "object.hpp"
 
 void Disassembler::disassembleChunk(Chunk &chunk, const std::string &name)
 {
   std::cout << "== " << name << " ==\n";
   const std::vector<uint8_t> &code = chunk.getCode();
   int offset = 0;
-  while (offset < code.size())
+  while (offset < static_cast<int>(code.size()))
   {
     offset = disassembleInstruction(chunk, offset);
   }
@@ -33,6 +34,46 @@ int Disassembler::disassembleInstruction(Chunk &chunk, int offset)
   {
   case OP_CONSTANT:
     return constantInstruction("OP_CONSTANT", chunk, offset);
+  case OP_NIL:
+    return simpleInstruction("OP_NIL", offset);
+  case OP_TRUE:
+    return simpleInstruction("OP_TRUE", offset);
+  case OP_FALSE:
+    return simpleInstruction("OP_FALSE", offset);
+  case OP_POP:
+    return simpleInstruction("OP_POP", offset);
+  case OP_GET_LOCAL:
+    return byteInstruction("OP_GET_LOCAL", chunk, offset);
+  case OP_SET_LOCAL:
+    return byteInstruction("OP_SET_LOCAL", chunk, offset);
+  case OP_GET_GLOBAL:
+    return constantInstruction("OP_GET_GLOBAL", chunk, offset);
+  case OP_DEFINE_GLOBAL:
+    return constantInstruction("OP_DEFINE_GLOBAL", chunk, offset);
+  case OP_SET_GLOBAL:
+    return constantInstruction("OP_SET_GLOBAL", chunk, offset);
+  case OP_GET_UPVALUE:
+    return byteInstruction("OP_GET_UPVALUE", chunk, offset);
+  case OP_SET_UPVALUE:
+    return byteInstruction("OP_SET_UPVALUE", chunk, offset);
+  case OP_GET_PROPERTY:
+    return constantInstruction("OP_GET_PROPERTY", chunk, offset);
+  case OP_SET_PROPERTY:
+    return constantInstruction("OP_SET_PROPERTY", chunk, offset);
+  case OP_CHECK_INSTANCE:
+    return simpleInstruction("OP_CHECK_INSTANCE", offset);
+  case OP_GET_SUPER:
+    return constantInstruction("OP_GET_SUPER", chunk, offset);
+  case OP_EQUAL:
+    return simpleInstruction("OP_EQUAL", offset);
+  case OP_GREATER:
+    return simpleInstruction("OP_GREATER", offset);
+  case OP_GREATER_EQUAL:
+    return simpleInstruction("OP_GREATER_EQUAL", offset);
+  case OP_LESS:
+    return simpleInstruction("OP_LESS", offset);
+  case OP_LESS_EQUAL:
+    return simpleInstruction("OP_LESS_EQUAL", offset);
   case OP_ADD:
     return simpleInstruction("OP_ADD", offset);
   case OP_SUBTRACT:
@@ -41,10 +82,38 @@ int Disassembler::disassembleInstruction(Chunk &chunk, int offset)
     return simpleInstruction("OP_MULTIPLY", offset);
   case OP_DIVIDE:
     return simpleInstruction("OP_DIVIDE", offset);
+  case OP_NOT:
+    return simpleInstruction("OP_NOT", offset);
   case OP_NEGATE:
     return simpleInstruction("OP_NEGATE", offset);
+  case OP_PRINT:
+    return simpleInstruction("OP_PRINT", offset);
+  case OP_JUMP:
+    return jumpInstruction("OP_JUMP", 1, chunk, offset);
+  case OP_JUMP_IF_FALSE:
+    return jumpInstruction("OP_JUMP_IF_FALSE", 1, chunk, offset);
+  case OP_LOOP:
+    return jumpInstruction("OP_LOOP", -1, chunk, offset);
+  case OP_CALL:
+    return byteInstruction("OP_CALL", chunk, offset);
+  case OP_GET_METHOD:
+    return constantInstruction("OP_GET_METHOD", chunk, offset);
+  case OP_GET_SUPER_METHOD:
+    return constantInstruction("OP_GET_SUPER_METHOD", chunk, offset);
+  case OP_CALL_METHOD:
+    return byteInstruction("OP_CALL_METHOD", chunk, offset);
+  case OP_CLOSURE:
+    return closureInstruction("OP_CLOSURE", chunk, offset);
+  case OP_CLOSE_UPVALUE:
+    return simpleInstruction("OP_CLOSE_UPVALUE", offset);
   case OP_RETURN:
     return simpleInstruction("OP_RETURN", offset);
+  case OP_CLASS:
+    return constantInstruction("OP_CLASS", chunk, offset);
+  case OP_INHERIT:
+    return simpleInstruction("OP_INHERIT", offset);
+  case OP_METHOD:
+    return constantInstruction("OP_METHOD", chunk, offset);
   default:
     std::cout << "Unknown opcode: " << static_cast<int>(instruction) << "\n";
     return offset + 1;
@@ -57,13 +126,53 @@ int Disassembler::simpleInstruction(const std::string &name, int offset)
   return offset + 1;
 }
 
+int Disassembler::byteInstruction(const std::string &name, Chunk &chunk, int offset)
+{
+  uint8_t slot = chunk.getCode()[offset + 1];
+  std::cout << std::left << std::setw(16) << name << std::right << std::setw(4) << static_cast<int>(slot) << "\n";
+  return offset + 2;
+}
+
+int Disassembler::jumpInstruction(const std::string &name, int sign, Chunk &chunk, int offset)
+{
+  const std::vector<uint8_t> &code = chunk.getCode();
+  uint16_t jump = static_cast<uint16_t>(code[offset + 1] << 8) | code[offset + 2];
+  std::cout << std::left << std::setw(16) << name << std::right << std::setw(4) << offset << " -> "
+            << offset + 3 + sign * jump << "\n";
+  return offset + 3;
+}
+
 int Disassembler::constantInstruction(const std::string &name, Chunk &chunk, int offset)
 {
-  uint8_t constant = chunk.getCode()[offset + 1];
-  std::cout << std::left << name << std::right << static_cast<int>(constant) << " '";
+  const std::vector<uint8_t> &code = chunk.getCode();
+  uint16_t constant = static_cast<uint16_t>(code[offset + 1] << 8) | code[offset + 2];
+  std::cout << std::left << std::setw(16) << name << std::right << std::setw(4) << constant << " '";
 
   printValue(chunk.getConstants().getValue(constant));
   std::cout << "'\n";
 
-  return offset + 2;
-}
\ No newline at end of file
+  return offset + 3;
+}
+
+int Disassembler::closureInstruction(const std::string &name, Chunk &chunk, int offset)
+{
+  const std::vector<uint8_t> &code = chunk.getCode();
+  uint16_t constant = static_cast<uint16_t>(code[offset + 1] << 8) | code[offset + 2];
+  offset += 3;
+
+  Value value = chunk.getConstants().getValue(constant);
+  std::cout << std::left << std::setw(16) << name << std::right << std::setw(4) << constant << " ";
+  printValue(value);
+  std::cout << "\n";
+
+  ObjFunction *function = asFunction(value);
+  for (int j = 0; j < function->upvalueCount; j++)
+  {
+    int isLocal = code[offset++];
+    int index = code[offset++];
+    std::cout << std::setw(4) << std::setfill('0') << offset - 2 << std::setfill(' ') << "      |                     "
+              << (isLocal ? "local" : "upvalue") << " " << index << "\n";
+  }
+
+  return offset;
+}
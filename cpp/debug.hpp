@@ -11,7 +11,10 @@ public:
   void disassembleChunk(Chunk &chunk, const std::string &name);
   int disassembleInstruction(Chunk &chunk, int offset);
   static int simpleInstruction(const std::string &name, int offset);
+  static int byteInstruction(const std::string &name, Chunk &chunk, int offset);
+  static int jumpInstruction(const std::string &name, int sign, Chunk &chunk, int offset);
   static int constantInstruction(const std::string &name, Chunk &chunk, int offset);
+  static int closureInstruction(const std::string &name, Chunk &chunk, int offset);
 };
 
-#endif
\ No newline at end of file
+#endif
@@ -5,9 +5,6 @@
 #include <string.h>
 #include <fstream>
 
-// Forward declaration
-std::string readFile(const std::string &path);
-
 void repl()
 {
   VM vm;
@@ -21,8 +18,11 @@ void repl()
       std::cout << "\n";
       break;
     }
-    
-    vm.interpret(&line);
+
+    if (vm.interpret(line) == INTERPRET_RUNTIME_ERROR)
+    {
+      std::cerr << vm.getErrorMessage() << "\n[line " << vm.getErrorLine() << "]\n";
+    }
   }
 }
 
@@ -34,8 +34,6 @@ static void runFile(const char *path)
 
 int main(int argc, const char *argv[])
 {
-  VM vm;
-
   if (argc == 1)
   {
     repl();
@@ -50,6 +48,5 @@ int main(int argc, const char *argv[])
     return 64;
   }
 
-  // Destructor for vm is automatically called here (replaces freeVM())
   return 0;
-}
\ No newline at end of file
+}
@@ -0,0 +1,231 @@
+#include "object.hpp"
+#include "vm.hpp"
+
+constexpr size_t GC_HEAP_GROW_FACTOR = 2;
+
+void VM::markObject(Obj *object)
+{
+  if (object == nullptr || object->isMarked)
+    return;
+
+  object->isMarked = true;
+  grayStack.push_back(object);
+}
+
+void VM::markValue(Value value)
+{
+  if (value.isObj())
+    markObject(value.asObj());
+}
+
+void VM::markTable(const Table &table)
+{
+  for (const Entry &entry : table.getEntries())
+  {
+    markObject(entry.key);
+    markValue(entry.value);
+  }
+}
+
+void VM::markRoots()
+{
+  for (Value *slot = stack.get(); slot < stackTop; slot++)
+  {
+    markValue(*slot);
+  }
+
+  for (int i = 0; i < frameCount; i++)
+  {
+    markObject(frames[i].closure);
+  }
+
+  for (ObjUpvalue *upvalue = openUpvalues; upvalue != nullptr; upvalue = upvalue->nextUpvalue)
+  {
+    markObject(upvalue);
+  }
+
+  markTable(globals);
+
+  for (Obj *root : compilerRoots)
+  {
+    markObject(root);
+  }
+
+  markObject(initString);
+}
+
+void VM::blackenObject(Obj *object)
+{
+  switch (object->type)
+  {
+  case ObjType::BOUND_METHOD:
+  {
+    ObjBoundMethod *bound = static_cast<ObjBoundMethod *>(object);
+    markValue(bound->receiver);
+    markObject(bound->method);
+    break;
+  }
+  case ObjType::CLASS:
+  {
+    ObjClass *klass = static_cast<ObjClass *>(object);
+    markObject(klass->name);
+    markTable(klass->methods);
+    markValue(klass->initializer);
+    break;
+  }
+  case ObjType::CLOSURE:
+  {
+    ObjClosure *closure = static_cast<ObjClosure *>(object);
+    markObject(closure->function);
+    for (ObjUpvalue *upvalue : closure->upvalues)
+    {
+      markObject(upvalue);
+    }
+    break;
+  }
+  case ObjType::FUNCTION:
+  {
+    ObjFunction *function = static_cast<ObjFunction *>(object);
+    markObject(function->name);
+    const ValueArray &constants = function->chunk.getConstants();
+    for (int i = 0; i < constants.getCount(); i++)
+    {
+      markValue(constants.getValue(i));
+    }
+    break;
+  }
+  case ObjType::INSTANCE:
+  {
+    ObjInstance *instance = static_cast<ObjInstance *>(object);
+    markObject(instance->klass);
+    markTable(instance->fields);
+    break;
+  }
+  case ObjType::UPVALUE:
+    markValue(static_cast<ObjUpvalue *>(object)->closed);
+    break;
+  case ObjType::NATIVE:
+  case ObjType::STRING:
+    break;
+  }
+}
+
+void VM::traceReferences()
+{
+  while (!grayStack.empty())
+  {
+    Obj *object = grayStack.back();
+    grayStack.pop_back();
+    blackenObject(object);
+  }
+}
+
+void VM::freeObject(Obj *object)
+{
+  switch (object->type)
+  {
+  case ObjType::BOUND_METHOD:
+    bytesAllocated -= sizeof(ObjBoundMethod);
+    delete static_cast<ObjBoundMethod *>(object);
+    break;
+  case ObjType::CLASS:
+    bytesAllocated -= sizeof(ObjClass);
+    delete static_cast<ObjClass *>(object);
+    break;
+  case ObjType::CLOSURE:
+  {
+    ObjClosure *closure = static_cast<ObjClosure *>(object);
+    bytesAllocated -= sizeof(ObjClosure) + sizeof(ObjUpvalue *) * closure->upvalues.size();
+    delete closure;
+    break;
+  }
+  case ObjType::FUNCTION:
+    bytesAllocated -= sizeof(ObjFunction);
+    delete static_cast<ObjFunction *>(object);
+    break;
+  case ObjType::INSTANCE:
+    bytesAllocated -= sizeof(ObjInstance);
+    delete static_cast<ObjInstance *>(object);
+    break;
+  case ObjType::NATIVE:
+    bytesAllocated -= sizeof(ObjNative);
+    delete static_cast<ObjNative *>(object);
+    break;
+  case ObjType::STRING:
+  {
+    ObjString *string = static_cast<ObjString *>(object);
+    bytesAllocated -= sizeof(ObjString) + string->chars.size();
+    delete string;
+    break;
+  }
+  case ObjType::UPVALUE:
+    bytesAllocated -= sizeof(ObjUpvalue);
+    delete static_cast<ObjUpvalue *>(object);
+    break;
+  }
+}
+
+void VM::sweep()
+{
+  Obj *previous = nullptr;
+  Obj *object = objects;
+  while (object != nullptr)
+  {
+    if (object->isMarked)
+    {
+      object->isMarked = false;
+      previous = object;
+      object = object->next;
+    }
+    else
+    {
+      Obj *unreached = object;
+      object = object->next;
+      if (previous != nullptr)
+      {
+        previous->next = object;
+      }
+      else
+      {
+        objects = object;
+      }
+
+      freeObject(unreached);
+    }
+  }
+}
+
+void VM::collectGarbage()
+{
+  [[maybe_unused]] size_t before = bytesAllocated;
+  if constexpr (DEBUG_LOG_GC)
+  {
+    log("-- gc begin");
+  }
+
+  markRoots();
+  traceReferences();
+  strings.removeWhite();
+  sweep();
+
+  nextGC = bytesAllocated * GC_HEAP_GROW_FACTOR;
+  if (nextGC < 1024 * 1024)
+    nextGC = 1024 * 1024;
+
+  if constexpr (DEBUG_LOG_GC)
+  {
+    log("-- gc end, collected " + std::to_string(before - bytesAllocated) + " bytes, next at " + std::to_string(nextGC));
+  }
+}
+
+void VM::freeObjects()
+{
+  Obj *object = objects;
+  while (object != nullptr)
+  {
+    Obj *next = object->next;
+    freeObject(object);
+    object = next;
+  }
+  objects = nullptr;
+}
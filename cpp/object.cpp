@@ -0,0 +1,160 @@
+#include <string.h>
+
+#include "object.hpp"
+#include "vm.hpp"
+
+template <typename T>
+T *VM::allocateObject(ObjType type, size_t extra)
+{
+  bytesAllocated += sizeof(T) + extra;
+  if (DEBUG_STRESS_GC || bytesAllocated > nextGC)
+  {
+    collectGarbage();
+  }
+
+  T *object = new T();
+  object->type = type;
+  object->isMarked = false;
+  object->next = objects;
+  objects = object;
+
+  if constexpr (DEBUG_LOG_GC)
+  {
+    log("allocate " + std::to_string(sizeof(T) + extra) + " for " + std::to_string(static_cast<int>(type)));
+  }
+
+  return object;
+}
+
+ObjString *VM::allocateString(std::string &&chars, uint32_t hash)
+{
+  ObjString *string = allocateObject<ObjString>(ObjType::STRING, chars.size());
+  string->chars = std::move(chars);
+  string->hash = hash;
+
+  push(Value::object(string));
+  strings.set(string, Value::nil());
+  pop();
+
+  return string;
+}
+
+uint32_t hashString(const char *key, size_t length)
+{
+  uint32_t hash = 2166136261u;
+  for (size_t i = 0; i < length; i++)
+  {
+    hash ^= static_cast<uint8_t>(key[i]);
+    hash *= 16777619;
+  }
+  return hash;
+}
+
+ObjString *VM::copyString(const char *chars, size_t length)
+{
+  uint32_t hash = hashString(chars, length);
+  ObjString *interned = strings.findString(chars, length, hash);
+  if (interned != nullptr)
+    return interned;
+
+  return allocateString(std::string(chars, length), hash);
+}
+
+ObjString *VM::takeString(std::string &&chars)
+{
+  uint32_t hash = hashString(chars.data(), chars.size());
+  ObjString *interned = strings.findString(chars.data(), chars.size(), hash);
+  if (interned != nullptr)
+    return interned;
+
+  return allocateString(std::move(chars), hash);
+}
+
+ObjFunction *VM::newFunction()
+{
+  ObjFunction *function = allocateObject<ObjFunction>(ObjType::FUNCTION);
+  function->arity = 0;
+  function->upvalueCount = 0;
+  function->name = nullptr;
+  return function;
+}
+
+ObjNative *VM::newNative(NativeFn function, int arity)
+{
+  ObjNative *native = allocateObject<ObjNative>(ObjType::NATIVE);
+  native->function = function;
+  native->arity = arity;
+  return native;
+}
+
+ObjClosure *VM::newClosure(ObjFunction *function)
+{
+  ObjClosure *closure = allocateObject<ObjClosure>(ObjType::CLOSURE, sizeof(ObjUpvalue *) * function->upvalueCount);
+  closure->function = function;
+  closure->upvalues.assign(function->upvalueCount, nullptr);
+  return closure;
+}
+
+ObjUpvalue *VM::newUpvalue(Value *slot)
+{
+  ObjUpvalue *upvalue = allocateObject<ObjUpvalue>(ObjType::UPVALUE);
+  upvalue->location = slot;
+  upvalue->closed = Value::nil();
+  upvalue->nextUpvalue = nullptr;
+  return upvalue;
+}
+
+ObjClass *VM::newClass(ObjString *name)
+{
+  ObjClass *klass = allocateObject<ObjClass>(ObjType::CLASS);
+  klass->name = name;
+  klass->initializer = Value::nil();
+  return klass;
+}
+
+ObjInstance *VM::newInstance(ObjClass *klass)
+{
+  ObjInstance *instance = allocateObject<ObjInstance>(ObjType::INSTANCE);
+  instance->klass = klass;
+  return instance;
+}
+
+ObjBoundMethod *VM::newBoundMethod(Value receiver, ObjClosure *method)
+{
+  ObjBoundMethod *bound = allocateObject<ObjBoundMethod>(ObjType::BOUND_METHOD);
+  bound->receiver = receiver;
+  bound->method = method;
+  return bound;
+}
+
+static std::string functionToString(ObjFunction *function)
+{
+  if (function->name == nullptr)
+    return "<script>";
+
+  return "<fn " + function->name->chars + ">";
+}
+
+std::string objectToString(Value value)
+{
+  switch (value.asObj()->type)
+  {
+  case ObjType::BOUND_METHOD:
+    return functionToString(asBoundMethod(value)->method->function);
+  case ObjType::CLASS:
+    return asClass(value)->name->chars;
+  case ObjType::CLOSURE:
+    return functionToString(asClosure(value)->function);
+  case ObjType::FUNCTION:
+    return functionToString(asFunction(value));
+  case ObjType::INSTANCE:
+    return asInstance(value)->klass->name->chars + " instance";
+  case ObjType::NATIVE:
+    return "<native fn>";
+  case ObjType::STRING:
+    return asString(value)->chars;
+  case ObjType::UPVALUE:
+    return "upvalue";
+  }
+  return "";
+}
@@ -0,0 +1,105 @@
+#ifndef clox_object_hpp
+#define clox_object_hpp
+
+#include "common.hpp"
+#include "chunk.hpp"
+#include "table.hpp"
+#include "value.hpp"
+#include <string>
+#include <vector>
+
+enum class ObjType
+{
+  BOUND_METHOD,
+  CLASS,
+  CLOSURE,
+  FUNCTION,
+  INSTANCE,
+  NATIVE,
+  STRING,
+  UPVALUE
+};
+
+struct Obj
+{
+  ObjType type;
+  bool isMarked;
+  Obj *next;
+};
+
+struct ObjString : Obj
+{
+  std::string chars;
+  uint32_t hash;
+};
+
+struct ObjFunction : Obj
+{
+  int arity;
+  int upvalueCount;
+  Chunk chunk;
+  ObjString *name;
+};
+
+using NativeFn = Value (*)(int argCount, Value *args);
+
+struct ObjNative : Obj
+{
+  NativeFn function;
+  int arity;
+};
+
+struct ObjUpvalue : Obj
+{
+  Value *location;
+  Value closed;
+  ObjUpvalue *nextUpvalue;
+};
+
+struct ObjClosure : Obj
+{
+  ObjFunction *function;
+  std::vector<ObjUpvalue *> upvalues;
+};
+
+struct ObjClass : Obj
+{
+  ObjString *name;
+  Table methods;
+  Value initializer;
+};
+
+struct ObjInstance : Obj
+{
+  ObjClass *klass;
+  Table fields;
+};
+
+struct ObjBoundMethod : Obj
+{
+  Value receiver;
+  ObjClosure *method;
+};
+
+inline bool isObjType(Value value, ObjType type)
+{
+  return value.isObj() && value.asObj()->type == type;
+}
+
+inline bool isString(Value value) { return isObjType(value, ObjType::STRING); }
+inline bool isClass(Value value) { return isObjType(value, ObjType::CLASS); }
+inline bool isClosure(Value value) { return isObjType(value, ObjType::CLOSURE); }
+inline bool isInstance(Value value) { return isObjType(value, ObjType::INSTANCE); }
+
+inline ObjString *asString(Value value) { return static_cast<ObjString *>(value.asObj()); }
+inline ObjFunction *asFunction(Value value) { return static_cast<ObjFunction *>(value.asObj()); }
+inline ObjNative *asNative(Value value) { return static_cast<ObjNative *>(value.asObj()); }
+inline ObjClosure *asClosure(Value value) { return static_cast<ObjClosure *>(value.asObj()); }
+inline ObjClass *asClass(Value value) { return static_cast<ObjClass *>(value.asObj()); }
+inline ObjInstance *asInstance(Value value) { return static_cast<ObjInstance *>(value.asObj()); }
+inline ObjBoundMethod *asBoundMethod(Value value) { return static_cast<ObjBoundMethod *>(value.asObj()); }
+
+uint32_t hashString(const char *key, size_t length);
+std::string objectToString(Value value);
+
+#endif
@@ -0,0 +1,129 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "../vm.hpp"
+
+struct VMObject
+{
+  PyObject_HEAD
+  VM *vm;
+  std::string *errors;
+};
+
+static void writeStdout(const std::string &text)
+{
+  PyObject *out = PySys_GetObject("stdout");
+  if (out == nullptr || out == Py_None)
+    return;
+
+  PyObject *result = PyObject_CallMethod(out, "write", "s#", text.data(), static_cast<Py_ssize_t>(text.size()));
+  if (result == nullptr)
+  {
+    PyErr_Clear();
+    return;
+  }
+  Py_DECREF(result);
+}
+
+static PyObject *VM_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+  VMObject *self = reinterpret_cast<VMObject *>(type->tp_alloc(type, 0));
+  if (self == nullptr)
+    return nullptr;
+
+  self->vm = new VM();
+  self->errors = new std::string();
+
+  std::string *errors = self->errors;
+  self->vm->write = writeStdout;
+  self->vm->writeError = [errors](const std::string &text)
+  { errors->append(text); };
+  self->vm->interrupted = []()
+  { return PyErr_CheckSignals() != 0; };
+
+  return reinterpret_cast<PyObject *>(self);
+}
+
+static void VM_dealloc(VMObject *self)
+{
+  delete self->vm;
+  delete self->errors;
+  Py_TYPE(self)->tp_free(reinterpret_cast<PyObject *>(self));
+}
+
+static PyObject *VM_interpret(VMObject *self, PyObject *args)
+{
+  const char *source;
+  Py_ssize_t length;
+  if (!PyArg_ParseTuple(args, "s#", &source, &length))
+    return nullptr;
+
+  self->errors->clear();
+  InterpretResult result = self->vm->interpret(std::string(source, length));
+
+  switch (result)
+  {
+  case INTERPRET_OK:
+    return Py_BuildValue("(iOi)", result, Py_None, 0);
+  case INTERPRET_COMPILE_ERROR:
+    return Py_BuildValue("(is#i)", result, self->errors->data(), static_cast<Py_ssize_t>(self->errors->size()), 0);
+  case INTERPRET_RUNTIME_ERROR:
+  {
+    const std::string &message = self->vm->getErrorMessage();
+    return Py_BuildValue("(is#i)", result, message.data(), static_cast<Py_ssize_t>(message.size()),
+                         self->vm->getErrorLine());
+  }
+  case INTERPRET_INTERRUPTED:
+    return nullptr;
+  }
+
+  Py_RETURN_NONE;
+}
+
+static PyMethodDef VM_methods[] = {
+    {"interpret", reinterpret_cast<PyCFunction>(VM_interpret), METH_VARARGS,
+     "interpret(source) -> (status, message, line)"},
+    {nullptr, nullptr, 0, nullptr},
+};
+
+static PyTypeObject VMType = {
+    PyVarObject_HEAD_INIT(nullptr, 0)};
+
+static PyModuleDef cloxModule = {
+    PyModuleDef_HEAD_INIT,
+    "_clox",
+    "The clox bytecode virtual machine.",
+    -1,
+    nullptr,
+};
+
+PyMODINIT_FUNC PyInit__clox(void)
+{
+  VMType.tp_name = "Ploxy._clox.VM";
+  VMType.tp_basicsize = sizeof(VMObject);
+  VMType.tp_flags = Py_TPFLAGS_DEFAULT;
+  VMType.tp_new = VM_new;
+  VMType.tp_dealloc = reinterpret_cast<destructor>(VM_dealloc);
+  VMType.tp_methods = VM_methods;
+
+  if (PyType_Ready(&VMType) < 0)
+    return nullptr;
+
+  PyObject *module = PyModule_Create(&cloxModule);
+  if (module == nullptr)
+    return nullptr;
+
+  Py_INCREF(&VMType);
+  if (PyModule_AddObject(module, "VM", reinterpret_cast<PyObject *>(&VMType)) < 0)
+  {
+    Py_DECREF(&VMType);
+    Py_DECREF(module);
+    return nullptr;
+  }
+
+  PyModule_AddIntConstant(module, "INTERPRET_OK", INTERPRET_OK);
+  PyModule_AddIntConstant(module, "INTERPRET_COMPILE_ERROR", INTERPRET_COMPILE_ERROR);
+  PyModule_AddIntConstant(module, "INTERPRET_RUNTIME_ERROR", INTERPRET_RUNTIME_ERROR);
+
+  return module;
+}
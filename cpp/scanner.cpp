@@ -21,7 +21,7 @@ Token Scanner::identifier()
   while (isAlpha(peek()) || isDigit(peek()))
     advance();
 
-  return makeToken(TokenType::TOKEN_IDENTIFIER);
+  return makeToken(identifierType());
 }
 
 Token Scanner::number()
@@ -86,20 +86,12 @@ Token Scanner::scanToken()
   case '>':
     return makeToken(match('=') ? TokenType::TOKEN_GREATER_EQUAL : TokenType::TOKEN_GREATER);
 
+  case '/':
+    return makeToken(TokenType::TOKEN_SLASH);
   case '"':
     return string();
-  case '/':
-    if (peekNext() == '/')
-    {
-      while (peek() != '\n' && !isAtEnd())
-        advance();
-    }
-    else
-    {
-      return;
-    }
   default:
-    return errorToken("Unexpected character.");
+    return errorToken("Unexpected character");
   }
 }
 
@@ -147,6 +139,21 @@ void Scanner::skipWhitespace()
     case '\t':
       advance();
       break;
+    case '\n':
+      line++;
+      advance();
+      break;
+    case '/':
+      if (peekNext() == '/')
+      {
+        while (peek() != '\n' && !isAtEnd())
+          advance();
+      }
+      else
+      {
+        return;
+      }
+      break;
     default:
       return;
     }
@@ -187,6 +194,7 @@ TokenType Scanner::identifierType()
         return checkKeyword(2, 2, "ue", TokenType::TOKEN_TRUE);
       }
     }
+    break;
   case 'v':
     return checkKeyword(1, 2, "ar", TokenType::TOKEN_VAR);
   case 'w':
@@ -204,6 +212,7 @@ TokenType Scanner::identifierType()
         return checkKeyword(2, 1, "n", TokenType::TOKEN_FUN);
       }
     }
+    break;
   default:
     break;
   }
@@ -212,7 +221,7 @@ TokenType Scanner::identifierType()
 
 TokenType Scanner::checkKeyword(int startOffset, int length, const char *rest, TokenType type)
 {
-  if (current - start == startOffset + length &&
+  if (current - start == static_cast<size_t>(startOffset + length) &&
       memcmp(source.c_str() + start + startOffset, rest, length) == 0)
   {
     return type;
@@ -226,7 +235,8 @@ Token Scanner::string()
   while (peek() != '"' && !isAtEnd())
   {
     if (peek() == '\n')
-      advance();
+      line++;
+    advance();
   }
 
   if (isAtEnd())
@@ -246,9 +256,7 @@ char Scanner::peek() const
 
 char Scanner::peekNext() const
 {
-  if (isAtEnd())
+  if (current + 1 >= source.length())
     return '\0';
   return source[current + 1];
 }
-
-Scanner scanner;
@@ -0,0 +1,151 @@
+#include <string.h>
+
+#include "object.hpp"
+#include "table.hpp"
+
+constexpr double TABLE_MAX_LOAD = 0.75;
+
+Entry *Table::findEntry(std::vector<Entry> &entries, ObjString *key) const
+{
+  size_t mask = entries.size() - 1;
+  size_t index = key->hash & mask;
+  Entry *tombstone = nullptr;
+
+  while (true)
+  {
+    Entry *entry = &entries[index];
+    if (entry->key == nullptr)
+    {
+      if (entry->value.isNil())
+      {
+        return tombstone != nullptr ? tombstone : entry;
+      }
+      else if (tombstone == nullptr)
+      {
+        tombstone = entry;
+      }
+    }
+    else if (entry->key == key)
+    {
+      return entry;
+    }
+
+    index = (index + 1) & mask;
+  }
+}
+
+bool Table::get(ObjString *key, Value *value) const
+{
+  if (count == 0)
+    return false;
+
+  Entry *entry = findEntry(const_cast<std::vector<Entry> &>(entries), key);
+  if (entry->key == nullptr)
+    return false;
+
+  *value = entry->value;
+  return true;
+}
+
+void Table::adjustCapacity(size_t capacity)
+{
+  std::vector<Entry> resized(capacity, Entry{nullptr, Value::nil()});
+
+  count = 0;
+  for (const Entry &entry : entries)
+  {
+    if (entry.key == nullptr)
+      continue;
+
+    Entry *dest = findEntry(resized, entry.key);
+    dest->key = entry.key;
+    dest->value = entry.value;
+    count++;
+  }
+
+  entries = std::move(resized);
+}
+
+bool Table::set(ObjString *key, Value value)
+{
+  if (count + 1 > entries.size() * TABLE_MAX_LOAD)
+  {
+    adjustCapacity(entries.size() < 8 ? 8 : entries.size() * 2);
+  }
+
+  Entry *entry = findEntry(entries, key);
+  bool isNewKey = entry->key == nullptr;
+  if (isNewKey && entry->value.isNil())
+    count++;
+
+  entry->key = key;
+  entry->value = value;
+  return isNewKey;
+}
+
+bool Table::remove(ObjString *key)
+{
+  if (count == 0)
+    return false;
+
+  Entry *entry = findEntry(entries, key);
+  if (entry->key == nullptr)
+    return false;
+
+  entry->key = nullptr;
+  entry->value = Value::boolean(true);
+  return true;
+}
+
+void Table::addAll(const Table &from)
+{
+  for (const Entry &entry : from.entries)
+  {
+    if (entry.key != nullptr)
+    {
+      set(entry.key, entry.value);
+    }
+  }
+}
+
+ObjString *Table::findString(const char *chars, size_t length, uint32_t hash) const
+{
+  if (count == 0)
+    return nullptr;
+
+  size_t mask = entries.size() - 1;
+  size_t index = hash & mask;
+  while (true)
+  {
+    const Entry &entry = entries[index];
+    if (entry.key == nullptr)
+    {
+      if (entry.value.isNil())
+        return nullptr;
+    }
+    else if (entry.key->hash == hash && entry.key->chars.size() == length &&
+             memcmp(entry.key->chars.data(), chars, length) == 0)
+    {
+      return entry.key;
+    }
+
+    index = (index + 1) & mask;
+  }
+}
+
+void Table::removeWhite()
+{
+  for (Entry &entry : entries)
+  {
+    if (entry.key != nullptr && !entry.key->isMarked)
+    {
+      entry.key = nullptr;
+      entry.value = Value::boolean(true);
+    }
+  }
+}
+
+const std::vector<Entry> &Table::getEntries() const
+{
+  return entries;
+}
@@ -0,0 +1,35 @@
+#ifndef clox_table_hpp
+#define clox_table_hpp
+
+#include "common.hpp"
+#include "value.hpp"
+#include <vector>
+
+struct Entry
+{
+  ObjString *key;
+  Value value;
+};
+
+class Table
+{
+public:
+  Table() = default;
+
+  bool get(ObjString *key, Value *value) const;
+  bool set(ObjString *key, Value value);
+  bool remove(ObjString *key);
+  void addAll(const Table &from);
+  ObjString *findString(const char *chars, size_t length, uint32_t hash) const;
+  void removeWhite();
+  const std::vector<Entry> &getEntries() const;
+
+private:
+  Entry *findEntry(std::vector<Entry> &entries, ObjString *key) const;
+  void adjustCapacity(size_t capacity);
+
+  std::vector<Entry> entries;
+  size_t count = 0;
+};
+
+#endif
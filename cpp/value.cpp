@@ -1,5 +1,8 @@
 #include <stdio.h>
+#include <math.h>
+#include <charconv>
 
+#include "object.hpp"
 #include "value.hpp"
 
 void ValueArray::writeValue(Value value)
@@ -26,7 +29,8 @@ void ValueArray::printValues() const
 {
   for (const auto &value : values)
   {
-    std::cout << value << " ";
+    printValue(value);
+    std::cout << " ";
   }
   std::cout << "\n";
 }
@@ -36,7 +40,105 @@ void ValueArray::clear()
   values.clear();
 }
 
+bool valuesEqual(Value a, Value b)
+{
+  if (a.isNumeric() && b.isNumeric())
+  {
+    return a.asNumeric() == b.asNumeric();
+  }
+  if (a.type != b.type)
+    return false;
+
+  switch (a.type)
+  {
+  case ValueType::NIL:
+    return true;
+  case ValueType::OBJ:
+    return a.asObj() == b.asObj();
+  default:
+    return false;
+  }
+}
+
+// Formats a number the way Python's str(float) does, minus a trailing ".0".
+std::string formatNumber(double number)
+{
+  if (isnan(number))
+    return "nan";
+  if (isinf(number))
+    return number > 0 ? "inf" : "-inf";
+
+  char buffer[64];
+  auto result = std::to_chars(buffer, buffer + sizeof(buffer), number, std::chars_format::scientific);
+  std::string scientific(buffer, result.ptr);
+
+  std::string sign;
+  if (scientific[0] == '-')
+  {
+    sign = "-";
+    scientific = scientific.substr(1);
+  }
+
+  size_t e = scientific.find('e');
+  int exponent = std::stoi(scientific.substr(e + 1));
+  std::string digits;
+  for (size_t i = 0; i < e; i++)
+  {
+    if (scientific[i] != '.')
+      digits += scientific[i];
+  }
+
+  int decimalPoint = exponent + 1;
+  std::string text;
+  if (decimalPoint > -4 && decimalPoint <= 16)
+  {
+    if (decimalPoint <= 0)
+    {
+      text = "0." + std::string(-decimalPoint, '0') + digits;
+    }
+    else if ((size_t)decimalPoint >= digits.size())
+    {
+      text = digits + std::string(decimalPoint - digits.size(), '0');
+    }
+    else
+    {
+      text = digits.substr(0, decimalPoint) + "." + digits.substr(decimalPoint);
+    }
+  }
+  else
+  {
+    text = digits.substr(0, 1);
+    if (digits.size() > 1)
+      text += "." + digits.substr(1);
+
+    std::string power = std::to_string(exponent < 0 ? -exponent : exponent);
+    if (power.size() < 2)
+      power = "0" + power;
+    text += (exponent < 0 ? "e-" : "e+") + power;
+  }
+
+  return sign + text;
+}
+
+std::string valueToString(Value value)
+{
+  switch (value.type)
+  {
+  case ValueType::BOOL:
+    return value.asBool() ? "True" : "False";
+  case ValueType::NIL:
+    return "nil";
+  case ValueType::NUMBER:
+    return formatNumber(value.asNumber());
+  case ValueType::OBJ:
+    return objectToString(value);
+  case ValueType::EMPTY:
+    return "<empty>";
+  }
+  return "";
+}
+
 void printValue(Value value)
 {
-  std::cout << value;
-}
\ No newline at end of file
+  std::cout << valueToString(value);
+}
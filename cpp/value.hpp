@@ -5,7 +5,88 @@
 #include <vector>
 #include <iostream>
 
-using Value = double;
+struct Obj;
+struct ObjString;
+
+enum class ValueType
+{
+  BOOL,
+  NIL,
+  NUMBER,
+  OBJ,
+  EMPTY
+};
+
+struct Value
+{
+  ValueType type;
+  union
+  {
+    bool boolean;
+    double number;
+    Obj *obj;
+  } as;
+
+  static Value boolean(bool value)
+  {
+    Value result;
+    result.type = ValueType::BOOL;
+    result.as.boolean = value;
+    return result;
+  }
+
+  static Value nil()
+  {
+    Value result;
+    result.type = ValueType::NIL;
+    result.as.number = 0;
+    return result;
+  }
+
+  static Value empty()
+  {
+    Value result;
+    result.type = ValueType::EMPTY;
+    result.as.number = 0;
+    return result;
+  }
+
+  static Value number(double value)
+  {
+    Value result;
+    result.type = ValueType::NUMBER;
+    result.as.number = value;
+    return result;
+  }
+
+  static Value object(Obj *value)
+  {
+    Value result;
+    result.type = ValueType::OBJ;
+    result.as.obj = value;
+    return result;
+  }
+
+  bool isBool() const { return type == ValueType::BOOL; }
+  bool isNil() const { return type == ValueType::NIL; }
+  bool isNumber() const { return type == ValueType::NUMBER; }
+  bool isObj() const { return type == ValueType::OBJ; }
+  bool isEmpty() const { return type == ValueType::EMPTY; }
+
+  // Booleans take part in arithmetic and comparisons, matching the
+  // Python interpreter's isinstance(value, (int, float)) checks.
+  bool isNumeric() const { return type == ValueType::NUMBER || type == ValueType::BOOL; }
+
+  bool asBool() const { return as.boolean; }
+  double asNumber() const { return as.number; }
+  double asNumeric() const { return type == ValueType::BOOL ? (as.boolean ? 1.0 : 0.0) : as.number; }
+  Obj *asObj() const { return as.obj; }
+
+  bool isFalsey() const
+  {
+    return type == ValueType::NIL || (type == ValueType::BOOL && !as.boolean);
+  }
+};
 
 class ValueArray
 {
@@ -23,6 +104,9 @@ private:
   std::vector<Value> values;
 };
 
+bool valuesEqual(Value a, Value b);
+std::string formatNumber(double number);
+std::string valueToString(Value value);
 void printValue(Value value);
 
-#endif
\ No newline at end of file
+#endif
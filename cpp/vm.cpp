@@ -1,11 +1,13 @@
 #include "vm.hpp"
 #include "common.hpp"
-#include "scanner.hpp"
+#include "compiler.hpp"
+#include "debug.hpp"
+#include <chrono>
 #include <iostream>
 #include <fstream>
+#include <string.h>
 #include <vector>
 
-constexpr bool DEBUG_TRACE_EXECUTION = true;
 void log(const std::string &message)
 {
   std::cout << message << "\n";
@@ -31,21 +33,80 @@ std::string readFile(const std::string &path)
   return std::string(buffer.begin(), buffer.end());
 }
 
+static Value clockNative(int argCount, Value *args)
+{
+  auto now = std::chrono::system_clock::now().time_since_epoch();
+  return Value::number(std::chrono::duration<double>(now).count());
+}
+
+VM::VM()
+    : stack(new Value[STACK_MAX]), initString(nullptr), openUpvalues(nullptr),
+      bytesAllocated(0), nextGC(1024 * 1024), objects(nullptr), errorLine(0)
+{
+  write = [](const std::string &text)
+  { std::cout << text; };
+  writeError = [](const std::string &text)
+  { std::cerr << text; };
+
+  resetStack();
+  initString = copyString("init", 4);
+  defineNative("clock", clockNative, 0);
+}
+
+VM::~VM()
+{
+  freeObjects();
+}
+
 void VM::runFile(const char *path)
 {
   std::string source = readFile(path);
-  InterpretResult result = interpret(&source);
+  InterpretResult result = interpret(source);
 
   if (result == INTERPRET_COMPILE_ERROR)
     exit(65);
   if (result == INTERPRET_RUNTIME_ERROR)
+  {
+    writeError(errorMessage + "\n[line " + std::to_string(errorLine) + "]\n");
     exit(70);
+  }
 }
 
-InterpretResult VM::interpret(const std::string *source)
+void VM::resetStack()
 {
-  Scanner scanner(*source);
-  return INTERPRET_OK;
+  stackTop = stack.get();
+  frameCount = 0;
+  openUpvalues = nullptr;
+}
+
+void VM::runtimeError(const std::string &message)
+{
+  CallFrame *frame = &frames[frameCount - 1];
+  ObjFunction *function = frame->closure->function;
+  size_t instruction = frame->ip - function->chunk.getCode().data() - 1;
+
+  errorMessage = message;
+  errorLine = function->chunk.getLines()[instruction];
+  resetStack();
+}
+
+const std::string &VM::getErrorMessage() const
+{
+  return errorMessage;
+}
+
+int VM::getErrorLine() const
+{
+  return errorLine;
+}
+
+void VM::defineNative(const char *name, NativeFn function, int arity)
+{
+  push(Value::object(copyString(name, strlen(name))));
+  push(Value::object(newNative(function, arity)));
+  globals.set(asString(stack[0]), stack[1]);
+  pop();
+  pop();
 }
 
 void VM::push(Value value)
@@ -60,104 +121,620 @@ Value VM::pop()
   return *stackTop;
 }
 
-uint8_t VM::readByte()
+Value VM::peek(int distance) const
 {
-  return *ip++;
+  return stackTop[-1 - distance];
 }
 
-Value VM::readConstant()
+bool VM::call(ObjClosure *closure, int argCount)
 {
-  uint8_t constantIndex = readByte();
-  return chunk->getConstants().getValue(constantIndex);
+  if (argCount != closure->function->arity)
+  {
+    runtimeError("Expected " + std::to_string(closure->function->arity) + " arguments but got " +
+                 std::to_string(argCount) + ".");
+    return false;
+  }
+
+  if (frameCount == FRAMES_MAX)
+  {
+    runtimeError("Stack overflow.");
+    return false;
+  }
+
+  CallFrame *frame = &frames[frameCount++];
+  frame->closure = closure;
+  frame->ip = closure->function->chunk.getCode().data();
+  frame->slots = stackTop - argCount - 1;
+  return true;
 }
 
-void VM::binary_op(char op)
+bool VM::callValue(Value callee, int argCount)
 {
-  double b = pop();
-  double a = pop();
+  if (callee.isObj())
+  {
+    switch (callee.asObj()->type)
+    {
+    case ObjType::BOUND_METHOD:
+    {
+      ObjBoundMethod *bound = asBoundMethod(callee);
+      stackTop[-argCount - 1] = bound->receiver;
+      return call(bound->method, argCount);
+    }
+    case ObjType::CLASS:
+    {
+      ObjClass *klass = asClass(callee);
+      stackTop[-argCount - 1] = Value::object(newInstance(klass));
+      if (!klass->initializer.isNil())
+      {
+        return call(asClosure(klass->initializer), argCount);
+      }
+      else if (argCount != 0)
+      {
+        runtimeError("Expected 0 arguments but got " + std::to_string(argCount) + ".");
+        return false;
+      }
+      return true;
+    }
+    case ObjType::CLOSURE:
+      return call(asClosure(callee), argCount);
+    case ObjType::NATIVE:
+    {
+      ObjNative *native = asNative(callee);
+      if (argCount != native->arity)
+      {
+        runtimeError("Expected " + std::to_string(native->arity) + " arguments but got " +
+                     std::to_string(argCount) + ".");
+        return false;
+      }
+      Value result = native->function(argCount, stackTop - argCount);
+      stackTop -= argCount + 1;
+      push(result);
+      return true;
+    }
+    default:
+      break;
+    }
+  }
+
+  runtimeError("Can only call functions and classes.");
+  return false;
+}
 
-  switch (op)
+bool VM::bindMethod(ObjClass *klass, ObjString *name)
+{
+  Value method;
+  if (!klass->methods.get(name, &method))
   {
-  case '+':
-    push(a + b);
-    break;
-  case '-':
-    push(a - b);
-    break;
-  case '*':
-    push(a * b);
-    break;
-  case '/':
-    push(a / b);
-    break;
-  default:
-    throw std::invalid_argument("Unknown operation");
+    runtimeError("Undefined property '" + name->chars + "'.");
+    return false;
   }
+
+  ObjBoundMethod *bound = newBoundMethod(peek(0), asClosure(method));
+  pop();
+  push(Value::object(bound));
+  return true;
+}
+
+ObjUpvalue *VM::captureUpvalue(Value *local)
+{
+  ObjUpvalue *previous = nullptr;
+  ObjUpvalue *upvalue = openUpvalues;
+  while (upvalue != nullptr && upvalue->location > local)
+  {
+    previous = upvalue;
+    upvalue = upvalue->nextUpvalue;
+  }
+
+  if (upvalue != nullptr && upvalue->location == local)
+  {
+    return upvalue;
+  }
+
+  ObjUpvalue *createdUpvalue = newUpvalue(local);
+  createdUpvalue->nextUpvalue = upvalue;
+
+  if (previous == nullptr)
+  {
+    openUpvalues = createdUpvalue;
+  }
+  else
+  {
+    previous->nextUpvalue = createdUpvalue;
+  }
+
+  return createdUpvalue;
+}
+
+void VM::closeUpvalues(Value *last)
+{
+  while (openUpvalues != nullptr && openUpvalues->location >= last)
+  {
+    ObjUpvalue *upvalue = openUpvalues;
+    upvalue->closed = *upvalue->location;
+    upvalue->location = &upvalue->closed;
+    openUpvalues = upvalue->nextUpvalue;
+  }
+}
+
+void VM::defineMethod(ObjString *name)
+{
+  Value method = peek(0);
+  ObjClass *klass = asClass(peek(1));
+  klass->methods.set(name, method);
+  if (name == initString)
+  {
+    klass->initializer = method;
+  }
+  pop();
+}
+
+void VM::concatenate()
+{
+  ObjString *b = asString(peek(0));
+  ObjString *a = asString(peek(1));
+
+  ObjString *result = takeString(a->chars + b->chars);
+  pop();
+  pop();
+  push(Value::object(result));
 }
 
 InterpretResult VM::run()
 {
+  CallFrame *frame = &frames[frameCount - 1];
+  uint8_t *ip = frame->ip;
+  Value *slots = frame->slots;
+  uint32_t loopCount = 0;
+
+#define READ_BYTE() (*ip++)
+#define READ_SHORT() (ip += 2, static_cast<uint16_t>((ip[-2] << 8) | ip[-1]))
+#define READ_CONSTANT() (frame->closure->function->chunk.getConstants().getValue(READ_SHORT()))
+#define READ_STRING() asString(READ_CONSTANT())
+#define STORE_FRAME() (frame->ip = ip)
+#define LOAD_FRAME()                  \
+  do                                  \
+  {                                   \
+    frame = &frames[frameCount - 1];  \
+    ip = frame->ip;                   \
+    slots = frame->slots;             \
+  } while (false)
+#define RUNTIME_ERROR(message)   \
+  do                             \
+  {                              \
+    STORE_FRAME();               \
+    runtimeError(message);       \
+    return INTERPRET_RUNTIME_ERROR; \
+  } while (false)
+#define NUMERIC_OP(makeValue, op)                           \
+  do                                                        \
+  {                                                         \
+    Value b = peek(0);                                      \
+    Value a = peek(1);                                      \
+    if (a.isNumber() && b.isNumber())                       \
+    {                                                       \
+      stackTop[-2] = makeValue(a.asNumber() op b.asNumber()); \
+    }                                                       \
+    else if (a.isNumeric() && b.isNumeric())                \
+    {                                                       \
+      stackTop[-2] = makeValue(a.asNumeric() op b.asNumeric()); \
+    }                                                       \
+    else                                                    \
+    {                                                       \
+      RUNTIME_ERROR("Operands must be numbers.");           \
+    }                                                       \
+    stackTop--;                                             \
+  } while (false)
+
   while (true)
   {
-    uint8_t instruction;
     if constexpr (DEBUG_TRACE_EXECUTION)
     {
-      for (Value *slot = stack; slot < stackTop; slot++)
+      std::cout << "          ";
+      for (Value *slot = stack.get(); slot < stackTop; slot++)
       {
         std::cout << "[ ";
         printValue(*slot);
-        std::cout << " ]\n";
+        std::cout << " ]";
       }
-      log("Executing instruction: " + std::to_string(static_cast<int>(instruction)));
-      log("Instruction pointer: " + std::to_string(reinterpret_cast<uintptr_t>(ip)));
+      std::cout << "\n";
+      Disassembler disassembler;
+      Chunk &chunk = frame->closure->function->chunk;
+      disassembler.disassembleInstruction(chunk, static_cast<int>(ip - chunk.getCode().data()));
     }
-    switch (instruction = readByte())
+
+    uint8_t instruction;
+    switch (instruction = READ_BYTE())
     {
     case OP_CONSTANT:
+      push(READ_CONSTANT());
+      break;
+    case OP_NIL:
+      push(Value::nil());
+      break;
+    case OP_TRUE:
+      push(Value::boolean(true));
+      break;
+    case OP_FALSE:
+      push(Value::boolean(false));
+      break;
+    case OP_POP:
+      pop();
+      break;
+    case OP_GET_LOCAL:
     {
-      Value constant = readConstant();
-      push(constant);
+      uint8_t slot = READ_BYTE();
+      push(slots[slot]);
       break;
     }
-    case OP_ADD:
+    case OP_SET_LOCAL:
     {
-      binary_op('+');
+      uint8_t slot = READ_BYTE();
+      slots[slot] = peek(0);
       break;
     }
-    case OP_SUBTRACT:
+    case OP_GET_GLOBAL:
     {
-      binary_op('-');
+      ObjString *name = READ_STRING();
+      Value value;
+      if (!globals.get(name, &value))
+      {
+        RUNTIME_ERROR("Undefined variable '" + name->chars + "'.");
+      }
+      push(value);
       break;
     }
-    case OP_MULTIPLY:
+    case OP_DEFINE_GLOBAL:
+    {
+      ObjString *name = READ_STRING();
+      globals.set(name, peek(0));
+      pop();
+      break;
+    }
+    case OP_SET_GLOBAL:
+    {
+      ObjString *name = READ_STRING();
+      if (globals.set(name, peek(0)))
+      {
+        globals.remove(name);
+        RUNTIME_ERROR("Undefined variable '" + name->chars + "'.");
+      }
+      break;
+    }
+    case OP_GET_UPVALUE:
+    {
+      uint8_t slot = READ_BYTE();
+      push(*frame->closure->upvalues[slot]->location);
+      break;
+    }
+    case OP_SET_UPVALUE:
+    {
+      uint8_t slot = READ_BYTE();
+      *frame->closure->upvalues[slot]->location = peek(0);
+      break;
+    }
+    case OP_GET_PROPERTY:
+    {
+      ObjString *name = READ_STRING();
+      if (!isInstance(peek(0)))
+      {
+        RUNTIME_ERROR("Only instances have properties.");
+      }
+
+      ObjInstance *instance = asInstance(peek(0));
+      Value value;
+      if (instance->fields.get(name, &value))
+      {
+        stackTop[-1] = value;
+        break;
+      }
+
+      STORE_FRAME();
+      if (!bindMethod(instance->klass, name))
+      {
+        return INTERPRET_RUNTIME_ERROR;
+      }
+      break;
+    }
+    case OP_SET_PROPERTY:
+    {
+      ObjString *name = READ_STRING();
+      if (!isInstance(peek(1)))
+      {
+        RUNTIME_ERROR("Only instances have fields.");
+      }
+
+      ObjInstance *instance = asInstance(peek(1));
+      instance->fields.set(name, peek(0));
+      Value value = pop();
+      stackTop[-1] = value;
+      break;
+    }
+    case OP_CHECK_INSTANCE:
+    {
+      if (!isInstance(peek(0)))
+      {
+        RUNTIME_ERROR("Only instances have fields.");
+      }
+      break;
+    }
+    case OP_GET_SUPER:
+    {
+      ObjString *name = READ_STRING();
+      ObjClass *superclass = asClass(pop());
+
+      STORE_FRAME();
+      if (!bindMethod(superclass, name))
+      {
+        return INTERPRET_RUNTIME_ERROR;
+      }
+      break;
+    }
+    case OP_EQUAL:
+    {
+      Value b = pop();
+      Value a = pop();
+      push(Value::boolean(valuesEqual(a, b)));
+      break;
+    }
+    case OP_GREATER:
+      NUMERIC_OP(Value::boolean, >);
+      break;
+    case OP_GREATER_EQUAL:
+      NUMERIC_OP(Value::boolean, >=);
+      break;
+    case OP_LESS:
+      NUMERIC_OP(Value::boolean, <);
+      break;
+    case OP_LESS_EQUAL:
+      NUMERIC_OP(Value::boolean, <=);
+      break;
+    case OP_ADD:
     {
-      binary_op('*');
+      Value b = peek(0);
+      Value a = peek(1);
+      if (a.isNumber() && b.isNumber())
+      {
+        stackTop[-2] = Value::number(a.asNumber() + b.asNumber());
+        stackTop--;
+      }
+      else if (isString(a) && isString(b))
+      {
+        concatenate();
+      }
+      else
+      {
+        RUNTIME_ERROR("Operands must be two numbers or two strings.");
+      }
       break;
     }
+    case OP_SUBTRACT:
+      NUMERIC_OP(Value::number, -);
+      break;
+    case OP_MULTIPLY:
+      NUMERIC_OP(Value::number, *);
+      break;
     case OP_DIVIDE:
     {
-      binary_op('/');
+      Value b = peek(0);
+      Value a = peek(1);
+      if (!a.isNumeric() || !b.isNumeric())
+      {
+        RUNTIME_ERROR("Operands must be numbers.");
+      }
+      if (b.asNumeric() == 0)
+      {
+        RUNTIME_ERROR("Division by zero.");
+      }
+      stackTop[-2] = Value::number(a.asNumeric() / b.asNumeric());
+      stackTop--;
       break;
     }
+    case OP_NOT:
+      stackTop[-1] = Value::boolean(peek(0).isFalsey());
+      break;
     case OP_NEGATE:
     {
-      push(-pop());
+      if (!peek(0).isNumeric())
+      {
+        RUNTIME_ERROR("Operand must be a number.");
+      }
+      stackTop[-1] = Value::number(-peek(0).asNumeric());
+      break;
+    }
+    case OP_PRINT:
+      write(valueToString(pop()) + "\n");
+      break;
+    case OP_JUMP:
+    {
+      uint16_t offset = READ_SHORT();
+      ip += offset;
       break;
     }
+    case OP_JUMP_IF_FALSE:
+    {
+      uint16_t offset = READ_SHORT();
+      if (peek(0).isFalsey())
+        ip += offset;
+      break;
+    }
+    case OP_LOOP:
+    {
+      uint16_t offset = READ_SHORT();
+      ip -= offset;
+      if (++loopCount == 0x10000)
+      {
+        loopCount = 0;
+        if (interrupted && interrupted())
+        {
+          STORE_FRAME();
+          resetStack();
+          return INTERPRET_INTERRUPTED;
+        }
+      }
+      break;
+    }
+    case OP_CALL:
+    {
+      int argCount = READ_BYTE();
+      STORE_FRAME();
+      if (!callValue(peek(argCount), argCount))
+      {
+        return INTERPRET_RUNTIME_ERROR;
+      }
+      LOAD_FRAME();
+      break;
+    }
+    case OP_GET_METHOD:
+    {
+      ObjString *name = READ_STRING();
+      Value receiver = peek(0);
+      if (!isInstance(receiver))
+      {
+        RUNTIME_ERROR("Only instances have properties.");
+      }
+
+      ObjInstance *instance = asInstance(receiver);
+      Value value;
+      if (instance->fields.get(name, &value))
+      {
+        stackTop[-1] = value;
+        push(Value::empty());
+      }
+      else if (instance->klass->methods.get(name, &value))
+      {
+        stackTop[-1] = value;
+        push(receiver);
+      }
+      else
+      {
+        RUNTIME_ERROR("Undefined property '" + name->chars + "'.");
+      }
+      break;
+    }
+    case OP_GET_SUPER_METHOD:
+    {
+      ObjString *name = READ_STRING();
+      ObjClass *superclass = asClass(pop());
+      Value method;
+      if (!superclass->methods.get(name, &method))
+      {
+        RUNTIME_ERROR("Undefined property '" + name->chars + "'.");
+      }
+
+      Value receiver = peek(0);
+      stackTop[-1] = method;
+      push(receiver);
+      break;
+    }
+    case OP_CALL_METHOD:
+    {
+      // The stack holds [callee][receiver][arguments...], with an empty
+      // receiver when the callee is a field rather than a method. Either
+      // way the arguments slide down one slot before the call.
+      int argCount = READ_BYTE();
+      Value *base = stackTop - argCount - 2;
+      Value callee = base[0];
+      if (!base[1].isEmpty())
+      {
+        base[0] = base[1];
+      }
+      memmove(base + 1, base + 2, sizeof(Value) * argCount);
+      stackTop--;
+
+      STORE_FRAME();
+      if (!callValue(callee, argCount))
+      {
+        return INTERPRET_RUNTIME_ERROR;
+      }
+      LOAD_FRAME();
+      break;
+    }
+    case OP_CLOSURE:
+    {
+      ObjFunction *function = asFunction(READ_CONSTANT());
+      ObjClosure *closure = newClosure(function);
+      push(Value::object(closure));
+      for (int i = 0; i < closure->function->upvalueCount; i++)
+      {
+        uint8_t isLocal = READ_BYTE();
+        uint8_t index = READ_BYTE();
+        if (isLocal)
+        {
+          closure->upvalues[i] = captureUpvalue(slots + index);
+        }
+        else
+        {
+          closure->upvalues[i] = frame->closure->upvalues[index];
+        }
+      }
+      break;
+    }
+    case OP_CLOSE_UPVALUE:
+      closeUpvalues(stackTop - 1);
+      pop();
+      break;
     case OP_RETURN:
     {
-      printValue(pop());
-      std::cout << "\n";
-      return INTERPRET_OK;
+      Value result = pop();
+      closeUpvalues(slots);
+      frameCount--;
+      if (frameCount == 0)
+      {
+        pop();
+        return INTERPRET_OK;
+      }
+
+      stackTop = slots;
+      push(result);
+      LOAD_FRAME();
+      break;
     }
-    default:
+    case OP_CLASS:
+      push(Value::object(newClass(READ_STRING())));
+      break;
+    case OP_INHERIT:
     {
-      if constexpr (DEBUG_TRACE_EXECUTION)
+      Value superclass = peek(1);
+      if (!isClass(superclass))
       {
-        log("Unknown opcode: " + std::to_string(static_cast<int>(instruction)));
+        RUNTIME_ERROR("Superclass must be a class.");
       }
+
+      ObjClass *subclass = asClass(peek(0));
+      subclass->methods.addAll(asClass(superclass)->methods);
+      subclass->initializer = asClass(superclass)->initializer;
+      pop();
       break;
     }
+    case OP_METHOD:
+      defineMethod(READ_STRING());
+      break;
+    default:
+      RUNTIME_ERROR("Unknown opcode " + std::to_string(static_cast<int>(instruction)) + ".");
     }
   }
+
+#undef READ_BYTE
+#undef READ_SHORT
+#undef READ_CONSTANT
+#undef READ_STRING
+#undef STORE_FRAME
+#undef LOAD_FRAME
+#undef RUNTIME_ERROR
+#undef NUMERIC_OP
+}
+
+InterpretResult VM::interpret(const std::string &source)
+{
+  ObjFunction *function = compile(*this, source);
+  if (function == nullptr)
+    return INTERPRET_COMPILE_ERROR;
+
+  push(Value::object(function));
+  ObjClosure *closure = newClosure(function);
+  pop();
+  push(Value::object(closure));
+  call(closure, 0);
+
+  return run();
 }
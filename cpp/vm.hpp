@@ -2,40 +2,108 @@
 #define clox_vm_hpp
 
 #include "chunk.hpp"
+#include "object.hpp"
+#include "table.hpp"
 #include "value.hpp"
+#include <functional>
 #include <memory>
 #include <string>
 
-const int STACK_MAX = 256;
+const int FRAMES_MAX = 1024;
+const int STACK_MAX = FRAMES_MAX * UINT8_COUNT;
 
 enum InterpretResult
 {
   INTERPRET_OK,
   INTERPRET_COMPILE_ERROR,
-  INTERPRET_RUNTIME_ERROR
+  INTERPRET_RUNTIME_ERROR,
+  INTERPRET_INTERRUPTED
+};
+
+struct CallFrame
+{
+  ObjClosure *closure;
+  uint8_t *ip;
+  Value *slots;
 };
 
 class VM
 {
 public:
-  VM() = default;
+  VM();
+  ~VM();
 
-  InterpretResult interpret(Chunk *chunk);
-  InterpretResult interpret(const std::string *source);
+  InterpretResult interpret(const std::string &source);
   void runFile(const char *path);
   void push(Value value);
   Value pop();
-  void binary_op(char op);
+  Value peek(int distance) const;
+
+  const std::string &getErrorMessage() const;
+  int getErrorLine() const;
+
+  ObjString *copyString(const char *chars, size_t length);
+  ObjString *takeString(std::string &&chars);
+  ObjFunction *newFunction();
+  ObjNative *newNative(NativeFn function, int arity);
+  ObjClosure *newClosure(ObjFunction *function);
+  ObjUpvalue *newUpvalue(Value *slot);
+  ObjClass *newClass(ObjString *name);
+  ObjInstance *newInstance(ObjClass *klass);
+  ObjBoundMethod *newBoundMethod(Value receiver, ObjClosure *method);
+
+  std::function<void(const std::string &)> write;
+  std::function<void(const std::string &)> writeError;
+  std::function<bool()> interrupted;
+  std::vector<Obj *> compilerRoots;
 
 private:
-  uint8_t readByte();
-  Value readConstant();
+  template <typename T>
+  T *allocateObject(ObjType type, size_t extra = 0);
+  ObjString *allocateString(std::string &&chars, uint32_t hash);
+
+  void collectGarbage();
+  void markRoots();
+  void markObject(Obj *object);
+  void markValue(Value value);
+  void markTable(const Table &table);
+  void traceReferences();
+  void blackenObject(Obj *object);
+  void sweep();
+  void freeObject(Obj *object);
+  void freeObjects();
+
   InterpretResult run();
+  bool call(ObjClosure *closure, int argCount);
+  bool callValue(Value callee, int argCount);
+  bool bindMethod(ObjClass *klass, ObjString *name);
+  ObjUpvalue *captureUpvalue(Value *local);
+  void closeUpvalues(Value *last);
+  void defineMethod(ObjString *name);
+  void defineNative(const char *name, NativeFn function, int arity);
+  void concatenate();
+  void runtimeError(const std::string &message);
+  void resetStack();
 
-  Chunk *chunk;
-  uint8_t *ip;
-  Value stack[STACK_MAX];
+  std::unique_ptr<Value[]> stack;
   Value *stackTop;
+  CallFrame frames[FRAMES_MAX];
+  int frameCount;
+
+  Table globals;
+  Table strings;
+  ObjString *initString;
+  ObjUpvalue *openUpvalues;
+
+  size_t bytesAllocated;
+  size_t nextGC;
+  Obj *objects;
+  std::vector<Obj *> grayStack;
+
+  std::string errorMessage;
+  int errorLine;
 };
 
+std::string readFile(const std::string &path);
+
 #endif
@@ -1,4 +1,13 @@
-from setuptools import setup, find_packages
+from glob import glob
+from setuptools import setup, find_packages, Extension
+
+clox = Extension(
+    "Ploxy._clox",
+    sources=[path for path in sorted(glob("cpp/*.cpp")) if not path.endswith("main.cpp")] + ["cpp/python/clox_module.cpp"],
+    language="c++",
+    extra_compile_args=["-std=c++17", "-O2"],
+    optional=True,
+)
 
 setup(
     name="ploxy",
@@ -6,6 +15,7 @@ setup(
     author="Youssef Abdelrahim",
     package_dir={"": "Python"},
     packages=find_packages(where="Python"),
+    ext_modules=[clox],
     install_requires=[],
     entry_points={
         'console_scripts': [